@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ملفات البيانات بأسماء مشتقة من بصمة المحتوى (Content-Hashed Assets)
+ينسخ كل ملف بيانات منشور إلى مجلد "data" باسم يحتوي على بصمة محتواه، مثل
+"data/period1.3f2a9c1b7d.json"، ويكتب ملفاً صغيراً "assets.json" يربط الاسم
+الأصلي بالاسم الجديد:
+
+    {"version": 1, "files": {"period1.json": "data/period1.3f2a9c1b7d.json", ...}}
+
+الملف بالاسم المشتق من البصمة لا يتغير محتواه أبداً، فيحفظه المتصفح (وأي CDN)
+دون إعادة طلبه، ولا يُتحقق من الخادم إلا من assets.json. عند تغير البيانات
+يتغير الاسم فيُحمّل الملف الجديد مباشرة بدلاً من نسخة قديمة محفوظة
+
+يُحدّث تلقائياً من save_update_date.py في آخر كل تحديث، والملفات القديمة في
+مجلد data تُحذف. النسخة في git لا تضاعف الحجم لأن المحتوى نفسه يُخزن مرة واحدة
+
+الاستخدام:
+    python asset_manifest.py
+"""
+
+import json
+import shutil
+import sys
+from pathlib import Path
+
+from build_cache import file_hash
+from converter_engine import load_manifest
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الربط بين الأسماء الأصلية والأسماء المشتقة من البصمة
+ASSET_MANIFEST_FILE = "assets.json"
+
+# مجلد الملفات بأسماء مشتقة من البصمة
+ASSETS_DIR_NAME = "data"
+
+# إصدار صيغة assets.json
+ASSET_MANIFEST_VERSION = 1
+
+# عدد خانات البصمة في اسم الملف
+ASSET_HASH_LENGTH = 10
+
+# ملفات البيانات التي تحمّلها صفحات الموقع (بالإضافة إلى ملفات الفترات)
+# الأسماء مكتوبة هنا مباشرة حتى لا يحتاج تحديث التاريخ إلى تحميل pandas
+PAGE_ASSETS = [
+    "notes.json",
+    "notes_summary.json",
+    "search_index.json",
+    "analytics.json",
+    "notes_by_date.json",
+    "last_update.json",
+]
+
+
+def asset_names():
+    """أسماء ملفات البيانات التي تُنسخ بأسماء مشتقة من البصمة"""
+    return [spec["output"] for spec in load_manifest()] + PAGE_ASSETS
+
+
+def hashed_name(name, digest):
+    """
+    الاسم المشتق من البصمة داخل مجلد data
+
+    Example:
+        >>> hashed_name("period1.json", "3f2a9c1b7d8e...")
+        'data/period1.3f2a9c1b7d.json'
+    """
+    path = Path(name)
+    return f"{ASSETS_DIR_NAME}/{path.stem}.{digest[:ASSET_HASH_LENGTH]}{path.suffix}"
+
+
+def write_asset_manifest(base_dir=None, digests=None):
+    """
+    نسخ ملفات البيانات الموجودة بأسماء مشتقة من البصمة وكتابة assets.json
+
+    الملف الذي له نسخة بنفس البصمة لا يُنسخ من جديد، والنسخ التي لم تعد
+    مذكورة في assets.json تُحذف
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        digests (dict): بصمات SHA-256 محسوبة مسبقاً (الاسم ← البصمة) لتجنب
+                        قراءة الملف مرة أخرى
+
+    Returns:
+        dict: محتوى assets.json
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    digests = digests or {}
+    assets_dir = base_dir / ASSETS_DIR_NAME
+    assets_dir.mkdir(exist_ok=True)
+
+    files = {}
+    for name in asset_names():
+        digest = digests.get(name) or file_hash(base_dir / name)
+        if digest is None:
+            continue
+        target = hashed_name(name, digest)
+        if not (base_dir / target).exists():
+            shutil.copyfile(base_dir / name, base_dir / target)
+        files[name] = target
+
+    current = {Path(target).name for target in files.values()}
+    for old_file in assets_dir.iterdir():
+        if old_file.is_file() and old_file.name not in current:
+            old_file.unlink()
+
+    manifest = {"version": ASSET_MANIFEST_VERSION, "files": files}
+    with open(base_dir / ASSET_MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return manifest
+
+
+def main():
+    """الدالة الرئيسية"""
+    print("=" * 60)
+    print("🔖 ملفات البيانات بأسماء مشتقة من البصمة")
+    print("=" * 60)
+    print()
+
+    try:
+        manifest = write_asset_manifest()
+    except Exception as e:
+        print(f"❌ حدث خطأ: {str(e)}")
+        return False
+
+    for name, target in manifest["files"].items():
+        print(f"   {name} ← {target}")
+    print(f"\n💾 تم حفظ الملف: {ASSET_MANIFEST_FILE}")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
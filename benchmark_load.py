@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+اختبار الحمل عند إعلان الدرجات (Load Test)
+يحاكي مئات أولياء الأمور الذين يفتحون الموقع في نفس الدقائق: كل ولي أمر يفتح
+اتصالاً جديداً ويبحث عن ابنه برقم الهوية، ويطلب الملفات بنفس ترتيب الصفحة.
+يقيس لكل طريقة نشر:
+
+- عدد عمليات البحث في الثانية (throughput)
+- حجم البيانات المنقولة (الإجمالي ولكل عملية بحث)
+- زمن عملية البحث كاملة: p50 و p95 و p99
+
+طرق النشر (layouts) التي تُقارن على نفس الجهاز ونفس أرقام الهوية:
+    monolithic   جميع ملفات الفترات والملاحظات بدون ضغط (الطريقة القديمة)
+    compressed   نفس الملفات مع ضغط gzip/brotli (كما يطلبها المتصفح)
+    sharded      meta.json ثم ملف الطالب من مجلد students (مع الضغط)
+    api          واجهة الاستعلام /api/student/<رقم الهوية> في serve_viewer.py
+
+الخادم المحلي هو serve_viewer.py (يُشغّل في عملية منفصلة حتى لا يشارك المولّد
+في المعالج)، ويمكن بدلاً منه اختبار خادم آخر يقدّم نفس الملفات عبر --url
+
+الاستخدام:
+    python benchmark_load.py                                  # 1,000 عملية بحث، 100 ولي أمر متزامن
+    python benchmark_load.py --lookups 5000 --concurrency 300
+    python benchmark_load.py --layouts sharded,api
+    python benchmark_load.py --url http://192.168.1.10:8000 --layouts sharded
+    python benchmark_load.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import socket
+import ssl
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from converter_engine import load_manifest
+from join_records import NOTES_FILE
+from student_shards import SHARDS_DIR_NAME, SHARDS_META_FILE, shard_key
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# الحقل الذي يبحث به ولي الأمر
+STUDENT_KEY = "الهوية"
+
+# ترويسة الضغط التي يرسلها المتصفح
+BROWSER_ENCODING = "gzip, deflate, br"
+
+# طرق النشر: الاسم ← (الوصف، ترويسة Accept-Encoding)
+LAYOUTS = {
+    "monolithic": ("📦 جميع الملفات بدون ضغط", "identity"),
+    "compressed": ("🗜️ جميع الملفات مع الضغط", BROWSER_ENCODING),
+    "sharded": ("🗂️ ملف لكل طالب", BROWSER_ENCODING),
+    "api": ("🔌 واجهة الاستعلام", BROWSER_ENCODING),
+}
+
+# أقصى زمن لانتظار بدء الخادم المحلي (بالثواني)
+SERVER_START_TIMEOUT = 60
+
+# أقصى زمن لطلب واحد (بالثواني)
+REQUEST_TIMEOUT = 60
+
+
+def student_ids(base_dir):
+    """أرقام الهوية في ملفات الفترات (بدون تكرار وبترتيب أول ظهور)"""
+    ids = {}
+    for spec in load_manifest():
+        path = Path(base_dir) / spec["output"]
+        if not path.exists():
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for record in json.load(f):
+                if record.get(STUDENT_KEY):
+                    ids.setdefault(str(record[STUDENT_KEY]), None)
+    return list(ids)
+
+
+def lookup_plan(ids, lookups, miss_rate, seed):
+    """
+    أرقام الهوية التي يبحث عنها أولياء الأمور بالترتيب
+
+    نسبة miss_rate منها أرقام غير موجودة (خطأ في كتابة الرقم)، فتُقاس
+    استجابة "الطالب غير موجود" أيضاً
+    """
+    rng = random.Random(seed)
+    plan = []
+    for _ in range(lookups):
+        if not ids or rng.random() < miss_rate:
+            plan.append(str(rng.randrange(10 ** 9, 10 ** 10)))
+        else:
+            plan.append(rng.choice(ids))
+    return plan
+
+
+def data_paths():
+    """مسارات ملفات الفترات والملاحظات كما تطلبها الصفحة بدون الملفات المجزأة"""
+    return [f"/{spec['output']}" for spec in load_manifest()] + [f"/{NOTES_FILE}"]
+
+
+def layout_paths(layout, student_id, full_data):
+    """
+    مسارات الطلبات لعملية بحث واحدة (بنفس ترتيب الصفحة)
+
+    Args:
+        layout (str): طريقة النشر
+        student_id (str): رقم الهوية
+        full_data (list): مسارات جميع ملفات البيانات (data_paths)
+    """
+    if layout in ("monolithic", "compressed"):
+        return full_data
+    if layout == "sharded":
+        return [f"/{SHARDS_DIR_NAME}/{SHARDS_META_FILE}", f"/{SHARDS_DIR_NAME}/{shard_key(student_id)}.json"]
+    return [f"/api/student/{quote(student_id)}"]
+
+
+def percentile(sorted_values, percent):
+    """النسبة المئوية (nearest-rank) من قائمة مرتبة"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def read_response(reader):
+    """
+    قراءة استجابة HTTP/1.1 واحدة (Content-Length أو chunked)
+
+    Returns:
+        tuple: (رمز الحالة، عدد البايتات المستلمة، هل يبقى الاتصال مفتوحاً)
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("أغلق الخادم الاتصال")
+    received = len(status_line)
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        received += len(line)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";")[0], 16)
+            chunk = await reader.readexactly(size + 2)
+            received += len(size_line) + len(chunk)
+            if size == 0:
+                break
+    elif "content-length" in headers:
+        received += len(await reader.readexactly(int(headers["content-length"])))
+    elif status not in (204, 304):
+        received += len(await reader.read())
+        return status, received, False
+
+    connection = headers.get("connection", "").lower()
+    if status_line.startswith(b"HTTP/1.0"):
+        return status, received, connection == "keep-alive"
+    return status, received, connection != "close"
+
+
+async def lookup(target, layout, paths):
+    """
+    عملية بحث واحدة لولي أمر: اتصال جديد ثم طلبات الصفحة بالتتابع
+
+    "الطالب غير موجود" (404 للطلب الأخير في sharded و api) نتيجة صحيحة للبحث
+
+    Returns:
+        tuple: (الزمن بالثواني، البايتات المستلمة، هل نجحت)
+    """
+    host, port, use_ssl = target
+    encoding = LAYOUTS[layout][1]
+    start = time.perf_counter()
+    received, success = 0, True
+
+    reader, writer = await asyncio.open_connection(host, port, ssl=ssl.create_default_context() if use_ssl else None)
+    try:
+        for position, path in enumerate(paths):
+            request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: {encoding}\r\n"
+                       f"Connection: keep-alive\r\n\r\n")
+            writer.write(request.encode("latin-1"))
+            await writer.drain()
+            status, size, keep_alive = await asyncio.wait_for(read_response(reader), REQUEST_TIMEOUT)
+            received += size
+            not_found = (status == 404 and position == len(paths) - 1 and layout in ("sharded", "api"))
+            success = success and (status == 200 or not_found)
+            if not keep_alive and position < len(paths) - 1:
+                reader, writer = await reconnect(writer, target)
+    finally:
+        writer.close()
+
+    return time.perf_counter() - start, received, success
+
+
+async def reconnect(writer, target):
+    """فتح اتصال جديد بعد أن يغلق الخادم الاتصال الحالي"""
+    writer.close()
+    host, port, use_ssl = target
+    return await asyncio.open_connection(host, port, ssl=ssl.create_default_context() if use_ssl else None)
+
+
+async def run_layout(target, layout, plan, concurrency):
+    """
+    تشغيل جميع عمليات البحث لطريقة نشر واحدة، وعدد concurrency منها في نفس الوقت
+
+    Returns:
+        dict: نتائج القياس
+    """
+    queue = iter(plan)
+    full_data = data_paths()
+    latencies, errors = [], 0
+    total_bytes = 0
+
+    async def parent():
+        nonlocal errors, total_bytes
+        for student_id in queue:
+            try:
+                paths = layout_paths(layout, student_id, full_data)
+                seconds, received, success = await lookup(target, layout, paths)
+            except (OSError, ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+                errors += 1
+                continue
+            total_bytes += received
+            if success:
+                latencies.append(seconds)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(parent() for _ in range(min(concurrency, len(plan)) or 1)))
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "layout": layout,
+        "lookups": len(plan),
+        "errors": errors,
+        "seconds": round(duration, 6),
+        "lookups_per_second": round(len(latencies) / duration, 2) if duration else None,
+        "bytes": total_bytes,
+        "bytes_per_lookup": round(total_bytes / len(plan)) if plan else 0,
+        "mb_per_second": round(total_bytes / duration / 1_000_000, 3) if duration else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+    }
+
+
+def free_port(host):
+    """رقم منفذ غير مستخدم"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(host, port, process, timeout=SERVER_START_TIMEOUT):
+    """الانتظار حتى يقبل الخادم الاتصالات (بعد تحميل البيانات)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("توقف الخادم المحلي قبل أن يبدأ")
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"لم يبدأ الخادم المحلي خلال {timeout} ثانية")
+
+
+def start_local_server(base_dir, host="127.0.0.1"):
+    """
+    تشغيل serve_viewer.py في عملية منفصلة على منفذ غير مستخدم
+
+    Returns:
+        tuple: (العملية، المنفذ)
+    """
+    port = free_port(host)
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPT_DIR / "serve_viewer.py"), "--host", host, "--port", str(port),
+         "--dir", str(base_dir)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_for_server(host, port, process)
+    except Exception:
+        process.kill()
+        raise
+    return process, port
+
+
+def git_commit():
+    """رقم الـ commit الحالي (أو None خارج git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results):
+    """جدول النتائج لكل طريقة نشر"""
+    print(f"{'':<14}{'بحث/ث':>10}{'KB/بحث':>12}{'MB/ث':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'أخطاء':>8}")
+    for result in results:
+        def ms(key):
+            return f"{result[key]:>10.1f}" if result[key] is not None else f"{'-':>10}"
+        print(f"{result['layout']:<14}{result['lookups_per_second'] or 0:>10.1f}"
+              f"{result['bytes_per_lookup'] / 1024:>12.1f}{result['mb_per_second'] or 0:>10.2f}"
+              f"{ms('p50_ms')}{ms('p95_ms')}{ms('p99_ms')}{result['errors']:>8}")
+
+
+def compare_results(current, previous):
+    """طباعة نسبة التغير في زمن p95 وحجم كل عملية بحث مقارنة بنتائج سابقة"""
+    before = {result["layout"]: result for result in previous["layouts"]}
+    print(f"\n📊 مقارنة بالنتائج السابقة (commit {previous['meta'].get('commit')}):")
+    for result in current["layouts"]:
+        old = before.get(result["layout"])
+        if not old or not old["p95_ms"] or not result["p95_ms"]:
+            continue
+        ratio = result["p95_ms"] / old["p95_ms"]
+        marker = "🔴" if ratio > 1.1 else "🟢" if ratio < 0.9 else "⚪"
+        print(f"   {marker} {result['layout']:<12} p95 {old['p95_ms']:>9.1f} ← {result['p95_ms']:>9.1f} ms "
+              f"({ratio:.2f}x)، {old['bytes_per_lookup'] / 1024:.1f} ← "
+              f"{result['bytes_per_lookup'] / 1024:.1f} KB/بحث")
+
+
+def parse_layouts(text):
+    """قراءة قائمة طرق النشر من سطر الأوامر (مفصولة بفواصل)"""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in names if name not in LAYOUTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"طرق نشر غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(LAYOUTS)})")
+    return names
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="اختبار الحمل على ملفات البيانات المنشورة")
+    parser.add_argument("--layouts", type=parse_layouts, default=list(LAYOUTS),
+                        help=f"طرق النشر مفصولة بفواصل (افتراضي: {','.join(LAYOUTS)})")
+    parser.add_argument("--lookups", type=int, default=1000, help="عدد عمليات البحث لكل طريقة")
+    parser.add_argument("--concurrency", type=int, default=100, help="عدد أولياء الأمور في نفس الوقت")
+    parser.add_argument("--miss-rate", type=float, default=0.05,
+                        help="نسبة عمليات البحث برقم هوية غير موجود (افتراضي: 0.05)")
+    parser.add_argument("--seed", type=int, default=42, help="بذرة العشوائية")
+    parser.add_argument("--dir", type=Path, default=SCRIPT_DIR,
+                        help="مجلد ملفات البيانات (افتراضي: مجلد السكريبت)")
+    parser.add_argument("--url", default=None,
+                        help="اختبار خادم يعمل مسبقاً بدلاً من تشغيل serve_viewer.py")
+    parser.add_argument("--output", type=Path, default=None, help="حفظ النتائج في ملف JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="مقارنة بملف نتائج سابق")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🚦 اختبار الحمل عند إعلان الدرجات")
+    print("=" * 60)
+
+    ids = student_ids(args.dir)
+    if not ids:
+        print(f"❌ لا توجد ملفات فترات في {args.dir}")
+        return 1
+    plan = lookup_plan(ids, args.lookups, args.miss_rate, args.seed)
+    print(f"👥 {len(ids):,} طالب، 🔍 {args.lookups:,} عملية بحث، 🔀 {args.concurrency} ولي أمر متزامن")
+
+    process = None
+    try:
+        if args.url:
+            url = urlsplit(args.url)
+            use_ssl = url.scheme == "https"
+            target = (url.hostname, url.port or (443 if use_ssl else 80), use_ssl)
+        else:
+            process, port = start_local_server(args.dir)
+            target = ("127.0.0.1", port, False)
+        print(f"🌐 الخادم: {'https' if target[2] else 'http'}://{target[0]}:{target[1]}")
+        print()
+
+        results = []
+        for layout in args.layouts:
+            print(f"{LAYOUTS[layout][0]} ({layout})...")
+            results.append(asyncio.run(run_layout(target, layout, plan, args.concurrency)))
+    except Exception as e:
+        print(f"❌ حدث خطأ: {str(e)}")
+        return 1
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print()
+    print_results(results)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "server": args.url or "serve_viewer.py",
+            "students": len(ids),
+            "lookups": args.lookups,
+            "concurrency": args.concurrency,
+            "miss_rate": args.miss_rate,
+            "seed": args.seed,
+        },
+        "layouts": results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 تم حفظ النتائج: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(report, json.load(f))
+
+    print("=" * 60)
+    return 0 if all(result["errors"] == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
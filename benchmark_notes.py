@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس أداء تحويل الملاحظات السلوكية
+يولّد ملاحظات عشوائية (بدون ملف Excel) ويقيس سرعة مرحلة التنظيف وبناء
+الملاحظات في convert_notes_to_json مقارنة بالطريقة القديمة (صفاً بصف)
+
+الاستخدام:
+    python benchmark_notes.py                    # 100,000 ملاحظة
+    python benchmark_notes.py --rows 500000
+    python benchmark_notes.py --legacy-rows 0    # بدون قياس الطريقة القديمة
+"""
+
+import argparse
+import random
+import sys
+import time
+
+import pandas as pd
+
+from convert_notes_to_json import build_notes_records, normalize_name
+from umm_alqura_calendar import convert_excel_date_to_hijri
+
+FIRST_NAMES = ["محمد", "عبدالله", "فهد", "ناصر", "سعود", "خالد", "فيصل", "عبدالعزيز", "تركي", "صالح"]
+FAMILY_NAMES = ["الدوسري", "القحطاني", "الغامدي", "الحارثي", "السبيعي", "العتيبي", "الشهري", "الزهراني"]
+PROBLEMS = ["حديث جانبي", "عدم حل الواجب", "تأخر عن الحصة", "عدم إحضار الكتاب", "النوم في الحصة"]
+ACTIONS = ["تنبيه", "تنبيه 3مرات", "اتصال بولي الأمر", "تحويل للموجه", None]
+DIACRITICS = "ًٌٍَُِّْ"
+
+
+def noisy_name(rng):
+    """اسم عشوائي مع تشكيل ومسافات زائدة أحياناً (كما في إدخال المعلمين)"""
+    parts = [rng.choice(FIRST_NAMES), rng.choice(FIRST_NAMES), rng.choice(FAMILY_NAMES)]
+    if rng.random() < 0.3:
+        parts[0] += rng.choice(DIACRITICS)
+    separator = "  " if rng.random() < 0.2 else " "
+    return f" {separator.join(parts)} " if rng.random() < 0.2 else separator.join(parts)
+
+
+def generate_notes_dataframe(rows, seed=42):
+    """
+    توليد DataFrame بنفس أعمدة ملف الملاحظات
+
+    Args:
+        rows (int): عدد الملاحظات
+        seed (int): بذرة العشوائية لتكرار النتائج
+
+    Returns:
+        DataFrame: الملاحظات العشوائية
+    """
+    rng = random.Random(seed)
+    start = pd.Timestamp("2025-08-24")
+    return pd.DataFrame({
+        "م": range(1, rows + 1),
+        "اسم الطالب": [noisy_name(rng) for _ in range(rows)],
+        "التاريخ": [start + pd.Timedelta(days=rng.randint(0, 280)) for _ in range(rows)],
+        "المشكلة": [rng.choice(PROBLEMS) for _ in range(rows)],
+        "الصف": [rng.choice([5, 6, 7, 8, None]) for _ in range(rows)],
+        "الإجراء": [rng.choice(ACTIONS) for _ in range(rows)],
+    })
+
+
+def legacy_build_notes_records(df):
+    """الطريقة القديمة للمقارنة: apply ثم iterrows مع تحويل كل تاريخ على حدة"""
+    df = df.copy()
+    df['اسم الطالب'] = df['اسم الطالب'].apply(normalize_name)
+    df['التاريخ'] = pd.to_datetime(df['التاريخ'], errors='coerce')
+    df['التاريخ'] = df['التاريخ'].apply(
+        lambda x: convert_excel_date_to_hijri(x, format_style="full") if pd.notna(x) else ''
+    )
+    df = df.dropna(subset=['اسم الطالب', 'المشكلة'], how='all')
+
+    notes_data = []
+    for idx, row in df.iterrows():
+        note = {
+            "اسم_الطالب": normalize_name(row.get('اسم الطالب', '')),
+            "التاريخ": row.get('التاريخ', ''),
+            "المشكلة": str(row.get('المشكلة', '')).strip(),
+            "الصف": int(row.get('الصف', 0)) if pd.notna(row.get('الصف')) else None,
+            "الإجراء": str(row.get('الإجراء', '')).strip() if pd.notna(row.get('الإجراء')) else ""
+        }
+        if note["اسم_الطالب"] and note["المشكلة"]:
+            notes_data.append(note)
+    return notes_data
+
+
+def measure(function, df):
+    """قياس زمن تنفيذ دالة البناء، مع إرجاع (الزمن، عدد الملاحظات الناتجة)"""
+    start = time.perf_counter()
+    records = function(df)
+    return time.perf_counter() - start, records
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء تحويل الملاحظات السلوكية")
+    parser.add_argument("--rows", type=int, default=100_000, help="عدد الملاحظات (افتراضي: 100000)")
+    parser.add_argument("--legacy-rows", type=int, default=10_000,
+                        help="عدد الملاحظات لقياس الطريقة القديمة (0 للتخطي)")
+    parser.add_argument("--seed", type=int, default=42, help="بذرة العشوائية")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("⏱️ قياس أداء تحويل الملاحظات السلوكية")
+    print("=" * 60)
+
+    df = generate_notes_dataframe(args.rows, args.seed)
+    print(f"📊 عدد الملاحظات: {len(df):,}")
+
+    elapsed, records = measure(build_notes_records, df)
+    throughput = len(df) / elapsed
+    print(f"🚀 الطريقة المتجهة: {elapsed:.3f} ثانية ({throughput:,.0f} ملاحظة/ثانية)")
+
+    if args.legacy_rows:
+        sample = df.head(args.legacy_rows)
+        legacy_elapsed, legacy_records = measure(legacy_build_notes_records, sample)
+        legacy_throughput = len(sample) / legacy_elapsed
+        print(f"🐢 الطريقة القديمة ({len(sample):,} ملاحظة): {legacy_elapsed:.3f} ثانية "
+              f"({legacy_throughput:,.0f} ملاحظة/ثانية)")
+        print(f"⚡ التسريع: {throughput / legacy_throughput:,.1f}x")
+
+        # الطريقة القديمة لا تُنتج حقول التاريخ المنظمة، فالمقارنة على حقولها فقط
+        keys = list(legacy_records[0]) if legacy_records else []
+        records = [{key: note[key] for key in keys} for note in build_notes_records(sample)]
+        if legacy_records != records:
+            print("❌ النتائج لا تطابق الطريقة القديمة!")
+            return 1
+        print("✅ النتائج مطابقة للطريقة القديمة")
+
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
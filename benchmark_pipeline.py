@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس أداء مراحل التحديث كاملة على بيانات عشوائية (Pipeline Benchmark)
+يولّد ملفات Excel واقعية بالحجم المطلوب (ملفا الفترتين وملف الملاحظات، بأسماء
+عربية فيها تشكيل ومسافات زائدة كما في إدخال المعلمين) ثم يقيس زمن كل مرحلة:
+قراءة Excel، التنظيف، توحيد الأسماء، التحويل الهجري، بناء الملاحظات،
+ربط الملاحظات بالطلاب، وكتابة JSON
+
+النتائج تُحفظ في ملف JSON مع رقم الـ commit لمقارنتها بين الإصدارات
+
+الاستخدام:
+    python benchmark_pipeline.py                          # 1,000 طالب و 10,000 ملاحظة
+    python benchmark_pipeline.py --scale large            # 100,000 طالب ومليون ملاحظة
+    python benchmark_pipeline.py --students 5000 --notes 50000
+    python benchmark_pipeline.py --output after.json --compare before.json
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from converter_engine import load_manifest, clean_period_dataframe
+from convert_notes_to_json import (build_notes_records, clean_text_column, convert_dates_to_hijri,
+                                   normalize_names)
+from excel_readers import BACKENDS, read_workbook
+from join_records import assign_note_ids, build_student_documents, join_notes
+from sheet_validation import validate_dataframe
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# مجلد الملفات المولّدة (يُعاد استخدامها إذا طُلب نفس الحجم ونفس البذرة)
+WORK_DIR = SCRIPT_DIR / ".cache" / "benchmark"
+
+# إصدار مولّد البيانات - يجب زيادته عند تغيير طريقة التوليد حتى لا تُستخدم ملفات قديمة
+GENERATOR_VERSION = 2
+
+# أحجام جاهزة: (عدد الطلاب، عدد الملاحظات)
+SCALES = {
+    "small": (1_000, 10_000),
+    "medium": (10_000, 100_000),
+    "large": (100_000, 1_000_000),
+}
+
+FIRST_NAMES = [
+    "محمد", "عبدالله", "فهد", "ناصر", "سعود", "خالد", "فيصل", "عبدالعزيز", "تركي", "صالح",
+    "إبراهيم", "أحمد", "عبدالرحمن", "سلطان", "ماجد", "بندر", "نواف", "مشعل", "يوسف", "عمر",
+    "علي", "حمد", "راشد", "سلمان", "عادل", "ياسر", "منصور", "بدر", "زياد", "مساعد",
+]
+FAMILY_NAMES = [
+    "الدوسري", "القحطاني", "الغامدي", "الحارثي", "السبيعي", "العتيبي", "الشهري", "الزهراني",
+    "المطيري", "الشمري", "العنزي", "الحربي", "الرشيدي", "البقمي", "السهلي", "المالكي",
+    "العمري", "الشهراني", "الأحمدي", "الجهني", "اليامي", "آل سعيد", "بن صليح", "كعوات",
+    "الخالدي", "العجمي", "الهاجري", "المري", "الثبيتي", "القرني",
+]
+PROBLEMS = ["حديث جانبي", "عدم حل الواجب", "تأخر عن الحصة", "عدم إحضار الكتاب",
+            "النوم في الحصة", "عدم إحضار الأدوات", "إزعاج", "الخروج بدون إذن"]
+ACTIONS = ["تنبيه", "تنبيه 3مرات", "اتصال بولي الأمر", "تحويل للموجه", None]
+DIACRITICS = "ًٌٍَُِّْ"
+
+# أعمدة الدرجات وحدودها العليا كما في ملفات الفترات
+SCORE_COLUMNS = {
+    "الواجبات": 10, "أنشطة": 10, "تطبيقات صفية": 10,
+    "المشاركة": 10, "الاختبار التحريري": 10, "الشفوي": 10,
+}
+
+# ملف الملاحظات: الصف الأول عنوان، وأسماء الأعمدة في الصف الثاني
+NOTES_WORKBOOK = "الملاحظات.xlsx"
+NOTES_HEADER = 1
+
+
+def student_names(rng, count):
+    """أسماء رباعية عشوائية (مع احتمال تكرار الاسم كما في الواقع)"""
+    parts = [rng.choice(FIRST_NAMES, count) for _ in range(3)] + [rng.choice(FAMILY_NAMES, count)]
+    return [" ".join(name) for name in zip(*parts)]
+
+
+def add_noise(names, rng, ratio=0.3):
+    """إضافة تشكيل ومسافات زائدة لنسبة من الأسماء"""
+    noisy = list(names)
+    for index in np.flatnonzero(rng.random(len(noisy)) < ratio):
+        name = noisy[index]
+        kind = rng.integers(3)
+        if kind == 0:
+            position = name.index(" ") if " " in name else len(name)
+            name = name[:position] + DIACRITICS[rng.integers(len(DIACRITICS))] + name[position:]
+        elif kind == 1:
+            name = name.replace(" ", "  ", 1)
+        else:
+            name = f" {name} "
+        noisy[index] = name
+    return noisy
+
+
+def generate_students(students, rng):
+    """بيانات الطلاب الأساسية: الهوية، الاسم، الصف"""
+    return pd.DataFrame({
+        "الهوية": rng.choice(np.arange(1_000_000_000, 1_200_000_000), students, replace=False),
+        "الطالب": student_names(rng, students),
+        "الصف": rng.integers(1, 13, students),
+    })
+
+
+def generate_period(base, rng, missing_ratio=0.02):
+    """ملف فترة: درجات عشوائية مع غياب بعض الطلاب عن الفترة"""
+    df = base[rng.random(len(base)) >= missing_ratio].reset_index(drop=True)
+    count = len(df)
+    period = pd.DataFrame({
+        "الرقم التسلسلي": np.arange(1, count + 1),
+        "الهوية": df["الهوية"],
+        "الصف": df["الصف"],
+        "الطالب": df["الطالب"],
+        "مجموع الغياب": rng.integers(0, 15, count),
+    })
+    for column, maximum in SCORE_COLUMNS.items():
+        period[column] = rng.integers(0, maximum + 1, count).astype(float)
+    period["المجموع"] = period[list(SCORE_COLUMNS)].sum(axis=1)
+    return period
+
+
+def generate_notes(base, notes, rng, unknown_ratio=0.03):
+    """ملف ملاحظات: أسماء من الطلاب مع تشويش، وبعض الأسماء غير الموجودة"""
+    picks = rng.integers(0, len(base), notes)
+    names = base["الطالب"].to_numpy()[picks].tolist()
+    unknown = np.flatnonzero(rng.random(notes) < unknown_ratio)
+    for index, name in zip(unknown, student_names(rng, len(unknown))):
+        names[index] = name
+
+    classes = base["الصف"].to_numpy()[picks].astype(float)
+    classes[rng.random(notes) < 0.1] = np.nan
+
+    start = np.datetime64("2025-08-24")
+    return pd.DataFrame({
+        "م": np.arange(1, notes + 1),
+        "اسم الطالب": add_noise(names, rng),
+        "التاريخ": start + rng.integers(0, 280, notes).astype("timedelta64[D]"),
+        "المشكلة": rng.choice(PROBLEMS, notes),
+        "الصف": classes,
+        "الإجراء": rng.choice(np.array(ACTIONS, dtype=object), notes),
+    })
+
+
+def generate_workbooks(work_dir, students, notes, seed=42):
+    """
+    توليد ملفات Excel في مجلد العمل (أو إعادة استخدامها إن وُجدت بنفس الإعدادات)
+
+    Returns:
+        Path: مجلد الملفات
+    """
+    target = Path(work_dir) / f"v{GENERATOR_VERSION}-s{students}-n{notes}-seed{seed}"
+    periods = load_manifest()
+    workbooks = [target / spec["workbook"] for spec in periods] + [target / NOTES_WORKBOOK]
+    if all(path.exists() for path in workbooks):
+        return target
+
+    target.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    base = generate_students(students, rng)
+
+    for spec in periods:
+        generate_period(base, rng).to_excel(target / spec["workbook"], index=False)
+
+    with pd.ExcelWriter(target / NOTES_WORKBOOK) as writer:
+        generate_notes(base, notes, rng).to_excel(writer, startrow=NOTES_HEADER, index=False)
+        writer.sheets["Sheet1"]["A1"] = "الملاحظات السلوكية"
+
+    return target
+
+
+class StageTimer:
+    """تسجيل زمن كل مرحلة وعدد الصفوف التي عالجتها"""
+
+    def __init__(self):
+        self.stages = []
+
+    def run(self, name, function, *args, rows=None):
+        """تنفيذ مرحلة وقياس زمنها، مع إرجاع نتيجتها"""
+        start = time.perf_counter()
+        result = function(*args)
+        seconds = time.perf_counter() - start
+
+        if rows is None:
+            rows = len(result) if hasattr(result, "__len__") else None
+        self.stages.append({
+            "stage": name,
+            "seconds": round(seconds, 6),
+            "rows": rows,
+            "rows_per_second": round(rows / seconds) if rows and seconds else None,
+        })
+        print(f"   {name:<18} {seconds:>9.3f} ث   {rows or 0:>10,} صف")
+        return result
+
+
+def write_json(data, json_file, indent):
+    """كتابة JSON بنفس طريقة المحولات"""
+    with open(json_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+    return data
+
+
+def run_pipeline(data_dir, reader="openpyxl"):
+    """
+    تنفيذ مراحل التحديث على ملفات مجلد البيانات وقياس كل مرحلة
+
+    Returns:
+        list: نتائج المراحل (stage, seconds, rows, rows_per_second)
+    """
+    timer = StageTimer()
+    periods = load_manifest()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+
+        frames = {}
+        for spec in periods:
+            frames[spec["id"]] = timer.run(
+                f"read_period{spec['id']}", read_workbook,
+                data_dir / spec["workbook"], spec["header"], reader, output_dir / "cache")
+        notes_df = timer.run("read_notes", read_workbook, data_dir / NOTES_WORKBOOK,
+                             NOTES_HEADER, reader, output_dir / "cache")
+
+        for spec in periods:
+            timer.run(f"validate_period{spec['id']}", validate_dataframe, frames[spec["id"]], spec,
+                      rows=len(frames[spec["id"]]))
+        for spec in periods:
+            frames[spec["id"]] = timer.run(f"clean_period{spec['id']}", clean_period_dataframe,
+                                           frames[spec["id"]], spec)
+        timer.run("normalize_names", normalize_names, notes_df["اسم الطالب"])
+        timer.run("clean_text", lambda: [clean_text_column(notes_df[column])
+                                         for column in ("المشكلة", "الإجراء")], rows=len(notes_df))
+        timer.run("hijri_conversion", convert_dates_to_hijri, notes_df["التاريخ"])
+        notes = timer.run("build_notes", build_notes_records, notes_df)
+
+        periods_data = {spec["id"]: frames[spec["id"]].to_dict(orient='records') for spec in periods}
+
+        def match():
+            documents, matcher = build_student_documents(periods_data)
+            return join_notes(documents, matcher, assign_note_ids(notes))
+
+        report = timer.run("match_names", match, rows=len(notes))
+        print(f"   {'':<18} ✅ {report['matched']:,} مطابقة، ❌ {len(report['unmatched']):,} بدون طالب")
+
+        for spec in periods:
+            timer.run(f"write_period{spec['id']}", write_json, periods_data[spec["id"]],
+                      output_dir / spec["output"], spec["indent"])
+        timer.run("write_notes", write_json, notes, output_dir / "notes.json", 2)
+
+    return timer.stages
+
+
+def git_commit():
+    """رقم الـ commit الحالي (أو None خارج git)"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_results(current, previous):
+    """طباعة نسبة التغير في زمن كل مرحلة مقارنة بنتائج سابقة"""
+    before = {stage["stage"]: stage["seconds"] for stage in previous["stages"]}
+    print(f"\n📊 مقارنة بالنتائج السابقة (commit {previous['meta'].get('commit')}):")
+    for stage in current["stages"]:
+        old = before.get(stage["stage"])
+        if not old:
+            continue
+        ratio = stage["seconds"] / old
+        marker = "🔴" if ratio > 1.1 else "🟢" if ratio < 0.9 else "⚪"
+        print(f"   {marker} {stage['stage']:<18} {old:>8.3f} ← {stage['seconds']:>8.3f} ث ({ratio:.2f}x)")
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="قياس أداء مراحل التحديث على بيانات عشوائية")
+    parser.add_argument("--scale", choices=SCALES, default="small", help="حجم جاهز (افتراضي: small)")
+    parser.add_argument("--students", type=int, default=None, help="عدد الطلاب (يتجاوز --scale)")
+    parser.add_argument("--notes", type=int, default=None, help="عدد الملاحظات (يتجاوز --scale)")
+    parser.add_argument("--seed", type=int, default=42, help="بذرة العشوائية")
+    parser.add_argument("--reader", choices=BACKENDS, default="openpyxl",
+                        help="محرك قراءة Excel (افتراضي: openpyxl)")
+    parser.add_argument("--work-dir", type=Path, default=WORK_DIR, help="مجلد الملفات المولّدة")
+    parser.add_argument("--output", type=Path, default=None, help="حفظ النتائج في ملف JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="مقارنة بملف نتائج سابق")
+    args = parser.parse_args(argv)
+
+    students, notes = SCALES[args.scale]
+    students = args.students or students
+    notes = args.notes or notes
+
+    print("=" * 60)
+    print("⏱️ قياس أداء مراحل التحديث")
+    print("=" * 60)
+    print(f"👥 {students:,} طالب، 📝 {notes:,} ملاحظة، 🔧 المحرك: {args.reader}")
+
+    start = time.perf_counter()
+    data_dir = generate_workbooks(args.work_dir, students, notes, args.seed)
+    print(f"📂 الملفات: {data_dir} ({time.perf_counter() - start:.1f} ث)")
+    print()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "students": students,
+            "notes": notes,
+            "seed": args.seed,
+            "reader": args.reader,
+        },
+        "stages": run_pipeline(data_dir, args.reader),
+    }
+    total = sum(stage["seconds"] for stage in results["stages"])
+    results["meta"]["total_seconds"] = round(total, 6)
+    print(f"\n⏱️ المجموع: {total:.3f} ثانية")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 تم حفظ النتائج: {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(results, json.load(f))
+
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
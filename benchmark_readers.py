@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مقارنة محركات قراءة ملفات Excel
+يقيس زمن القراءة وذروة الذاكرة لكل محرك متوفر (openpyxl، calamine، النسخة المحفوظة)
+على ملفات الفترات وملف الملاحظات، ويتحقق من تطابق البيانات بين المحركات
+
+ملاحظة: ذروة الذاكرة تُقاس بـ tracemalloc، فلا تشمل ذاكرة المكتبات المكتوبة
+بلغات أخرى (مثل calamine) إلا ما يُنشأ منها كبيانات Python/NumPy
+
+الاستخدام:
+    python benchmark_readers.py
+    python benchmark_readers.py --repeat 5
+    python benchmark_readers.py --json readers_benchmark.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from converter_engine import load_manifest
+from excel_readers import available_backends, parse_workbook, read_workbook
+from workbook_cache import cache_key, store_cached
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الملاحظات (الصف الأول عنوان، أسماء الأعمدة في الصف الثاني)
+NOTES_WORKBOOK = ("الملاحظات", "الملاحظات.xlsx", 1)
+
+
+def workbooks_to_measure(base_dir):
+    """قائمة ملفات Excel الموجودة: (الاسم، المسار، رقم صف الأعمدة)"""
+    workbooks = [(spec["name"], base_dir / spec["workbook"], spec["header"])
+                 for spec in load_manifest()]
+    name, workbook, header = NOTES_WORKBOOK
+    workbooks.append((name, base_dir / workbook, header))
+    return [entry for entry in workbooks if entry[1].exists()]
+
+
+def read_with_backend(excel_file, header, backend):
+    """قراءة الملف بالمحرك المطلوب مباشرة (بدون الرجوع التلقائي)"""
+    if backend == "cache":
+        return read_workbook(excel_file, header=header, backend="cache")
+    return parse_workbook(excel_file, header=header, engine=backend)
+
+
+def measure(excel_file, header, backend, repeat):
+    """
+    قياس زمن القراءة (الوسيط) وذروة الذاكرة لمحرك واحد
+
+    Returns:
+        dict: seconds, peak_mb, rows, frame
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        read_with_backend(excel_file, header, backend)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    frame = read_with_backend(excel_file, header, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": statistics.median(timings),
+        "peak_mb": peak / (1024 * 1024),
+        "rows": len(frame),
+        "frame": frame,
+    }
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="مقارنة محركات قراءة ملفات Excel")
+    parser.add_argument("--repeat", type=int, default=3, help="عدد مرات القراءة لكل محرك")
+    parser.add_argument("--json", type=Path, default=None, help="حفظ النتائج في ملف JSON")
+    args = parser.parse_args(argv)
+
+    print("=" * 70)
+    print("⏱️ مقارنة محركات قراءة ملفات Excel")
+    print("=" * 70)
+
+    backends = available_backends()
+    print(f"🔧 المحركات المتوفرة: {', '.join(backends)}")
+    if "calamine" not in backends:
+        print("💡 لتجربة المحرك الأسرع: pip install python-calamine")
+
+    workbooks = workbooks_to_measure(SCRIPT_DIR)
+    if not workbooks:
+        print("❌ لا توجد ملفات Excel في المجلد")
+        return 1
+
+    results = []
+    for name, excel_file, header in workbooks:
+        print(f"\n📂 {name}: {excel_file.name}")
+
+        # تجهيز النسخة المحفوظة مسبقاً حتى يقيس محرك cache القراءة منها فقط
+        key = cache_key(excel_file, header)
+        store_cached(parse_workbook(excel_file, header=header), excel_file, header, key=key)
+
+        reference = None
+        for backend in backends:
+            result = measure(excel_file, header, backend, args.repeat)
+            frame = result.pop("frame")
+            if reference is None:
+                reference = frame
+            matches = frame.shape == reference.shape and frame.fillna(0).equals(reference.fillna(0))
+
+            print(f"   {backend:<10} {result['seconds'] * 1000:>9.1f} ms"
+                  f"   {result['peak_mb']:>7.1f} MB   {result['rows']:>7} صف"
+                  f"   {'✅' if matches else '⚠️ بيانات مختلفة'}")
+            results.append(dict(result, workbook=excel_file.name, backend=backend,
+                                matches_reference=matches))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 تم حفظ النتائج: {args.json}")
+
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+سجل البناء التزايدي (Incremental Build Manifest)
+يحفظ بصمة المحتوى (SHA-256) لكل ملف Excel مدخل ولكل ملف JSON ناتج،
+ويسمح بتخطي أي تحويل لم تتغير مدخلاته أو إصدار المحول أو إعداداته
+
+مراحل التحديث تعمل بالتوازي (update_pipeline.py) وتسجّل في نفس الملف، لذلك
+التسجيل يتم تحت قفل والكتابة عبر ملف مؤقت ثم استبداله، فلا يُفقد تسجيل مرحلة
+ولا يُقرأ ملف نصف مكتوب
+
+الاستخدام:
+    from build_cache import input_digests, is_up_to_date, record_build
+
+    digests = input_digests([excel_file])   # قبل قراءة الملف
+    if not is_up_to_date("notes.json", [excel_file], params, digests=digests):
+        ...  # التحويل
+        record_build("notes.json", [excel_file], [json_file], params, digests=digests)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف سجل البناء (محلي فقط، غير مرفوع إلى GitHub)
+BUILD_MANIFEST_FILE = SCRIPT_DIR / ".build_manifest.json"
+
+# حجم القطعة عند قراءة الملفات لحساب البصمة
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# قفل القراءة والتعديل والحفظ لسجل البناء (المراحل المتوازية في نفس العملية)
+_manifest_lock = threading.Lock()
+
+
+def file_hash(path):
+    """
+    حساب بصمة SHA-256 لمحتوى ملف
+
+    Args:
+        path (Path): مسار الملف
+
+    Returns:
+        str: البصمة بصيغة hex، أو None إذا لم يكن الملف موجوداً
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_digests(inputs):
+    """
+    بصمات ملفات المدخلات (اسم الملف ← البصمة)
+
+    تُحسب قبل قراءة المدخلات وتُمرر إلى is_up_to_date و record_build، حتى
+    لا يُسجل الناتج المبني من المحتوى القديم ببصمة ملف حُفظ أثناء التحويل
+    (فيُتخطى في كل تشغيل لاحق رغم أنه قديم)
+    """
+    return {Path(p).name: file_hash(p) for p in inputs}
+
+
+def load_build_manifest(manifest_file=None):
+    """قراءة سجل البناء، أو إرجاع سجل فارغ إذا لم يكن موجوداً أو كان تالفاً"""
+    manifest_file = Path(manifest_file) if manifest_file else BUILD_MANIFEST_FILE
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"artifacts": {}}
+
+
+def save_build_manifest(manifest, manifest_file=None):
+    """حفظ سجل البناء (في ملف مؤقت ثم استبدال السجل به دفعة واحدة)"""
+    manifest_file = Path(manifest_file) if manifest_file else BUILD_MANIFEST_FILE
+    temp_file = manifest_file.with_name(f"{manifest_file.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(temp_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(temp_file, manifest_file)
+
+
+def is_up_to_date(artifact, inputs, params, outputs=None, manifest_file=None, digests=None):
+    """
+    التحقق مما إذا كان الملف الناتج محدثاً ولا يحتاج لإعادة التحويل
+
+    يعتبر الملف محدثاً إذا تطابقت بصمات المدخلات والإعدادات مع آخر بناء،
+    وكانت الملفات الناتجة موجودة ولم تُعدّل يدوياً منذ ذلك الحين
+
+    Args:
+        artifact (str): اسم الملف الناتج الرئيسي (مفتاح السجل)
+        inputs (list): مسارات ملفات المدخلات
+        params (dict): إعدادات التحويل (إصدار المحول، قواعد التنظيف، إعدادات الهجري)
+        outputs (list): مسارات الملفات الناتجة (افتراضي: لا يتم فحصها)
+        manifest_file (Path): مسار سجل البناء
+        digests (dict): بصمات المدخلات من input_digests (افتراضي: تُحسب الآن)
+
+    Returns:
+        bool: True إذا كان التحويل غير ضروري
+    """
+    entry = load_build_manifest(manifest_file).get("artifacts", {}).get(artifact)
+    if not entry:
+        return False
+
+    input_hashes = input_digests(inputs) if digests is None else digests
+    if None in input_hashes.values() or entry.get("inputs") != input_hashes:
+        return False
+
+    if entry.get("params") != params:
+        return False
+
+    for path in outputs or []:
+        if file_hash(path) != entry.get("outputs", {}).get(Path(path).name):
+            return False
+
+    return True
+
+
+def record_build(artifact, inputs, outputs, params, manifest_file=None, digests=None):
+    """
+    تسجيل بناء ناجح في سجل البناء
+
+    Args:
+        artifact (str): اسم الملف الناتج الرئيسي (مفتاح السجل)
+        inputs (list): مسارات ملفات المدخلات
+        outputs (list): مسارات الملفات الناتجة
+        params (dict): إعدادات التحويل
+        manifest_file (Path): مسار سجل البناء
+        digests (dict): بصمات المدخلات المحسوبة قبل قراءتها (input_digests)
+    """
+    entry = {
+        "inputs": input_digests(inputs) if digests is None else digests,
+        "outputs": {Path(p).name: file_hash(p) for p in outputs},
+        "params": params,
+    }
+    with _manifest_lock:
+        manifest = load_build_manifest(manifest_file)
+        manifest.setdefault("artifacts", {})[artifact] = entry
+        save_build_manifest(manifest, manifest_file)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+صيغة JSON مضغوطة لملفات البيانات (Compact Columnar Output)
+يحوّل ملفات JSON الناتجة (مصفوفة سجلات بمفاتيح عربية طويلة تتكرر في كل سجل)
+إلى صيغة عمودية مصغّرة تُكتب فيها أسماء الأعمدة مرة واحدة، مع ترميز القيم
+النصية المتكررة (مثل المشكلة والإجراء) بقاموس، وينشئ بجانبها نسخاً مضغوطة
+مسبقاً بصيغتي gzip و brotli لخوادم الويب التي تدعم تقديمها مباشرة
+
+الصيغة العمودية:
+    {
+      "format": "columnar", "version": 1, "rows": 3,
+      "columns": ["الهوية", "المشكلة"],
+      "data": [
+        [1159456654, 613576, 1159456654],
+        {"dict": ["حديث جانبي", "عدم حل الواجب"], "codes": [0, 1, 0]}
+      ]
+    }
+
+الاستخدام:
+    python compact_output.py                 # إنشاء الملفات المضغوطة وطباعة تقرير المقارنة
+    python compact_output.py --report-only   # التقرير فقط بدون كتابة ملفات
+
+    python converter_engine.py --compact     # إنشاؤها مباشرة بعد التحويل
+    python convert_notes_to_json.py --compact
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from pathlib import Path
+
+from converter_engine import load_manifest
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الملاحظات السلوكية
+NOTES_FILE = "notes.json"
+
+# إصدار الصيغة العمودية
+COMPACT_FORMAT_VERSION = 1
+
+# اللاحقة المضافة لاسم الملف المضغوط: period1.json → period1.compact.json
+COMPACT_SUFFIX = ".compact.json"
+
+# يُرمّز العمود النصي بقاموس إذا كان عدد قيمه المختلفة أقل من هذه النسبة من عدد الصفوف
+DICTIONARY_MAX_RATIO = 0.5
+
+
+def has_brotli():
+    """التحقق من توفر مكتبة brotli"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def encode_column(values):
+    """ترميز عمود واحد: قاموس للنصوص المتكررة، أو قائمة القيم كما هي"""
+    if values and all(isinstance(value, str) for value in values):
+        dictionary = {}
+        codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+        if len(dictionary) < len(values) * DICTIONARY_MAX_RATIO:
+            return {"dict": list(dictionary), "codes": codes}
+    return values
+
+
+def encode_columnar(records):
+    """
+    تحويل مصفوفة سجلات إلى الصيغة العمودية
+
+    Args:
+        records (list): قائمة السجلات (dict)
+
+    Returns:
+        dict: البيانات بالصيغة العمودية
+    """
+    columns = []
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns.append(key)
+
+    return {
+        "format": "columnar",
+        "version": COMPACT_FORMAT_VERSION,
+        "rows": len(records),
+        "columns": columns,
+        "data": [encode_column([record.get(key) for record in records]) for key in columns],
+    }
+
+
+def decode_columnar(payload):
+    """إعادة الصيغة العمودية إلى مصفوفة سجلات (عكس encode_columnar)"""
+    columns = []
+    for column in payload["data"]:
+        if isinstance(column, dict):
+            dictionary = column["dict"]
+            column = [dictionary[code] for code in column["codes"]]
+        columns.append(column)
+    return [dict(zip(payload["columns"], row)) for row in zip(*columns)]
+
+
+def dumps_minified(data):
+    """تحويل البيانات إلى JSON مصغّر بدون مسافات"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def compress(payload):
+    """
+    ضغط المحتوى مسبقاً
+
+    Returns:
+        dict: الامتداد (.gz أو .br) ← المحتوى المضغوط
+    """
+    # mtime=0 حتى يكون الناتج ثابتاً لنفس المحتوى
+    compressed = {".gz": gzip.compress(payload, compresslevel=9, mtime=0)}
+    if has_brotli():
+        import brotli
+        compressed[".br"] = brotli.compress(payload, quality=11)
+    return compressed
+
+
+def compact_path(json_file):
+    """مسار الملف المضغوط المقابل لملف JSON"""
+    json_file = Path(json_file)
+    return json_file.with_name(json_file.stem + COMPACT_SUFFIX)
+
+
+def write_compact(json_file):
+    """
+    كتابة النسخة العمودية المصغّرة لملف JSON مع نسخها المضغوطة مسبقاً
+
+    Args:
+        json_file (Path): ملف JSON الأصلي (مصفوفة سجلات)
+
+    Returns:
+        list: مسارات الملفات المكتوبة
+    """
+    with open(json_file, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    output = compact_path(json_file)
+    payload = dumps_minified(encode_columnar(records))
+    files = {output: payload}
+    for suffix, content in compress(payload).items():
+        files[output.with_name(output.name + suffix)] = content
+
+    for path, content in files.items():
+        path.write_bytes(content)
+    return list(files)
+
+
+def parse_time(payload, decode=None, repeat=5):
+    """أقل زمن لتحليل المحتوى (وإعادة بنائه كسجلات إن لزم) بالملي ثانية"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = json.loads(payload)
+        if decode:
+            decode(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def compare_formats(json_file):
+    """
+    مقارنة حجم وزمن تحليل الصيغة الحالية بالصيغة العمودية
+
+    Returns:
+        dict: أحجام الملفات بالبايت (خام، gzip، brotli) وزمن التحليل لكل صيغة
+    """
+    original = Path(json_file).read_bytes()
+    records = json.loads(original)
+    compact = dumps_minified(encode_columnar(records))
+
+    report = {"file": Path(json_file).name, "records": len(records)}
+    for name, payload, decode in (("original", original, None),
+                                  ("compact", compact, decode_columnar)):
+        sizes = {"raw": len(payload)}
+        for suffix, content in compress(payload).items():
+            sizes[suffix.lstrip(".")] = len(content)
+        report[name] = {
+            "bytes": sizes,
+            "parse_ms": parse_time(payload, decode),
+        }
+    return report
+
+
+def data_files(base_dir=None):
+    """ملفات JSON الناتجة الموجودة (الفترات والملاحظات)"""
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    files = [base_dir / spec["output"] for spec in load_manifest()]
+    files.append(base_dir / NOTES_FILE)
+    return [path for path in files if path.exists()]
+
+
+def print_comparison(report):
+    """طباعة مقارنة ملف واحد"""
+    print(f"\n📄 {report['file']} ({report['records']} سجل)")
+    print(f"   {'الصيغة':<10} {'خام':>10} {'gzip':>10} {'brotli':>10} {'التحليل':>10}")
+    for name in ("original", "compact"):
+        sizes = report[name]["bytes"]
+        brotli_size = f"{sizes['br'] / 1024:>7.1f} KB" if "br" in sizes else f"{'-':>10}"
+        print(f"   {name:<10} {sizes['raw'] / 1024:>7.1f} KB {sizes['gz'] / 1024:>7.1f} KB "
+              f"{brotli_size} {report[name]['parse_ms']:>7.2f} ms")
+    saving = 1 - report["compact"]["bytes"]["gz"] / report["original"]["bytes"]["gz"]
+    print(f"   📉 توفير بعد gzip: {saving:.0%}")
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="إنشاء ملفات JSON عمودية مضغوطة ومقارنتها بالصيغة الحالية")
+    parser.add_argument("--report-only", action="store_true", help="طباعة التقرير فقط بدون كتابة ملفات")
+    parser.add_argument("--json", type=Path, default=None, help="حفظ التقرير في ملف JSON")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🗜️ إنشاء ملفات JSON المضغوطة")
+    print("=" * 60)
+
+    files = data_files()
+    if not files:
+        print("❌ لا توجد ملفات JSON، شغّل التحويل أولاً")
+        return 1
+
+    if not has_brotli():
+        print("💡 لإنشاء نسخ brotli: pip install brotli")
+
+    reports = []
+    for json_file in files:
+        if not args.report_only:
+            write_compact(json_file)
+        report = compare_formats(json_file)
+        print_comparison(report)
+        reports.append(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 تم حفظ التقرير: {args.json}")
+
+    if not args.report_only:
+        print(f"\n✅ تم إنشاء {len(files)} ملف بصيغة {COMPACT_SUFFIX} مع نسخها المضغوطة")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
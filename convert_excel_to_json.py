@@ -5,65 +5,44 @@
 يقرأ ملف "الفترة 1.xlsx" ويحوله إلى "period1.json"
 """
 
-import pandas as pd
-import json
-import os
-from pathlib import Path
+import sys
 
-def convert_excel_to_json():
-    """تحويل ملف Excel إلى JSON"""
-    
-    # المسار الحالي للسكريبت
-    script_dir = Path(__file__).parent
+from converter_engine import load_manifest, convert_periods, print_validation
+from run_report import record_run
+
+# رقم الفترة في ملف القائمة periods_manifest.json
+PERIOD_ID = 1
+
+def convert_excel_to_json(force=False, allow_invalid=False):
+    """تحويل ملف Excel إلى JSON عبر محرك التحويل الموحد"""
     
-    # مسارات الملفات
-    excel_file = script_dir / "الفترة 1.xlsx"
-    json_file = script_dir / "period1.json"
+    # البحث عن مواصفات الفترة في القائمة
+    spec = next((p for p in load_manifest() if p["id"] == PERIOD_ID), None)
+    if spec is None:
+        print(f"❌ خطأ: الفترة {PERIOD_ID} غير موجودة في periods_manifest.json")
+        return False
     
     print("🔄 جاري تحويل ملف Excel إلى JSON...")
-    print(f"📂 قراءة الملف: {excel_file.name}")
+    print(f"📂 قراءة الملف: {spec['workbook']}")
+    
+    result = convert_periods([spec], force=force, allow_invalid=allow_invalid)[0]
+    print_validation(result)
     
-    # التحقق من وجود الملف
-    if not excel_file.exists():
-        print(f"❌ خطأ: الملف '{excel_file.name}' غير موجود!")
-        print(f"📍 تأكد من وجود الملف في المجلد: {script_dir}")
+    if not result["success"]:
+        print(f"❌ حدث خطأ أثناء التحويل: {result['error']}")
         return False
     
-    try:
-        # قراءة ملف Excel
-        df = pd.read_excel(excel_file)
-        
-        # عرض معلومات الملف قبل التنظيف
-        print(f"✅ تم قراءة الملف بنجاح!")
-        print(f"📊 عدد الصفوف قبل التنظيف: {len(df)}")
-        print(f"📋 الأعمدة: {', '.join(df.columns.tolist())}")
-        
-        # إزالة الصفوف التي تحتوي على قيم فارغة في عمود الهوية أو الطالب
-        df = df.dropna(subset=['الهوية', 'الطالب'])
-        
-        # تحويل عمود الهوية إلى أرقام صحيحة (لإزالة .0)
-        df['الهوية'] = df['الهوية'].astype(int)
-        
-        # استبدال أي قيم NaN متبقية بـ 0
-        df = df.fillna(0)
-        
-        print(f"📊 عدد الطلاب بعد التنظيف: {len(df)}")
-        
-        # تحويل DataFrame إلى قائمة من القواميس
-        data = df.to_dict(orient='records')
-        
-        # حفظ البيانات كـ JSON
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=1)
-        
-        print(f"💾 تم حفظ الملف: {json_file.name}")
-        print(f"✨ تم التحويل بنجاح! 🎉")
-        
+    if result.get("skipped"):
+        print(f"⏭️ لم يتغير الملف منذ آخر تحويل، الملف {result['output']} محدث")
         return True
-        
-    except Exception as e:
-        print(f"❌ حدث خطأ أثناء التحويل: {str(e)}")
-        return False
+    
+    print(f"✅ تم قراءة الملف بنجاح!")
+    print(f"📊 عدد الصفوف قبل التنظيف: {result['rows_before']}")
+    print(f"📊 عدد الطلاب بعد التنظيف: {result['rows']}")
+    print(f"💾 تم حفظ الملف: {result['output']}")
+    print(f"✨ تم التحويل بنجاح! 🎉")
+    
+    return True
 
 def main():
     """الدالة الرئيسية"""
@@ -72,7 +51,10 @@ def main():
     print("=" * 60)
     print()
     
-    success = convert_excel_to_json()
+    with record_run("convert_excel_to_json") as report:
+        success = convert_excel_to_json(force="--force" in sys.argv,
+                                        allow_invalid="--allow-invalid" in sys.argv)
+        report["success"] = success
     
     print()
     print("=" * 60)
@@ -84,6 +66,8 @@ def main():
         print("⚠️ فشل التحويل، راجع الأخطاء أعلاه")
     
     print("=" * 60)
+    
+    return success
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
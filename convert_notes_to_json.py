@@ -3,14 +3,50 @@
 """
 تحويل ملف الملاحظات السلوكية من Excel إلى JSON
 يقرأ ملف "الملاحظات.xlsx" ويحوله إلى "notes.json"
+
+لكل ملاحظة بالإضافة إلى التاريخ الهجري المنسق للعرض ("التاريخ") حقول تاريخ
+منظمة للفرز والتصفية بدون قراءة النص العربي:
+- التاريخ_الميلادي: "2025-11-06"
+- التاريخ_الهجري: "1447-05-15" (سنة-شهر-يوم، يُفرز كنص)
+- رقم_اليوم: عدد الأيام منذ 1970-01-01 (20398)
 """
 
+import argparse
+import numpy as np
 import pandas as pd
 import json
-import os
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 import re
-from umm_alqura_calendar import convert_excel_date_to_hijri
+import sys
+from umm_alqura_calendar import (EPOCH_ORDINAL, format_hijri_dates, hijri_date_parts, hijri_to_ordinal,
+                                 parse_hijri_date, calendar_settings)
+from build_cache import input_digests, is_up_to_date, record_build
+from excel_readers import BACKENDS, read_workbook
+from excel_stream import DEFAULT_CHUNK_SIZE, JsonArrayWriter, iter_excel_chunks
+from compact_output import write_compact
+from run_report import record_run, stage
+
+# إصدار محول الملاحظات - يجب زيادته عند تغيير منطق التحويل لإجبار إعادة البناء
+NOTES_CONVERTER_VERSION = "1.3"
+
+# نمط تنسيق التواريخ الهجرية في ملف الملاحظات
+HIJRI_FORMAT_STYLE = "full"
+
+# الأعمدة التي يجب أن تكون موجودة في ملف الملاحظات
+REQUIRED_COLUMNS = ['اسم الطالب', 'المشكلة']
+
+# أنماط تنظيف الأسماء (مشتركة بين الدالة الفردية والدالة المتجهة)
+WHITESPACE_PATTERN = r'\s+'
+DIACRITICS_PATTERN = r'[ًٌٍَُِّْ]'
+
+def build_params():
+    """إعدادات التحويل التي تدخل في بصمة البناء لملف الملاحظات"""
+    hijri = calendar_settings()
+    hijri["format_style"] = HIJRI_FORMAT_STYLE
+    return {"converter_version": NOTES_CONVERTER_VERSION, "hijri": hijri}
 
 def normalize_name(name):
     """
@@ -24,13 +60,216 @@ def normalize_name(name):
     
     name = str(name).strip()
     # توحيد المسافات المتعددة إلى مسافة واحدة
-    name = re.sub(r'\s+', ' ', name)
+    name = re.sub(WHITESPACE_PATTERN, ' ', name)
     # إزالة التشكيل العربي
-    name = re.sub(r'[ًٌٍَُِّْ]', '', name)
+    name = re.sub(DIACRITICS_PATTERN, '', name)
     
     return name
 
-def convert_excel_to_json():
+def clean_text_column(values):
+    """
+    تحويل عمود نصي إلى نصوص منظفة من المسافات الطرفية دفعة واحدة
+    (القيم الفارغة تصبح سترينغ فارغ)
+    """
+    return values.astype(object).where(values.notna(), "").astype(str).str.strip()
+
+def normalize_names(names):
+    """
+    النسخة المتجهة من normalize_name لعمود كامل من الأسماء
+    
+    Args:
+        names (Series): عمود الأسماء
+    
+    Returns:
+        Series: الأسماء بعد التنظيف (بنفس نتيجة normalize_name لكل قيمة)
+    """
+    return (
+        clean_text_column(names)
+        .str.replace(WHITESPACE_PATTERN, ' ', regex=True)
+        .str.replace(DIACRITICS_PATTERN, '', regex=True)
+    )
+
+def convert_dates_to_hijri(dates, format_style=HIJRI_FORMAT_STYLE):
+    """
+    تحويل عمود تواريخ إلى تواريخ هجرية منسقة دفعة واحدة
+    
+    التحويل بعملية واحدة على العمود كاملاً (بحث في جدول بدايات الأشهر)
+    بدلاً من تحويل كل تاريخ على حدة
+    
+    Args:
+        dates (Series): عمود التواريخ كما قُرئ من Excel
+        format_style (str): نمط التنسيق (انظر convert_excel_date_to_hijri)
+    
+    Returns:
+        Series: التواريخ الهجرية المنسقة (سترينغ فارغ للتواريخ غير الصالحة)
+    """
+    return format_hijri_dates(dates, format_style=format_style)
+
+def structured_dates(dates):
+    """
+    حقول التاريخ المنظمة لعمود تواريخ دفعة واحدة
+    
+    Args:
+        dates (Series): عمود التواريخ كما قُرئ من Excel
+    
+    Returns:
+        tuple: ثلاث Series (القيمة None للتواريخ غير الصالحة):
+               التاريخ الميلادي "YYYY-MM-DD"، التاريخ الهجري "YYYY-MM-DD"،
+               رقم اليوم منذ 1970-01-01
+    """
+    days = pd.to_datetime(dates, errors='coerce').dt.normalize()
+    valid = days.notna()
+    
+    iso = days.dt.strftime('%Y-%m-%d').astype(object).where(valid, None)
+    day_numbers = (days - pd.Timestamp(0)).dt.days
+    day_numbers = day_numbers.astype('Int64').astype(object).where(valid, None)
+    
+    parts = hijri_date_parts(days)
+    hijri = (
+        parts["year"].astype(str).str.zfill(4) + "-"
+        + parts["month"].astype(str).str.zfill(2) + "-"
+        + parts["day"].astype(str).str.zfill(2)
+    ).astype(object).where(parts["year"].notna(), None)
+    return iso, hijri, day_numbers
+
+@lru_cache(maxsize=None)
+def legacy_date_fields(text):
+    """
+    حقول التاريخ المنظمة من التاريخ الهجري المنسق، للملاحظات بالصيغة القديمة
+    (notes.json قبل الإصدار 1.3 بدون التاريخ_الميلادي والتاريخ_الهجري ورقم_اليوم)
+    
+    Returns:
+        tuple: (التاريخ الميلادي، التاريخ الهجري، رقم اليوم)، أو ثلاث قيم None
+    
+    Example:
+        >>> legacy_date_fields("الخميس, 15 جمادى الأولى, 1447")
+        ('2025-11-06', '1447-05-15', 20398)
+    """
+    parsed = parse_hijri_date(text)
+    if parsed is None:
+        return None, None, None
+    try:
+        ordinal = hijri_to_ordinal(*parsed)
+    except (OverflowError, ValueError):
+        return None, None, None
+    return datetime.fromordinal(ordinal).date().isoformat(), "%04d-%02d-%02d" % parsed, ordinal - EPOCH_ORDINAL
+
+def note_date_fields(note):
+    """
+    حقول التاريخ المنظمة لملاحظة، مع قراءة النص العربي للملاحظات بالصيغة القديمة
+    
+    Returns:
+        tuple: (التاريخ الميلادي، التاريخ الهجري، رقم اليوم)
+    
+    Example:
+        >>> note_date_fields({"التاريخ": "الخميس, 15 جمادى الأولى, 1447"})
+        ('2025-11-06', '1447-05-15', 20398)
+    """
+    if note.get("التاريخ_الهجري") is not None:
+        return note.get("التاريخ_الميلادي"), note["التاريخ_الهجري"], note.get("رقم_اليوم")
+    return legacy_date_fields(note.get("التاريخ"))
+
+def build_notes_records(df):
+    """
+    بناء قائمة الملاحظات من DataFrame باستخدام عمليات على الأعمدة
+    
+    Args:
+        df (DataFrame): بيانات الملاحظات كما قُرئت من Excel
+    
+    Returns:
+        list: الملاحظات الصالحة (التي لها اسم طالب ومشكلة)
+    """
+    count = len(df)
+    
+    with stage("normalize_names", rows=count):
+        names = normalize_names(df['اسم الطالب'])
+    
+    with stage("clean_columns", rows=count):
+        problems = clean_text_column(df['المشكلة'])
+        
+        if 'الصف' in df.columns:
+            classes = np.trunc(pd.to_numeric(df['الصف'], errors='coerce'))
+            classes = classes.astype('Int64').astype(object).where(classes.notna(), None)
+        else:
+            classes = pd.Series([None] * count, index=df.index, dtype=object)
+        
+        if 'الإجراء' in df.columns:
+            actions = clean_text_column(df['الإجراء'])
+        else:
+            actions = pd.Series([''] * count, index=df.index)
+    
+    with stage("hijri_conversion", rows=count):
+        if 'التاريخ' in df.columns:
+            dates = convert_dates_to_hijri(df['التاريخ'])
+            iso_dates, hijri_dates, day_numbers = structured_dates(df['التاريخ'])
+        else:
+            dates = pd.Series([''] * count, index=df.index)
+            iso_dates = hijri_dates = day_numbers = pd.Series([None] * count, index=df.index, dtype=object)
+    
+    with stage("build_records") as info:
+        # إضافة الملاحظة فقط إذا كان لها اسم طالب ومشكلة
+        valid = (names != '') & (problems != '')
+        
+        notes = [
+            {
+                "اسم_الطالب": name,
+                "التاريخ": date,
+                "المشكلة": problem,
+                "الصف": student_class,
+                "الإجراء": action,
+                "التاريخ_الميلادي": iso_date,
+                "التاريخ_الهجري": hijri_date,
+                "رقم_اليوم": day_number
+            }
+            for name, date, problem, student_class, action, iso_date, hijri_date, day_number in zip(
+                names[valid], dates[valid], problems[valid], classes[valid], actions[valid],
+                iso_dates[valid], hijri_dates[valid], day_numbers[valid]
+            )
+        ]
+        info["rows"] = len(notes)
+    
+    return notes
+
+class MissingColumnError(ValueError):
+    """عمود مطلوب غير موجود في ملف الملاحظات"""
+    
+    def __init__(self, column, columns):
+        super().__init__(f"العمود '{column}' غير موجود في الملف")
+        self.column = column
+        self.columns = list(columns)
+
+def check_required_columns(df):
+    """التحقق من وجود الأعمدة المطلوبة، ورمي MissingColumnError إذا نقص أحدها"""
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            raise MissingColumnError(col, df.columns)
+
+def convert_notes_streaming(excel_file, json_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    تحويل ملف الملاحظات على دفعات وكتابة JSON تدريجياً
+    
+    Returns:
+        tuple: (عدد الصفوف المقروءة، عدد الملاحظات الصالحة، عدد الملاحظات لكل طالب)
+    """
+    rows_count = 0
+    notes_per_student = Counter()
+    with JsonArrayWriter(json_file, indent=2) as writer:
+        chunks = iter_excel_chunks(excel_file, header=1, chunk_size=chunk_size)
+        while True:
+            with stage("read_excel") as info:
+                chunk = next(chunks, None)
+                info["rows"] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            check_required_columns(chunk)
+            rows_count += len(chunk)
+            notes_data = build_notes_records(chunk)
+            notes_per_student.update(note["اسم_الطالب"] for note in notes_data)
+            with stage("write_json", rows=len(notes_data)):
+                writer.write(notes_data)
+    return rows_count, writer.count, notes_per_student
+
+def convert_excel_to_json(force=False, streaming=False, reader="auto"):
     """تحويل ملف Excel الملاحظات إلى JSON"""
     
     # المسار الحالي للسكريبت
@@ -56,83 +295,78 @@ def convert_excel_to_json():
         print("   - الإجراء")
         return False
     
+    # تخطي التحويل إذا لم يتغير ملف Excel أو إعدادات التحويل منذ آخر بناء
+    with stage("check_up_to_date"):
+        digests = input_digests([excel_file])
+        up_to_date = not force and is_up_to_date(json_file.name, [excel_file], build_params(), [json_file],
+                                                 digests=digests)
+    if up_to_date:
+        print(f"⏭️ لم يتغير الملف منذ آخر تحويل، الملف {json_file.name} محدث")
+        return True
+    
     try:
-        # قراءة ملف Excel
-        # نحدد header=1 لأن الصف الأول عنوان والصف الثاني يحتوي على أسماء الأعمدة
-        df = pd.read_excel(excel_file, header=1)
-        
-        # عرض معلومات الملف
-        print(f"✅ تم قراءة الملف بنجاح!")
-        print(f"📊 عدد الملاحظات: {len(df)}")
-        print(f"📋 الأعمدة الموجودة: {', '.join(str(col) for col in df.columns.tolist())}")
-        print()
-        
-        # تنظيف البيانات
-        print("🧹 جاري تنظيف البيانات...")
-        
-        # التحقق من وجود الأعمدة المطلوبة
-        required_columns = ['اسم الطالب', 'المشكلة']
-        for col in required_columns:
-            if col not in df.columns:
-                print(f"❌ خطأ: العمود '{col}' غير موجود في الملف!")
-                print(f"الأعمدة الموجودة: {', '.join(df.columns.tolist())}")
-                return False
-        
-        # تنظيف الأسماء
-        if 'اسم الطالب' in df.columns:
-            df['اسم الطالب'] = df['اسم الطالب'].apply(normalize_name)
+        if streaming:
+            # قراءة وكتابة على دفعات دون تحميل الملف كاملاً في الذاكرة
+            print("🌊 وضع القراءة التدفقية (على دفعات)")
+            rows_count, notes_count, notes_per_student = convert_notes_streaming(excel_file, json_file)
+            print(f"✅ تم قراءة الملف بنجاح!")
+            print(f"📊 عدد الملاحظات: {rows_count}")
+        else:
+            # قراءة ملف Excel
+            # نحدد header=1 لأن الصف الأول عنوان والصف الثاني يحتوي على أسماء الأعمدة
+            with stage("read_excel") as info:
+                df = read_workbook(excel_file, header=1, backend=reader)
+                info["rows"] = len(df)
+            
+            # عرض معلومات الملف
+            print(f"✅ تم قراءة الملف بنجاح!")
+            print(f"📊 عدد الملاحظات: {len(df)}")
+            print(f"📋 الأعمدة الموجودة: {', '.join(str(col) for col in df.columns.tolist())}")
+            print()
+            
+            # تنظيف البيانات
+            print("🧹 جاري تنظيف البيانات...")
+            
+            # التحقق من وجود الأعمدة المطلوبة
+            check_required_columns(df)
+            
+            # تنظيف الأسماء والتواريخ وبناء الملاحظات دفعة واحدة لكل عمود
+            notes_data = build_notes_records(df)
             print(f"   ✓ تم تنظيف أسماء الطلاب")
-        
-        # تحويل التاريخ إلى هجري (تقويم أم القرى) بصيغة عربية جميلة
-        if 'التاريخ' in df.columns:
-            # تحويل التاريخ من Excel إلى تاريخ هجري منسق
-            df['التاريخ'] = pd.to_datetime(df['التاريخ'], errors='coerce')
-            df['التاريخ'] = df['التاريخ'].apply(
-                lambda x: convert_excel_date_to_hijri(x, format_style="full") if pd.notna(x) else ''
-            )
-            print(f"   ✓ تم تحويل التواريخ إلى هجري (تقويم أم القرى)")
-        
-        # إزالة الصفوف الفارغة
-        df = df.dropna(subset=['اسم الطالب', 'المشكلة'], how='all')
-        print(f"   ✓ تم إزالة الصفوف الفارغة")
-        
-        # إنشاء البيانات المنظمة
-        notes_data = []
-        for idx, row in df.iterrows():
-            note = {
-                "اسم_الطالب": normalize_name(row.get('اسم الطالب', '')),
-                "التاريخ": row.get('التاريخ', ''),
-                "المشكلة": str(row.get('المشكلة', '')).strip(),
-                "الصف": int(row.get('الصف', 0)) if pd.notna(row.get('الصف')) else None,
-                "الإجراء": str(row.get('الإجراء', '')).strip() if pd.notna(row.get('الإجراء')) else ""
-            }
+            if 'التاريخ' in df.columns:
+                print(f"   ✓ تم تحويل التواريخ إلى هجري (تقويم أم القرى)")
+            print(f"   ✓ تم إزالة الصفوف الفارغة")
+            
+            # حفظ البيانات كـ JSON
+            with stage("write_json", rows=len(notes_data)):
+                with open(json_file, 'w', encoding='utf-8') as f:
+                    json.dump(notes_data, f, ensure_ascii=False, indent=2)
             
-            # إضافة الملاحظة فقط إذا كان لها اسم طالب ومشكلة
-            if note["اسم_الطالب"] and note["المشكلة"]:
-                notes_data.append(note)
+            notes_count = len(notes_data)
+            notes_per_student = Counter(note["اسم_الطالب"] for note in notes_data)
         
-        print(f"📝 عدد الملاحظات الصالحة: {len(notes_data)}")
+        print(f"📝 عدد الملاحظات الصالحة: {notes_count}")
         
         # إحصائيات إضافية
-        if notes_data:
-            unique_students = len(set(note["اسم_الطالب"] for note in notes_data))
-            print(f"👥 عدد الطلاب المذكورين: {unique_students}")
+        if notes_count:
+            print(f"👥 عدد الطلاب المذكورين: {len(notes_per_student)}")
             
-            # عرض نماذج من الطلاب
+            # عرض الطلاب الأكثر ملاحظات
             print("\n📌 نماذج من الطلاب:")
-            sample_students = list(set(note["اسم_الطالب"] for note in notes_data))[:5]
-            for student in sample_students:
-                student_notes_count = sum(1 for note in notes_data if note["اسم_الطالب"] == student)
+            for student, student_notes_count in notes_per_student.most_common(5):
                 print(f"   - {student} ({student_notes_count} ملاحظة)")
         
-        # حفظ البيانات كـ JSON
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(notes_data, f, ensure_ascii=False, indent=2)
+        record_build(json_file.name, [excel_file], [json_file], build_params(), digests=digests)
         
         print(f"\n💾 تم حفظ الملف: {json_file.name}")
         print(f"✨ تم التحويل بنجاح! 🎉")
         
         return True
+    
+    except MissingColumnError as e:
+        print(f"❌ خطأ: العمود '{e.column}' غير موجود في الملف!")
+        print(f"الأعمدة الموجودة: {', '.join(str(col) for col in e.columns)}")
+        return False
         
     except Exception as e:
         print(f"❌ حدث خطأ أثناء التحويل: {str(e)}")
@@ -140,14 +374,32 @@ def convert_excel_to_json():
         traceback.print_exc()
         return False
 
-def main():
+def main(argv=None):
     """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تحويل الملاحظات السلوكية من Excel إلى JSON")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة التحويل حتى لو لم يتغير ملف Excel")
+    parser.add_argument("--stream", action="store_true",
+                        help="قراءة تدفقية على دفعات لتقليل استهلاك الذاكرة مع الملفات الكبيرة")
+    parser.add_argument("--reader", choices=BACKENDS, default="auto",
+                        help="محرك قراءة Excel (افتراضي: auto)")
+    parser.add_argument("--compact", action="store_true",
+                        help="إنشاء نسخة JSON عمودية مصغّرة مع نسخ gzip/brotli")
+    args = parser.parse_args(argv)
+    
     print("=" * 70)
     print("📋 برنامج تحويل الملاحظات السلوكية من Excel إلى JSON")
     print("=" * 70)
     print()
     
-    success = convert_excel_to_json()
+    with record_run("convert_notes_to_json") as report:
+        success = convert_excel_to_json(force=args.force, streaming=args.stream, reader=args.reader)
+
+        if success and args.compact:
+            with stage("compact_output"):
+                paths = write_compact(Path(__file__).parent / "notes.json")
+            print(f"🗜️ {', '.join(path.name for path in paths)}")
+        report["success"] = success
     
     print()
     print("=" * 70)
@@ -160,6 +412,8 @@ def main():
         print("⚠️ فشل التحويل، راجع الأخطاء أعلاه")
     
     print("=" * 70)
+    
+    return success
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,474 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محرك تحويل الفترات من Excel إلى JSON
+يقرأ قائمة الفترات من "periods_manifest.json" ويحوّل كل ملف Excel
+إلى ملف JSON الخاص به، مع تحويل الفترات بالتوازي في مجموعة عمليات
+
+الاستخدام:
+    python converter_engine.py               # تحويل جميع الفترات
+    python converter_engine.py --period 2    # تحويل الفترة الثانية فقط
+    python converter_engine.py --workers 4   # تحديد عدد العمليات
+    python converter_engine.py --force       # إعادة التحويل حتى لو لم تتغير الملفات
+    python converter_engine.py --stream      # قراءة تدفقية للملفات الكبيرة جداً
+    python converter_engine.py --reader calamine  # اختيار محرك قراءة Excel
+    python converter_engine.py --compact     # إنشاء نسخة عمودية مضغوطة (انظر compact_output.py)
+    python converter_engine.py --allow-invalid  # النشر رغم أخطاء التحقق (انظر sheet_validation.py)
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from build_cache import BUILD_MANIFEST_FILE, input_digests, is_up_to_date, record_build
+from excel_readers import BACKENDS, read_workbook
+from excel_stream import DEFAULT_CHUNK_SIZE, JsonArrayWriter, iter_excel_chunks
+from run_report import add_stages, profiling_mode, record_run, stage, take_stages
+
+# مكتبات التحقق (numpy و pandas) تُستورد داخل الدوال التي تحتاجها فقط، حتى تبقى
+# السكريبتات الخفيفة التي تحتاج load_manifest فقط (مثل save_update_date) سريعة التشغيل
+
+# إصدار المحول - يجب زيادته عند تغيير منطق التحويل لإجبار إعادة البناء
+CONVERTER_VERSION = "2.0"
+
+# المجلد الافتراضي لملفات Excel و JSON
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف قائمة الفترات الافتراضي
+MANIFEST_FILE = SCRIPT_DIR / "periods_manifest.json"
+
+# القيم الافتراضية لقواعد التنظيف إذا لم تُحدد في القائمة
+DEFAULT_PERIOD_SPEC = {
+    "header": 0,
+    "required_columns": ["الهوية", "الطالب"],
+    "int_columns": ["الهوية"],
+    "fill_value": 0,
+    "indent": 1,
+}
+
+
+def load_manifest(manifest_file=None):
+    """
+    قراءة قائمة الفترات من ملف JSON
+
+    Args:
+        manifest_file (Path): مسار ملف القائمة (افتراضي: periods_manifest.json)
+
+    Returns:
+        list: قائمة مواصفات الفترات بعد دمجها مع القيم الافتراضية
+    """
+    manifest_file = Path(manifest_file) if manifest_file else MANIFEST_FILE
+
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    periods = []
+    for entry in manifest.get("periods", []):
+        spec = dict(DEFAULT_PERIOD_SPEC)
+        spec.update(entry)
+        spec.setdefault("name", f"الفترة {spec['id']}")
+        periods.append(spec)
+
+    return periods
+
+
+def clean_period_dataframe(df, spec):
+    """
+    تطبيق قواعد التنظيف المحددة للفترة على DataFrame
+
+    Args:
+        df (DataFrame): البيانات كما قُرئت من Excel
+        spec (dict): مواصفات الفترة (الأعمدة المطلوبة، الأعمدة الصحيحة، قيمة التعبئة)
+
+    Returns:
+        DataFrame: البيانات بعد التنظيف
+    """
+    # إزالة الصفوف التي تحتوي على قيم فارغة في الأعمدة المطلوبة
+    df = df.dropna(subset=spec["required_columns"])
+
+    # تحويل الأعمدة الصحيحة (مثل الهوية) إلى أرقام صحيحة (لإزالة .0)
+    for col in spec["int_columns"]:
+        df[col] = df[col].astype(int)
+
+    # الاحتفاظ بالأعمدة المحددة فقط إذا وُجد مخطط للأعمدة
+    if spec.get("columns"):
+        df = df[spec["columns"]]
+
+    # استبدال أي قيم NaN متبقية بقيمة التعبئة
+    return df.fillna(spec["fill_value"])
+
+
+def convert_period_streaming(spec, excel_file, json_file, validator, allow_invalid=False,
+                             chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    تحويل ملف Excel إلى JSON على دفعات دون تحميل الملف كاملاً في الذاكرة
+
+    تُفحص كل دفعة قبل كتابتها، وإذا وُجدت أخطاء في نهاية الملف يُحذف الملف
+    المؤقت فلا يُستبدل ملف JSON المنشور
+
+    Returns:
+        tuple: (عدد الصفوف قبل التنظيف، عدد الطلاب بعد التنظيف)
+    """
+    from sheet_validation import ValidationError
+
+    prefix = f"period{spec['id']}"
+    rows_before = 0
+    with JsonArrayWriter(json_file, indent=spec["indent"]) as writer:
+        chunks = iter_excel_chunks(excel_file, header=spec["header"], chunk_size=chunk_size)
+        while True:
+            with stage(f"{prefix}.read_excel") as info:
+                chunk = next(chunks, None)
+                info["rows"] = 0 if chunk is None else len(chunk)
+            if chunk is None:
+                break
+            rows_before += len(chunk)
+            with stage(f"{prefix}.validate", rows=len(chunk)):
+                validator.check(chunk)
+            with stage(f"{prefix}.clean", rows=len(chunk)):
+                chunk = clean_period_dataframe(chunk, spec)
+            with stage(f"{prefix}.write_json", rows=len(chunk)):
+                writer.write(chunk.to_dict(orient='records'))
+
+        if validator.errors and not allow_invalid:
+            raise ValidationError(validator.errors)
+    return rows_before, writer.count
+
+
+def convert_period(spec, base_dir=None, streaming=False, reader="auto", allow_invalid=False):
+    """
+    تحويل ملف Excel لفترة واحدة إلى JSON
+
+    تعمل هذه الدالة داخل عملية مستقلة عند التحويل المتوازي،
+    لذلك تعيد النتيجة كقاموس بسيط بدلاً من رمي الاستثناءات،
+    ومعها قياسات مراحلها (stages) لإضافتها إلى سجل التشغيل في العملية الرئيسية
+
+    Args:
+        spec (dict): مواصفات الفترة من القائمة
+        base_dir (Path): المجلد الذي يحتوي على الملفات (افتراضي: مجلد السكريبت)
+        streaming (bool): القراءة والكتابة على دفعات (للملفات الكبيرة جداً)
+        reader (str): محرك قراءة Excel (انظر excel_readers.BACKENDS)
+        allow_invalid (bool): كتابة الملف رغم وجود أخطاء في التحقق
+
+    Returns:
+        dict: نتيجة التحويل (success, rows, output, error, validation, students, stages)
+    """
+    from sheet_validation import PeriodValidator, ValidationError
+
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    excel_file = base_dir / spec["workbook"]
+    json_file = base_dir / spec["output"]
+
+    result = {
+        "id": spec["id"],
+        "name": spec["name"],
+        "output": spec["output"],
+        "success": False,
+        "rows": 0,
+        "error": None,
+    }
+
+    # التحقق من وجود الملف
+    if not excel_file.exists():
+        result["error"] = f"الملف '{excel_file.name}' غير موجود في المجلد: {base_dir}"
+        return result
+
+    prefix = f"period{spec['id']}"
+    validator = PeriodValidator(spec)
+    try:
+        if streaming:
+            rows_before, rows = convert_period_streaming(spec, excel_file, json_file,
+                                                         validator, allow_invalid)
+            result.update(success=True, rows=rows, rows_before=rows_before)
+            return result
+
+        # قراءة ملف Excel
+        with stage(f"{prefix}.read_excel") as info:
+            df = read_workbook(excel_file, header=spec["header"], backend=reader)
+            info["rows"] = rows_before = len(df)
+
+        # التحقق قبل كتابة أي ملف
+        with stage(f"{prefix}.validate", rows=len(df)):
+            validator.check(df)
+        if validator.errors and not allow_invalid:
+            raise ValidationError(validator.errors)
+
+        with stage(f"{prefix}.clean") as info:
+            df = clean_period_dataframe(df, spec)
+            info["rows"] = len(df)
+
+        # حفظ البيانات كـ JSON
+        with stage(f"{prefix}.write_json", rows=len(df)):
+            data = df.to_dict(orient='records')
+            with open(json_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=spec["indent"])
+
+        result.update(success=True, rows=len(df), rows_before=rows_before)
+
+    except Exception as e:
+        result["error"] = str(e)
+
+    finally:
+        result["validation"] = validator.report()
+        result["students"] = validator.names
+        result["stages"] = take_stages()
+
+    return result
+
+
+def build_params(spec):
+    """إعدادات التحويل التي تدخل في بصمة البناء للفترة"""
+    return {"converter_version": CONVERTER_VERSION, "spec": spec}
+
+
+def skipped_result(spec):
+    """نتيجة فترة تم تخطيها لأن ملفاتها لم تتغير منذ آخر بناء"""
+    return {
+        "id": spec["id"],
+        "name": spec["name"],
+        "output": spec["output"],
+        "success": True,
+        "skipped": True,
+        "rows": 0,
+        "error": None,
+    }
+
+
+def convert_periods(periods=None, max_workers=None, base_dir=None, force=False,
+                    streaming=False, reader="auto", allow_invalid=False):
+    """
+    تحويل مجموعة من الفترات بالتوازي
+
+    الفترات التي لم تتغير ملفاتها أو قواعد تحويلها منذ آخر بناء يتم تخطيها
+    (إلا عند استخدام force)، ويُحدّث سجل البناء في العملية الرئيسية فقط
+
+    Args:
+        periods (list): مواصفات الفترات (افتراضي: جميع الفترات في القائمة)
+        max_workers (int): الحد الأقصى لعدد العمليات (افتراضي: عدد الفترات)
+        base_dir (Path): المجلد الذي يحتوي على الملفات
+        force (bool): إعادة التحويل حتى لو لم تتغير الملفات
+        streaming (bool): القراءة والكتابة على دفعات (للملفات الكبيرة جداً)
+        reader (str): محرك قراءة Excel (انظر excel_readers.BACKENDS)
+        allow_invalid (bool): كتابة الملفات رغم وجود أخطاء في التحقق
+
+    Returns:
+        list: نتائج التحويل بنفس ترتيب الفترات
+    """
+    if periods is None:
+        periods = load_manifest()
+
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    build_manifest = base_dir / BUILD_MANIFEST_FILE.name
+
+    results = {}
+    pending = []
+    # بصمات ملفات Excel قبل قراءتها، لتسجيلها مع الناتج المبني منها
+    digests = {}
+    with stage("check_up_to_date", rows=len(periods)):
+        for spec in periods:
+            inputs = [base_dir / spec["workbook"]]
+            outputs = [base_dir / spec["output"]]
+            digests[spec["id"]] = input_digests(inputs)
+            if not force and is_up_to_date(spec["output"], inputs, build_params(spec),
+                                           outputs, build_manifest, digests[spec["id"]]):
+                results[spec["id"]] = skipped_result(spec)
+            else:
+                pending.append(spec)
+
+    # المراحل المسجلة قبل التحويل (تُفرّغ داخل convert_period في نفس العملية)
+    parent_stages = take_stages()
+
+    # لا حاجة لمجموعة عمليات مع فترة واحدة، ولا مع التحليل المفصل (يقيس العملية الحالية فقط)
+    if len(pending) <= 1 or max_workers == 1 or profiling_mode():
+        converted = [convert_period(spec, base_dir, streaming, reader, allow_invalid)
+                     for spec in pending]
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn بدلاً من fork: التحويل قد يعمل بجانب خيوط أخرى (update_pipeline.py)،
+        # وإنشاء عملية بـ fork أثناء عمل الخيوط قد يعلق على قفل نسخته العملية الفرعية
+        workers = min(max_workers or len(pending), len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            converted = list(executor.map(convert_period, pending,
+                                          [base_dir] * len(pending),
+                                          [streaming] * len(pending),
+                                          [reader] * len(pending),
+                                          [allow_invalid] * len(pending)))
+
+    add_stages(parent_stages)
+    students = {}
+    for spec, result in zip(pending, converted):
+        add_stages(result.pop("stages", []))
+        students[spec["id"]] = result.pop("students", {})
+        if result["success"]:
+            record_build(spec["output"], [base_dir / spec["workbook"]],
+                         [base_dir / spec["output"]], build_params(spec), build_manifest,
+                         digests[spec["id"]])
+        results[spec["id"]] = result
+
+    if pending:
+        # المقارنة مع جميع الفترات في القائمة وليس المطلوبة فقط
+        all_periods = {spec["id"]: spec for spec in load_manifest()}
+        all_periods.update((spec["id"], spec) for spec in periods)
+        with stage("cross_period_validation"):
+            validate_across_periods(list(all_periods.values()), results, students, base_dir)
+
+    return [results[spec["id"]] for spec in periods]
+
+
+def validate_across_periods(periods, results, students, base_dir):
+    """
+    مقارنة الطلاب بين جميع الفترات وحفظ تقرير التحقق
+
+    الفترات التي لم تُحوّل هذه المرة تُقرأ هوياتها من ملفات JSON الحالية.
+    تُضاف المخالفات إلى نتيجة أول فترة محوّلة (cross_period) لعرضها
+    """
+    from sheet_validation import cross_period_violations, write_report
+
+    for spec in periods:
+        if spec["id"] not in students:
+            try:
+                with open(base_dir / spec["output"], 'r', encoding='utf-8') as f:
+                    students[spec["id"]] = {s["الهوية"]: s.get("الطالب") for s in json.load(f)
+                                            if s.get("الهوية")}
+            except (OSError, ValueError):
+                continue
+
+    names = {}
+    for period_students in students.values():
+        names.update(period_students)
+    ids_by_period = {spec["name"]: set(students[spec["id"]])
+                     for spec in periods if spec["id"] in students}
+    cross_period = cross_period_violations(ids_by_period, names)
+
+    period_reports = {results[spec_id]["output"]: results[spec_id]["validation"]
+                      for spec_id in results if "validation" in results[spec_id]}
+    write_report(period_reports, cross_period, base_dir)
+
+    first = next((r for r in results.values() if "validation" in r), None)
+    if first is not None:
+        first["cross_period"] = cross_period
+
+
+def print_result(result):
+    """طباعة نتيجة تحويل فترة واحدة مع مخالفات التحقق إن وُجدت"""
+    if result.get("skipped"):
+        print(f"⏭️ {result['name']}: لم يتغير الملف، تم التخطي → {result['output']}")
+    elif result["success"]:
+        print(f"✅ {result['name']}: {result['rows']} طالب → {result['output']}")
+    else:
+        print(f"❌ {result['name']}: {result['error']}")
+    print_validation(result)
+
+
+def print_validation(result):
+    """طباعة مخالفات التحقق لنتيجة فترة (إن وُجدت)"""
+    from sheet_validation import print_violations
+
+    validation = result.get("validation")
+    if validation and validation["violations"]:
+        print(f"   🧪 التحقق: {validation['errors']} خطأ، {validation['warnings']} تحذير")
+        print_violations(validation["violations"], 5)
+    if result.get("cross_period"):
+        print(f"   🔀 طلاب غير موجودين في كل الفترات: {len(result['cross_period'])}")
+        print_violations(result["cross_period"], 5)
+
+
+def run(period_ids=None, max_workers=None, manifest_file=None, force=False, streaming=False,
+        reader="auto", compact=False, allow_invalid=False):
+    """
+    تحويل الفترات المحددة وطباعة النتائج
+
+    Args:
+        period_ids (list): أرقام الفترات المطلوبة (افتراضي: الكل)
+        max_workers (int): الحد الأقصى لعدد العمليات
+        manifest_file (Path): مسار ملف القائمة
+        force (bool): إعادة التحويل حتى لو لم تتغير الملفات
+        streaming (bool): القراءة والكتابة على دفعات (للملفات الكبيرة جداً)
+        reader (str): محرك قراءة Excel (انظر excel_readers.BACKENDS)
+        compact (bool): إنشاء النسخة العمودية المضغوطة لكل ملف ناتج
+        allow_invalid (bool): كتابة الملفات رغم وجود أخطاء في التحقق
+
+    Returns:
+        bool: True إذا نجح تحويل جميع الفترات
+    """
+    periods = load_manifest(manifest_file)
+
+    if period_ids:
+        periods = [p for p in periods if p["id"] in period_ids]
+        if not periods:
+            print(f"❌ خطأ: لا توجد فترات بالأرقام {period_ids} في القائمة")
+            return False
+
+    print(f"🔄 جاري تحويل {len(periods)} فترة من Excel إلى JSON...")
+    for spec in periods:
+        print(f"📂 {spec['name']}: {spec['workbook']}")
+    print()
+
+    results = convert_periods(periods, max_workers=max_workers, force=force,
+                              streaming=streaming, reader=reader, allow_invalid=allow_invalid)
+    for result in results:
+        print_result(result)
+
+    if compact:
+        # استيراد محلي لأن compact_output يعتمد على هذا الملف
+        from compact_output import write_compact
+        for spec, result in zip(periods, results):
+            if result["success"]:
+                with stage(f"period{spec['id']}.compact_output"):
+                    paths = write_compact(SCRIPT_DIR / spec["output"])
+                print(f"🗜️ {spec['name']}: {', '.join(path.name for path in paths)}")
+
+    return all(r["success"] for r in results)
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تحويل ملفات الفترات من Excel إلى JSON")
+    parser.add_argument("--period", type=int, action="append", dest="periods",
+                        help="رقم الفترة المطلوب تحويلها (يمكن تكراره)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="الحد الأقصى لعدد العمليات المتوازية")
+    parser.add_argument("--manifest", type=Path, default=None,
+                        help="مسار ملف قائمة الفترات")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة التحويل حتى لو لم تتغير ملفات Excel")
+    parser.add_argument("--stream", action="store_true",
+                        help="قراءة تدفقية على دفعات لتقليل استهلاك الذاكرة مع الملفات الكبيرة")
+    parser.add_argument("--reader", choices=BACKENDS, default="auto",
+                        help="محرك قراءة Excel (افتراضي: auto)")
+    parser.add_argument("--compact", action="store_true",
+                        help="إنشاء نسخة JSON عمودية مصغّرة مع نسخ gzip/brotli")
+    parser.add_argument("--allow-invalid", action="store_true",
+                        help="كتابة ملفات JSON رغم وجود أخطاء في التحقق من الدرجات")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🎓 برنامج تحويل درجات الطلاب من Excel إلى JSON")
+    print("=" * 60)
+    print()
+
+    with record_run("converter_engine") as report:
+        success = run(args.periods, args.workers, args.manifest, args.force, args.stream,
+                      args.reader, args.compact, args.allow_invalid)
+        report["success"] = success
+
+    print()
+    print("=" * 60)
+
+    if success:
+        print("✅ اكتمل التحويل بنجاح!")
+        print("💡 يمكنك الآن استخدام الموقع لعرض الدرجات المحدثة")
+    else:
+        print("⚠️ فشل التحويل، راجع الأخطاء أعلاه")
+
+    print("=" * 60)
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,9 +14,14 @@ Write-Host "🔄 بدء عملية الرفع..." -ForegroundColor Cyan
 Write-Host "📍 التأكد من الفرع الرئيسي..." -ForegroundColor Yellow
 git checkout main
 
-# إضافة جميع التعديلات
+# إضافة الملفات المتتبعة المعدلة (الكود والصفحات) وملفات البيانات التي تغيرت فقط
+# (الملفات الجديدة غير البيانات تُضاف يدوياً بـ git add حتى لا تُرفع ملفات Excel والملفات المؤقتة)
 Write-Host "📦 إضافة الملفات المعدلة..." -ForegroundColor Yellow
-git add .
+git add -u
+$changedPaths = python publish_delta.py --paths
+if ($changedPaths) {
+    git add -- $changedPaths
+}
 
 # عمل commit
 Write-Host "💾 حفظ التعديلات..." -ForegroundColor Yellow
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+محركات قراءة ملفات Excel القابلة للاستبدال (Reader Backends)
+يتيح للمحولات اختيار طريقة قراءة ملف Excel:
+
+- "openpyxl": المحرك الافتراضي في pandas (متوفر دائماً)
+- "calamine": محرك مكتوب بلغة Rust وأسرع بكثير (يتطلب: pip install python-calamine)
+- "cache": نسخة محفوظة من الملف بعد قراءته، تُستخدم طالما لم يتغير الملف
+  (انظر workbook_cache.py)
+
+عند اختيار "auto" يُستخدم الملف المحفوظ إن وُجد، وإلا أسرع محرك متوفر،
+مع الرجوع إلى openpyxl إذا فشل المحرك الأسرع
+
+الاستخدام:
+    from excel_readers import read_workbook
+
+    df = read_workbook("الفترة 1.xlsx")                      # اختيار تلقائي
+    df = read_workbook("الملاحظات.xlsx", header=1, backend="calamine")
+"""
+
+from workbook_cache import cache_key, load_cached, store_cached
+
+# أسماء المحركات المتاحة للاختيار
+BACKENDS = ["auto", "openpyxl", "calamine", "cache"]
+
+# ترتيب محركات القراءة من الأسرع إلى الأبطأ
+PARSER_PRIORITY = ["calamine", "openpyxl"]
+
+
+def is_backend_available(backend):
+    """التحقق من توفر مكتبة محرك القراءة"""
+    if backend == "calamine":
+        try:
+            import python_calamine  # noqa: F401
+        except ImportError:
+            return False
+    return backend in BACKENDS
+
+
+def available_backends():
+    """قائمة المحركات المتوفرة في هذا الجهاز"""
+    return [backend for backend in BACKENDS if backend != "auto" and is_backend_available(backend)]
+
+
+def parse_workbook(excel_file, header=0, engine="openpyxl", sheet_name=0):
+    """قراءة ملف Excel مباشرة بمحرك pandas المحدد"""
+    import pandas as pd
+    return pd.read_excel(excel_file, sheet_name=sheet_name, header=header, engine=engine)
+
+
+def parse_with_fallback(excel_file, header=0, sheet_name=0):
+    """قراءة الملف بأسرع محرك متوفر، مع الرجوع إلى المحرك التالي عند الفشل"""
+    last_error = None
+    for engine in PARSER_PRIORITY:
+        if not is_backend_available(engine):
+            continue
+        try:
+            return parse_workbook(excel_file, header, engine, sheet_name)
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+
+def read_workbook(excel_file, header=0, backend="auto", cache_dir=None, sheet_name=0):
+    """
+    قراءة ملف Excel إلى DataFrame بالمحرك المطلوب
+
+    Args:
+        excel_file (Path): مسار ملف Excel
+        header (int): رقم صف أسماء الأعمدة (مثل pd.read_excel)
+        backend (str): auto أو openpyxl أو calamine أو cache
+        cache_dir (Path): مجلد النسخ المحفوظة
+        sheet_name (int | str): رقم الورقة أو اسمها (افتراضي: الورقة الأولى)
+
+    Returns:
+        DataFrame: بيانات الورقة
+
+    Raises:
+        ValueError: إذا كان اسم المحرك غير معروف أو غير متوفر
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"محرك القراءة '{backend}' غير معروف، المتاح: {', '.join(BACKENDS)}")
+
+    if backend in ("auto", "cache"):
+        # المفتاح من بصمة الملف قبل قراءته، فلا يُحفظ جدول قديم باسم محتوى أحدث
+        key = cache_key(excel_file, header, sheet_name)
+        df = load_cached(excel_file, header, sheet_name, cache_dir, key)
+        if df is None:
+            df = parse_with_fallback(excel_file, header, sheet_name)
+            store_cached(df, excel_file, header, sheet_name, cache_dir, key)
+        return df
+
+    if not is_backend_available(backend):
+        raise ValueError(f"محرك القراءة '{backend}' غير مثبت")
+
+    return parse_workbook(excel_file, header, backend, sheet_name)
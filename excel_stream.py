@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قراءة ملفات Excel الكبيرة وكتابة JSON بشكل تدفقي (Streaming)
+يقرأ الورقة صفاً بصف بوضع القراءة فقط في openpyxl ويعيدها على دفعات صغيرة،
+ويكتب السجلات إلى ملف JSON تدريجياً، فيبقى استهلاك الذاكرة محدوداً مهما كبر الملف
+
+الاستخدام:
+    from excel_stream import iter_excel_chunks, JsonArrayWriter
+
+    with JsonArrayWriter("period1.json", indent=1) as writer:
+        for chunk in iter_excel_chunks("الفترة 1.xlsx", chunk_size=5000):
+            writer.write(chunk.to_dict(orient='records'))
+"""
+
+import json
+import os
+import textwrap
+from pathlib import Path
+
+# عدد الصفوف الافتراضي في كل دفعة
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def iter_excel_chunks(excel_file, header=0, chunk_size=DEFAULT_CHUNK_SIZE, sheet_name=None):
+    """
+    قراءة ورقة Excel على دفعات من الصفوف
+
+    Args:
+        excel_file (Path): مسار ملف Excel
+        header (int): رقم صف أسماء الأعمدة (يبدأ من 0، مثل pd.read_excel)
+        chunk_size (int): عدد الصفوف في كل دفعة
+        sheet_name (str): اسم الورقة (افتراضي: الورقة الأولى)
+
+    Yields:
+        DataFrame: دفعة من الصفوف بأسماء الأعمدة (دفعة فارغة واحدة إذا لم توجد صفوف)
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = sheet.iter_rows(values_only=True)
+
+        # تخطي الصفوف التي تسبق صف أسماء الأعمدة
+        for _ in range(header):
+            next(rows, None)
+
+        header_row = next(rows, None) or ()
+        columns = [
+            str(name) if name is not None else f"Unnamed: {index}"
+            for index, name in enumerate(header_row)
+        ]
+
+        width = len(columns)
+        chunk = []
+        yielded = False
+        for row in rows:
+            # تجاهل الصفوف الفارغة تماماً
+            if all(value is None for value in row):
+                continue
+            chunk.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame.from_records(chunk, columns=columns)
+                yielded = True
+                chunk = []
+
+        if chunk or not yielded:
+            yield pd.DataFrame.from_records(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+
+class JsonArrayWriter:
+    """
+    كتابة مصفوفة JSON إلى ملف سجلاً بعد سجل
+
+    الناتج مطابق لـ json.dump(records, f, ensure_ascii=False, indent=indent)،
+    ويُكتب أولاً إلى ملف مؤقت ثم يُستبدل به الملف الأصلي عند النجاح فقط،
+    حتى لا يُنشر ملف ناقص إذا حدث خطأ أثناء التحويل
+    """
+
+    def __init__(self, json_file, indent=None):
+        self.json_file = Path(json_file)
+        self.temp_file = self.json_file.with_name(self.json_file.name + ".tmp")
+        self.indent = indent
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.temp_file, 'w', encoding='utf-8')
+        self._file.write("[")
+        return self
+
+    def write(self, records):
+        """إضافة مجموعة من السجلات إلى الملف"""
+        for record in records:
+            text = json.dumps(record, ensure_ascii=False, indent=self.indent)
+            if self.indent is None:
+                self._file.write(", " if self.count else "")
+                self._file.write(text)
+            else:
+                self._file.write(",\n" if self.count else "\n")
+                self._file.write(textwrap.indent(text, " " * self.indent))
+            self.count += 1
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if self.count and self.indent is not None:
+                self._file.write("\n")
+            self._file.write("]")
+        finally:
+            self._file.close()
+
+        if exc_type is None:
+            os.replace(self.temp_file, self.json_file)
+        else:
+            self.temp_file.unlink(missing_ok=True)
+        return False
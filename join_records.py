@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ربط الملاحظات السلوكية بسجلات الطلاب (Join Stage)
+يربط كل ملاحظة في "notes.json" بالطالب المطابق في ملفات الفترات مرة واحدة
+باستخدام فهرس الأسماء في name_matcher.py (مطابقة تامة بعد توحيد صيغ الأسماء ثم
+مطابقة تقريبية عند الحاجة)، ويكتب سجلاً موحداً لكل طالب في
+"student_records.json" مع معرفات ملاحظاته، وتقريراً بالملاحظات غير المطابقة
+
+سجلات الفترات والملاحظات تُحفظ في الذاكرة كجداول مضغوطة (record_model.py)،
+ومستند كل طالب يشير إلى رقم صفه في جدول كل فترة بدلاً من نسخة من السجل
+
+الاستخدام:
+    python join_records.py
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+from converter_engine import load_manifest
+from name_matcher import NameMatcher
+from record_model import RecordMapping, RecordTable
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الملاحظات السلوكية
+NOTES_FILE = "notes.json"
+
+# ملف السجلات الموحدة الناتج
+RECORDS_FILE = "student_records.json"
+
+# عدد خانات معرف الملاحظة
+NOTE_ID_LENGTH = 12
+
+# حقول الملاحظة التي يُشتق منها معرفها
+NOTE_IDENTITY_FIELDS = ["اسم_الطالب", "التاريخ", "المشكلة", "الصف", "الإجراء"]
+
+
+def load_json(path, default=None):
+    """قراءة ملف JSON، أو إرجاع القيمة الافتراضية إذا لم يكن موجوداً"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def note_id(note):
+    """
+    حساب معرف ثابت للملاحظة من محتواها
+
+    المعرف لا يتغير بتغيير ترتيب الملاحظات في ملف Excel
+
+    Args:
+        note (dict): الملاحظة كما في notes.json
+
+    Returns:
+        str: المعرف بصيغة hex
+    """
+    identity = json.dumps([note.get(field) for field in NOTE_IDENTITY_FIELDS],
+                          ensure_ascii=False)
+    return hashlib.sha1(identity.encode('utf-8')).hexdigest()[:NOTE_ID_LENGTH]
+
+
+def assign_note_ids(notes):
+    """
+    إسناد معرف لكل ملاحظة، مع تمييز الملاحظات المكررة بلاحقة رقمية
+
+    Returns:
+        dict: المعرف ← الملاحظة (بنفس ترتيب الملف)
+    """
+    notes_by_id = {}
+    for note in notes:
+        base_id = note_id(note)
+        nid, copy = base_id, 1
+        while nid in notes_by_id:
+            copy += 1
+            nid = f"{base_id}-{copy}"
+        notes_by_id[nid] = note
+    return notes_by_id
+
+
+def build_student_documents(periods_data):
+    """
+    تجميع بيانات كل طالب من جميع الفترات وبناء فهرس المطابقة
+
+    Args:
+        periods_data (dict): رقم الفترة ← جدول أو قائمة سجلات الطلاب
+
+    Returns:
+        tuple: (رقم الهوية ← مستند الطالب، فهرس الأسماء NameMatcher).
+               periods في المستند: رقم الفترة (نص) ← رقم صف الطالب في بيانات الفترة
+    """
+    documents = {}
+    matcher = NameMatcher()
+
+    for period_id, students in periods_data.items():
+        for row, student in enumerate(students):
+            student_id = student["الهوية"]
+            document = documents.setdefault(student_id, {
+                "id": student_id,
+                "name": student.get("الطالب"),
+                "class": student.get("الصف"),
+                "periods": {},
+                "note_ids": [],
+            })
+            document["periods"][str(period_id)] = row
+
+            matcher.add(student_id, student.get("الطالب"), student.get("الصف"))
+
+    return documents, matcher
+
+
+def join_notes(documents, matcher, notes_by_id):
+    """
+    ربط كل ملاحظة بالطالب المطابق عبر الفهرس (مرور واحد على الملاحظات)
+
+    تُطابق الملاحظة أولاً بالاسم الموحد والصف، وإذا لم يُذكر الصف (فارغ أو 0)
+    أو لم يوجد طالب بنفس الاسم في ذلك الصف فبالاسم فقط (كما يفعل الموقع).
+    الملاحظة التي تطابق أكثر من طالب تُربط بهم جميعاً وتُسجل كملتبسة.
+    إذا لم يوجد الاسم الموحد تُقبل المطابقة التقريبية فقط عندما يتميز مرشح
+    واحد بوضوح، وتُسجل في fuzzy للمراجعة
+
+    Returns:
+        dict: تقرير المطابقة (matched, unmatched, ambiguous, fuzzy)
+    """
+    report = {"matched": 0, "unmatched": [], "ambiguous": [], "fuzzy": []}
+
+    for nid, note in notes_by_id.items():
+        result = matcher.match(note.get("اسم_الطالب"), note.get("الصف"))
+        student_ids = result["ids"]
+
+        if not student_ids:
+            report["unmatched"].append(nid)
+            continue
+
+        if len(student_ids) > 1:
+            report["ambiguous"].append(nid)
+        if result["method"] == "fuzzy":
+            report["fuzzy"].append(nid)
+
+        for student_id in student_ids:
+            documents[student_id]["note_ids"].append(nid)
+        report["matched"] += 1
+
+    return report
+
+
+def student_periods(records, student):
+    """
+    سجلات الطالب في جميع الفترات كقواميس (تُبنى عند الحاجة من جداول الفترات)
+
+    Returns:
+        dict: رقم الفترة (نص) ← سجل الطالب كما في ملف الفترة
+    """
+    periods = records["periods"]
+    return {period_id: periods[period_id][row] for period_id, row in student["periods"].items()}
+
+
+def load_periods_data(base_dir=None):
+    """
+    قراءة ملفات JSON الخاصة بالفترات الموجودة كجداول مضغوطة
+
+    Returns:
+        dict: رقم الفترة ← جدول سجلات الطلاب (RecordTable، والمرور عليه يعيد
+              سجلات الطلاب كقواميس)
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    periods_data = {}
+    for spec in load_manifest():
+        students = load_json(base_dir / spec["output"])
+        if students is not None:
+            periods_data[spec["id"]] = RecordTable.from_records(students)
+    return periods_data
+
+
+def build_joined_records(base_dir=None):
+    """
+    بناء السجلات الموحدة من ملفات JSON الخاصة بالفترات والملاحظات
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+
+    Returns:
+        dict: students (قائمة السجلات)، notes (المعرف ← الملاحظة، RecordMapping)،
+              report، periods (رقم الفترة كنص ← جدول الفترة، انظر student_periods)
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    periods_data = load_periods_data(base_dir)
+
+    notes = load_json(base_dir / NOTES_FILE, default=[])
+    notes_by_id = RecordMapping(assign_note_ids(notes), RecordTable.from_records(notes))
+    del notes
+
+    documents, matcher = build_student_documents(periods_data)
+    report = join_notes(documents, matcher, notes_by_id)
+
+    return {
+        "students": list(documents.values()),
+        "notes": notes_by_id,
+        "report": report,
+        "periods": {str(period_id): table for period_id, table in periods_data.items()},
+    }
+
+
+def write_joined_records(records, base_dir=None):
+    """
+    كتابة السجلات الموحدة إلى student_records.json
+
+    يُكتب كل طالب وكل ملاحظة على حدة (يُبنى قاموسه ثم يُهمل) فلا تُنسخ جميع
+    السجلات إلى قواميس في الذاكرة دفعة واحدة
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+    with open(base_dir / RECORDS_FILE, 'w', encoding='utf-8') as f:
+        f.write('{"students":[')
+        for position, student in enumerate(records["students"]):
+            f.write("," if position else "")
+            f.write(dumps(dict(student, periods=student_periods(records, student))))
+        f.write('],"notes":{')
+        for position, (nid, note) in enumerate(records["notes"].items()):
+            f.write("," if position else "")
+            f.write(f"{dumps(nid)}:{dumps(note)}")
+        f.write(f'}},"report":{dumps(records["report"])}}}')
+
+
+def print_report(records):
+    """طباعة تقرير المطابقة مع الملاحظات غير المطابقة"""
+    report = records["report"]
+    notes = records["notes"]
+
+    print(f"👥 عدد الطلاب: {len(records['students'])}")
+    print(f"📝 عدد الملاحظات: {len(notes)}")
+    print(f"✅ ملاحظات مطابقة: {report['matched']}")
+
+    if report["fuzzy"]:
+        print(f"🔎 ملاحظات مطابقة تقريبياً: {len(report['fuzzy'])}")
+
+    if report["ambiguous"]:
+        print(f"⚠️ ملاحظات تطابق أكثر من طالب: {len(report['ambiguous'])}")
+
+    if report["unmatched"]:
+        print(f"❌ ملاحظات بدون طالب مطابق: {len(report['unmatched'])}")
+        names = {}
+        for nid in report["unmatched"]:
+            note = notes[nid]
+            key = (note.get("اسم_الطالب"), note.get("الصف"))
+            names[key] = names.get(key, 0) + 1
+        for (name, note_class), count in sorted(names.items(), key=lambda item: -item[1]):
+            print(f"   - {name} (الصف {note_class}): {count} ملاحظة")
+
+
+def main():
+    """الدالة الرئيسية"""
+    print("=" * 60)
+    print("🔗 ربط الملاحظات السلوكية بسجلات الطلاب")
+    print("=" * 60)
+    print()
+
+    try:
+        records = build_joined_records()
+        write_joined_records(records)
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء الربط: {str(e)}")
+        return False
+
+    print_report(records)
+    print()
+    print(f"💾 تم حفظ الملف: {RECORDS_FILE}")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
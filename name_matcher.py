@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+مطابقة الأسماء العربية بين الملاحظات وملفات الدرجات (Name Matcher)
+يكتب المعلمون اسم الطالب في الملاحظات بصيغ مختلفة عن ملف الدرجات، مثل
+"فارس بن علي بن محمد" بدلاً من "فارس علي محمد" أو "احمد" بدلاً من "أحمد"،
+فيُبنى مفتاح مطابقة موحد لكل اسم:
+
+- توحيد الهمزات (أ إ آ ٱ ← ا، ؤ ← و، ئ ← ي) والألف المقصورة (ى ← ي)
+- توحيد التاء المربوطة (ة ← ه) وحذف التطويل
+- حذف "بن" و"بنت" و"ابن" بين الأسماء
+- دمج "عبد" مع الاسم الذي يليه ("عبد الله" = "عبدالله")
+
+ثم تُبنى فهارس مقلوبة للكلمات وللمقاطع الثلاثية (trigrams)، فلا تُقارن الملاحظة
+بجميع الطلاب: المرشحون هم من يشاركون الاسم كل كلماته عدا كلمة واحدة (وكلمتين على الأقل)،
+وإن لم يوجد أحد (ككلمتين مكتوبتين خطأ) فمن يشاركونه نصف مقاطعه على الأقل
+
+الاستخدام:
+    from name_matcher import NameMatcher
+
+    matcher = NameMatcher()
+    matcher.add(1234567890, "فارس علي محمد الشهري", 5)
+    result = matcher.match("فارس بن علي بن محمد الشهري", 5)
+    # {"ids": [1234567890], "method": "exact", "score": 1.0}
+"""
+
+import math
+from collections import Counter
+
+from convert_notes_to_json import normalize_name
+
+# توحيد الحروف التي تُكتب بأكثر من صورة
+LETTER_FOLDING = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ؤ": "و", "ئ": "ي", "ى": "ي", "ة": "ه",
+    "ـ": None,
+})
+
+# كلمات النسب التي تُحذف من الاسم (بعد توحيد الحروف)
+NAME_PARTICLES = {"بن", "بنت", "ابن", "ابنه"}
+
+# البادئة التي تُدمج مع الاسم الذي يليها
+COMPOUND_PREFIX = "عبد"
+
+# أقل درجة تشابه لقبول المطابقة التقريبية (من 0 إلى 1)
+MIN_SCORE = 0.7
+
+# أقل فرق بين أفضل مرشح والذي يليه حتى تُقبل المطابقة التقريبية
+MIN_MARGIN = 0.1
+
+# زيادة درجة المرشح إذا كان في نفس الصف المذكور في الملاحظة
+CLASS_BONUS = 0.05
+
+# عدد كلمات الاسم التي يُسمح بغيابها من اسم المرشح (كاسم مكتوب خطأ أو محذوف)
+MAX_MISSING_TOKENS = 1
+
+# أقل عدد من الكلمات يجب أن يشاركها المرشح (أو جميع كلمات الاسم إن كانت أقل)
+MIN_SHARED_TOKENS = 2
+
+# أقل نسبة من مقاطع الاسم يجب أن يشاركها المرشح حتى يُعرض (عند عدم وجود مرشح بالكلمات)
+MIN_SHARED_TRIGRAMS = 0.5
+
+
+def match_tokens(name):
+    """
+    كلمات الاسم بعد التوحيد (بدون كلمات النسب ومع دمج "عبد")
+
+    Args:
+        name (str): الاسم كما هو في الملف
+
+    Returns:
+        list: الكلمات بالترتيب
+    """
+    words = normalize_name(name).translate(LETTER_FOLDING).split()
+    tokens = []
+    for word in words:
+        if word in NAME_PARTICLES:
+            continue
+        if tokens and tokens[-1] == COMPOUND_PREFIX:
+            tokens[-1] += word
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def match_key(name):
+    """مفتاح المطابقة الموحد للاسم"""
+    return " ".join(match_tokens(name))
+
+
+def trigrams(tokens):
+    """المقاطع الثلاثية لكلمات الاسم (كل كلمة محاطة بمسافتين)"""
+    grams = set()
+    for token in tokens:
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def probe(index, keys, required):
+    """
+    المدخلات التي قد تشارك required مفتاحاً على الأقل من keys
+
+    المدخل الذي يشارك required مفتاحاً لا بد أن يظهر في إحدى قوائم أندر
+    (عدد المفاتيح - required + 1) مفتاحاً، فلا حاجة لقراءة بقية القوائم
+
+    Returns:
+        set: أرقام المدخلات (يجب التحقق منها بعد ذلك)
+    """
+    postings = sorted((index.get(key, ()) for key in keys), key=len)
+    probed = set()
+    for posting in postings[:len(postings) - required + 1]:
+        probed.update(posting)
+    return probed
+
+
+class NameMatcher:
+    """
+    فهرس أسماء الطلاب للمطابقة السريعة
+
+    كل اسم (مع الصف) يُضاف مرة واحدة كمُدخل، ويُفهرس ثلاث مرات: المفتاح
+    الموحد ← المدخلات، والكلمة ← المدخلات، والمقطع الثلاثي ← المدخلات
+    """
+
+    def __init__(self):
+        self.entries = []            # (رقم الهوية، الصف، كلمات الاسم، مقاطع الاسم)
+        self.seen = set()
+        self.by_key = {}
+        self.by_token = {}
+        self.by_trigram = {}
+        self.cache = {}
+
+    def add(self, student_id, name, student_class=None):
+        """إضافة اسم طالب إلى الفهرس (تُتجاهل الإضافة المكررة)"""
+        tokens = match_tokens(name)
+        key = " ".join(tokens)
+        if not key or (student_id, key, student_class) in self.seen:
+            return
+        self.seen.add((student_id, key, student_class))
+
+        grams = frozenset(trigrams(tokens))
+        entry = len(self.entries)
+        self.entries.append((student_id, student_class, tokens, grams))
+        self.by_key.setdefault(key, []).append(entry)
+        for token in set(tokens):
+            self.by_token.setdefault(token, []).append(entry)
+        for gram in grams:
+            self.by_trigram.setdefault(gram, []).append(entry)
+        self.cache.clear()
+
+    def exact(self, key, student_class=None):
+        """
+        الطلاب الذين لهم نفس المفتاح الموحد، مع تفضيل الصف المذكور
+
+        Returns:
+            list: أرقام الهويات (بدون تكرار وبترتيب الإضافة)
+        """
+        entries = self.by_key.get(key, [])
+        if student_class:
+            in_class = [e for e in entries if self.entries[e][1] == student_class]
+            entries = in_class or entries
+        return list(dict.fromkeys(self.entries[e][0] for e in entries))
+
+    def candidates(self, name, student_class=None, limit=5):
+        """
+        المرشحون مرتبين حسب درجة التشابه
+
+        الدرجة = متوسط (نسبة كلمات الملاحظة الموجودة في اسم الطالب مع احتساب
+        الاسم الأول مرتين، ومعامل Dice للمقاطع الثلاثية) + زيادة بسيطة إذا
+        تطابق الصف. احتساب الاسم الأول مرتين يمنع مطابقة "محمد بن خالد"
+        مع "خالد بن محمد"
+
+        Returns:
+            list: [(رقم الهوية، الدرجة)] تنازلياً
+        """
+        tokens = match_tokens(name)
+        if not tokens:
+            return []
+        query_tokens = set(tokens)
+        query_grams = trigrams(tokens)
+
+        # المرشحون بالكلمات أولاً، ثم بالمقاطع إن لم يوجد أحد
+        required_tokens = min(len(query_tokens),
+                              max(MIN_SHARED_TOKENS, len(query_tokens) - MAX_MISSING_TOKENS))
+        shared_tokens = Counter()
+        for token in query_tokens:
+            shared_tokens.update(self.by_token.get(token, ()))
+        probed = [entry for entry, shared in shared_tokens.items() if shared >= required_tokens]
+        required_grams = 0
+        if not probed:
+            required_grams = math.ceil(len(query_grams) * MIN_SHARED_TRIGRAMS)
+            probed = probe(self.by_trigram, query_grams, required_grams)
+
+        scores = {}
+        for entry in probed:
+            student_id, entry_class, entry_tokens, entry_grams = self.entries[entry]
+            shared = len(query_grams & entry_grams)
+            if shared < required_grams:
+                continue
+            dice = 2 * shared / (len(query_grams) + len(entry_grams))
+            same_first = entry_tokens[0] == tokens[0]
+            coverage = (len(query_tokens.intersection(entry_tokens)) + same_first) / (len(query_tokens) + 1)
+            score = (dice + coverage) / 2
+            if student_class and entry_class == student_class:
+                score += CLASS_BONUS
+            score = round(min(score, 1.0), 4)
+            if score > scores.get(student_id, 0):
+                scores[student_id] = score
+
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return ranked[:limit]
+
+    def match(self, name, student_class=None):
+        """
+        مطابقة اسم من الملاحظات بالطلاب
+
+        1) المفتاح الموحد نفسه (مع تفضيل الصف): قد يطابق أكثر من طالب
+        2) وإلا أفضل مرشح تقريبي إذا تجاوز MIN_SCORE وتميّز عن الذي يليه
+
+        Returns:
+            dict: ids (أرقام الهويات)، method ("exact" أو "fuzzy" أو
+                  "ambiguous" عند تقارب أكثر من مرشح أو None)، score
+        """
+        cache_key = (normalize_name(name), student_class or None)
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+
+        student_ids = self.exact(match_key(name), student_class)
+        if student_ids:
+            result = {"ids": student_ids, "method": "exact", "score": 1.0}
+        else:
+            ranked = self.candidates(name, student_class, limit=2)
+            best = ranked[0][1] if ranked else 0.0
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            if best < MIN_SCORE:
+                result = {"ids": [], "method": None, "score": best}
+            elif best - runner_up < MIN_MARGIN:
+                result = {"ids": [], "method": "ambiguous", "score": best}
+            else:
+                result = {"ids": [ranked[0][0]], "method": "fuzzy", "score": best}
+
+        self.cache[cache_key] = result
+        return result
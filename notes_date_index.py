@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس الملاحظات حسب التاريخ (Notes Date Index)
+يبني مرة واحدة عند التحديث فهرساً من التاريخ إلى معرفات الملاحظات ويكتبه في
+"notes_by_date.json"، فتصبح أسئلة مثل "ملاحظات هذا الأسبوع" أو "ملاحظات شهر
+ربيع الأول" بحثاً في الفهرس بدلاً من المرور على جميع الملاحظات وقراءة تواريخها
+العربية من جديد
+
+محتوى الفهرس:
+- days: [{day, date, hijri, ids}] لكل يوم فيه ملاحظات، مرتبة زمنياً حسب
+  رقم اليوم (عدد الأيام منذ 1970-01-01)، فيُبحث عن مدى من الأيام ببحث ثنائي
+- hijri_months: الشهر الهجري "1447-03" ← معرفات الملاحظات (بالترتيب الزمني)
+- undated: معرفات الملاحظات التي بدون تاريخ صالح
+
+المعرفات هي نفس معرفات الملاحظات في student_records.json وملفات الطلاب المجزأة
+
+الاستخدام:
+    python notes_date_index.py
+    python notes_date_index.py --force    # إعادة البناء حتى لو لم يتغير ملف الملاحظات
+"""
+
+import argparse
+import json
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from build_cache import BUILD_MANIFEST_FILE, input_digests, is_up_to_date, record_build
+from convert_notes_to_json import note_date_fields
+from join_records import NOTES_FILE, assign_note_ids, load_json
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الفهرس الناتج
+NOTES_DATE_INDEX_FILE = "notes_by_date.json"
+
+# إصدار صيغة الفهرس - يجب زيادته عند تغيير طريقة البناء
+NOTES_DATE_INDEX_VERSION = 2
+
+
+def build_date_index(notes_by_id):
+    """
+    بناء فهرس التواريخ من الملاحظات
+
+    الملاحظات بالصيغة القديمة (بدون حقول التاريخ المنظمة) تُقرأ تواريخها من
+    التاريخ الهجري المنسق
+
+    Args:
+        notes_by_id (dict): المعرف ← الملاحظة (ناتج assign_note_ids)
+
+    Returns:
+        dict: الفهرس (version, days, hijri_months, undated)
+
+    Example:
+        >>> index = build_date_index({"a1": {"التاريخ": "الخميس, 15 جمادى الأولى, 1447"}})
+        >>> index["days"], index["undated"]
+        ([{'day': 20398, 'date': '2025-11-06', 'hijri': '1447-05-15', 'ids': ['a1']}], [])
+    """
+    days, undated = {}, []
+    for nid, note in notes_by_id.items():
+        iso_date, hijri_date, day_number = note_date_fields(note)
+        if day_number is None:
+            undated.append(nid)
+            continue
+        entry = days.setdefault(day_number, {
+            "day": day_number,
+            "date": iso_date,
+            "hijri": hijri_date,
+            "ids": [],
+        })
+        entry["ids"].append(nid)
+
+    ordered = [days[day_number] for day_number in sorted(days)]
+    hijri_months = {}
+    for entry in ordered:
+        if entry["hijri"]:
+            hijri_months.setdefault(entry["hijri"][:7], []).extend(entry["ids"])
+
+    return {
+        "version": NOTES_DATE_INDEX_VERSION,
+        "days": ordered,
+        "hijri_months": hijri_months,
+        "undated": undated,
+    }
+
+
+def notes_between(index, first_day, last_day):
+    """
+    معرفات الملاحظات بين يومين (شاملاً الطرفين) ببحث ثنائي في الفهرس
+
+    Args:
+        index (dict): الفهرس كما في notes_by_date.json
+        first_day (int): رقم أول يوم (عدد الأيام منذ 1970-01-01)
+        last_day (int): رقم آخر يوم
+
+    Returns:
+        list: المعرفات بالترتيب الزمني
+    """
+    day_numbers = [entry["day"] for entry in index["days"]]
+    start = bisect_left(day_numbers, first_day)
+    end = bisect_right(day_numbers, last_day)
+    return [nid for entry in index["days"][start:end] for nid in entry["ids"]]
+
+
+def notes_in_hijri_month(index, year, month):
+    """معرفات ملاحظات شهر هجري (مثل 1447، 3 لربيع الأول)"""
+    return index["hijri_months"].get(f"{year:04d}-{month:02d}", [])
+
+
+def write_date_index(base_dir=None, force=False):
+    """
+    بناء الفهرس وكتابته إلى notes_by_date.json (إذا تغير ملف الملاحظات)
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        force (bool): إعادة البناء حتى لو لم يتغير ملف الملاحظات
+
+    Returns:
+        dict: الفهرس المكتوب، أو None إذا تم التخطي
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    inputs = [base_dir / NOTES_FILE]
+    index_file = base_dir / NOTES_DATE_INDEX_FILE
+    params = {"notes_date_index_version": NOTES_DATE_INDEX_VERSION}
+    build_manifest = base_dir / BUILD_MANIFEST_FILE.name
+
+    digests = input_digests(inputs)
+    if not force and is_up_to_date(NOTES_DATE_INDEX_FILE, inputs, params, [index_file], build_manifest, digests):
+        return None
+
+    index = build_date_index(assign_note_ids(load_json(base_dir / NOTES_FILE, default=[])))
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    record_build(NOTES_DATE_INDEX_FILE, inputs, [index_file], params, build_manifest, digests)
+    return index
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="بناء فهرس الملاحظات حسب التاريخ")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة البناء حتى لو لم يتغير ملف الملاحظات")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("📅 بناء فهرس الملاحظات حسب التاريخ")
+    print("=" * 60)
+    print()
+
+    try:
+        index = write_date_index(force=args.force)
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء بناء الفهرس: {str(e)}")
+        return False
+
+    if index is None:
+        print(f"⏭️ لم يتغير ملف الملاحظات، الملف {NOTES_DATE_INDEX_FILE} محدث")
+    else:
+        print(f"📆 عدد الأيام: {len(index['days'])}")
+        print(f"🌙 عدد الأشهر الهجرية: {len(index['hijri_months'])}")
+        if index["undated"]:
+            print(f"⚠️ ملاحظات بدون تاريخ: {len(index['undated'])}")
+        print(f"\n💾 تم حفظ الملف: {NOTES_DATE_INDEX_FILE}")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
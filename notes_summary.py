@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+إحصائيات الملاحظات السلوكية لصفحة الوكيل والمرشد (Notes Summary)
+يحسب الإحصائيات مرة واحدة بعمليات تجميع على الأعمدة ويكتبها في ملف صغير
+"notes_summary.json"، فتعرضها صفحة admin.html فوراً مهما كثرت الملاحظات:
+
+- عدد الملاحظات لكل طالب
+- عدد الملاحظات لكل مشكلة ولكل إجراء
+- الإجماليات لكل صف
+- توزيع الملاحظات على الأيام والأشهر الهجرية
+
+الاستخدام:
+    python notes_summary.py
+    python notes_summary.py --force    # إعادة الحساب حتى لو لم تتغير الملفات
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from build_cache import BUILD_MANIFEST_FILE, input_digests, is_up_to_date, record_build
+from converter_engine import load_manifest
+from convert_notes_to_json import legacy_date_fields
+from join_records import NOTES_FILE, build_joined_records
+from umm_alqura_calendar import HIJRI_MONTHS
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الإحصائيات الناتج
+SUMMARY_FILE = "notes_summary.json"
+
+# إصدار صيغة ملف الإحصائيات - يجب زيادته عند تغيير طريقة الحساب
+SUMMARY_VERSION = 2
+
+# التسمية المستخدمة للقيم الفارغة (مثل ملاحظة بدون إجراء)
+EMPTY_LABEL = "غير محدد"
+
+
+def notes_frame(records):
+    """
+    جدول الملاحظات مع معرفاتها وتاريخها الهجري مفككاً إلى أرقام (من حقل
+    التاريخ_الهجري المنظم، وللملاحظات بالصيغة القديمة بدونه من النص العربي)
+
+    الأعمدة النصية فئوية (من جدول الملاحظات المضغوط)، فيُفكك كل تاريخ مختلف
+    مرة واحدة فقط
+
+    Args:
+        records (dict): ناتج build_joined_records
+
+    Returns:
+        DataFrame: id, name, date, problem, class, action, year, month, day
+    """
+    notes = records["notes"]
+    df = notes.table.frame([
+        "اسم_الطالب", "التاريخ", "المشكلة", "الصف", "الإجراء", "التاريخ_الهجري",
+    ]).rename(columns={
+        "اسم_الطالب": "name", "التاريخ": "date", "المشكلة": "problem",
+        "الصف": "class", "الإجراء": "action", "التاريخ_الهجري": "hijri",
+    })
+    df.insert(0, "id", notes.ids)
+
+    hijri = df.pop("hijri").astype(object)
+    legacy = hijri.isna()
+    if legacy.any():
+        dates = df.loc[legacy, "date"].astype(object)
+        hijri[legacy] = dates.map({text: legacy_date_fields(text)[1] for text in dates.unique()})
+
+    hijri = hijri.astype("category")
+    codes = hijri.cat.codes.to_numpy()
+    parts = hijri.cat.categories.to_series().str.split("-", expand=True).reindex(columns=range(3))
+    for position, column in enumerate(["year", "month", "day"]):
+        values = pd.to_numeric(parts[position]).astype("Int64").array
+        df[column] = values.take(codes, allow_fill=True)
+    return df
+
+
+def value_counts(series):
+    """عدد التكرار لكل قيمة مرتبة تنازلياً: [{value, count}]"""
+    counts = series.astype(object).fillna("").replace("", EMPTY_LABEL).value_counts(sort=True)
+    return [{"value": value, "count": int(count)} for value, count in counts.items()]
+
+
+def class_totals(df):
+    """عدد الملاحظات وعدد الطلاب المذكورين لكل صف"""
+    classes = df["class"].astype(object).fillna(0).astype(int)
+    grouped = df.groupby(classes).agg(notes=("id", "size"), students=("name", "nunique"))
+    return [
+        {"class": int(class_id) or None, "notes": int(row.notes), "students": int(row.students)}
+        for class_id, row in grouped.iterrows()
+    ]
+
+
+def date_histogram(df):
+    """
+    توزيع الملاحظات على الأيام والأشهر الهجرية مرتبة زمنياً
+
+    Returns:
+        tuple: (قائمة الأيام، قائمة الأشهر)
+    """
+    dated = df.dropna(subset=["year", "month", "day"])
+
+    by_day = dated.groupby(["year", "month", "day", "date"]).size().reset_index(name="count")
+    days = [
+        {"date": f"{row.year:04d}-{row.month:02d}-{row.day:02d}", "display": row.date,
+         "count": int(row.count)}
+        for row in by_day.itertuples(index=False)
+    ]
+
+    by_month = dated.groupby(["year", "month"]).size().reset_index(name="count")
+    months = [
+        {"month": f"{row.year:04d}-{row.month:02d}",
+         "display": f"{HIJRI_MONTHS[row.month - 1]} {row.year}", "count": int(row.count)}
+        for row in by_month.itertuples(index=False)
+    ]
+    return days, months
+
+
+def student_totals(records):
+    """عدد الملاحظات لكل طالب مطابق (من مرحلة الربط) مرتباً تنازلياً"""
+    students = [
+        {"id": student["id"], "name": student["name"], "class": student["class"],
+         "notes": len(student["note_ids"])}
+        for student in records["students"] if student["note_ids"]
+    ]
+    return sorted(students, key=lambda student: -student["notes"])
+
+
+def build_summary(records):
+    """
+    حساب جميع الإحصائيات من السجلات الموحدة
+
+    Args:
+        records (dict): ناتج build_joined_records
+
+    Returns:
+        dict: ملف الإحصائيات
+    """
+    df = notes_frame(records)
+    report = records["report"]
+    days, months = date_histogram(df)
+    unmatched = df[df["id"].isin(report["unmatched"])]
+
+    return {
+        "version": SUMMARY_VERSION,
+        "totals": {
+            "notes": len(df),
+            "students": int(df["name"].nunique()),
+            "matched_notes": report["matched"],
+            "unmatched_notes": len(report["unmatched"]),
+        },
+        "by_problem": value_counts(df["problem"]),
+        "by_action": value_counts(df["action"]),
+        "by_class": class_totals(df),
+        "by_month": months,
+        "by_date": days,
+        "students": student_totals(records),
+        "unmatched_names": value_counts(unmatched["name"]),
+    }
+
+
+def summary_inputs(base_dir):
+    """ملفات البيانات التي تُحسب منها الإحصائيات"""
+    return [base_dir / spec["output"] for spec in load_manifest()] + [base_dir / NOTES_FILE]
+
+
+def write_summary(base_dir=None, records=None, force=False):
+    """
+    حساب الإحصائيات وكتابتها إلى notes_summary.json (إذا تغيرت ملفات البيانات)
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        records (dict): ناتج build_joined_records (افتراضي: يُبنى من ملفات JSON)
+        force (bool): إعادة الحساب حتى لو لم تتغير الملفات
+
+    Returns:
+        dict: الإحصائيات المكتوبة، أو None إذا تم التخطي
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    inputs = summary_inputs(base_dir)
+    summary_file = base_dir / SUMMARY_FILE
+    params = {"summary_version": SUMMARY_VERSION}
+    build_manifest = base_dir / BUILD_MANIFEST_FILE.name
+
+    digests = input_digests(inputs)
+    if not force and is_up_to_date(SUMMARY_FILE, inputs, params, [summary_file], build_manifest, digests):
+        return None
+
+    if records is None:
+        records = build_joined_records(base_dir)
+
+    summary = build_summary(records)
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, separators=(',', ':'))
+
+    record_build(SUMMARY_FILE, inputs, [summary_file], params, build_manifest, digests)
+    return summary
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="حساب إحصائيات الملاحظات السلوكية")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة الحساب حتى لو لم تتغير ملفات البيانات")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("📊 حساب إحصائيات الملاحظات السلوكية")
+    print("=" * 60)
+    print()
+
+    try:
+        summary = write_summary(force=args.force)
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء الحساب: {str(e)}")
+        return False
+
+    if summary is None:
+        print(f"⏭️ لم تتغير ملفات البيانات، الملف {SUMMARY_FILE} محدث")
+    else:
+        totals = summary["totals"]
+        print(f"📝 عدد الملاحظات: {totals['notes']}")
+        print(f"👥 عدد الطلاب المذكورين: {totals['students']}")
+        print("📌 أكثر المشكلات تكراراً:")
+        for item in summary["by_problem"][:5]:
+            print(f"   - {item['value']} ({item['count']})")
+        print(f"\n💾 تم حفظ الملف: {SUMMARY_FILE}")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
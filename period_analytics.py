@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تحليلات الدرجات عبر الفترات (Cross-Period Analytics)
+يربط جميع الفترات برقم الهوية ويحسب مرة واحدة عند التحديث، بعمليات تجميع على
+الأعمدة بدلاً من حساب كل طالب على حدة في الصفحة، ويكتب النتيجة في "analytics.json":
+
+- الفرق في كل درجة وفي المجموع بين كل فترة والتي قبلها
+- ترتيب الطالب في صفه حسب المجموع في كل فترة، ونسبته المئوية (نسبة زملائه
+  في الصف الذين مجموعهم مثل مجموعه أو أقل)
+- الغياب في كل فترة والتغير فيه
+- علامات الطلاب المحتاجين للمتابعة (at-risk) كأرقام ثنائية (bit flags):
+  ترتيب متأخر في الصف، تراجع الترتيب، زيادة الغياب، غياب مرتفع
+
+الملف بصيغة أعمدة مضغوطة: قائمة الطلاب مرة واحدة، وكل مقياس قائمة بنفس ترتيبهم
+(null إذا لم يوجد الطالب في الفترة)
+
+الاستخدام:
+    python period_analytics.py
+    python period_analytics.py --force    # إعادة الحساب حتى لو لم تتغير الملفات
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from build_cache import BUILD_MANIFEST_FILE, input_digests, is_up_to_date, record_build
+from converter_engine import load_manifest
+from join_records import load_periods_data
+from sheet_validation import validation_rules
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف التحليلات الناتج
+ANALYTICS_FILE = "analytics.json"
+
+# إصدار صيغة ملف التحليلات - يجب زيادته عند تغيير طريقة الحساب
+ANALYTICS_VERSION = 1
+
+# الأعمدة المشتركة بين جميع الفترات
+ID_COLUMN = "الهوية"
+CLASS_COLUMN = "الصف"
+ABSENCE_COLUMN = "مجموع الغياب"
+
+# عمود المجموع إذا لم يُحدد في قواعد التحقق للفترة
+DEFAULT_TOTAL_COLUMN = "المجموع"
+
+# عدد الخانات العشرية في الملف
+DECIMALS = 2
+
+# قواعد الطلاب المحتاجين للمتابعة (في آخر فترة). تراجع الطالب يُقاس بنسبته
+# المئوية في الصف وليس بالمجموع نفسه، لأن درجات الفترة الجديدة تبدأ من الصفر
+AT_RISK_RULES = {
+    "low_rank": 20,         # النسبة المئوية في الصف أقل من أو تساوي هذه القيمة
+    "percentile_drop": 25,  # تراجع النسبة المئوية عن الفترة السابقة بهذا المقدار أو أكثر
+    "absence_rise": 3,      # زيادة الغياب عن الفترة السابقة بهذا المقدار أو أكثر
+    "high_absence": 10,     # الغياب في الفترة بهذا المقدار أو أكثر
+}
+
+# ترتيب العلامات الثنائية: العلامة رقم i قيمتها 2 ** i
+AT_RISK_FLAGS = list(AT_RISK_RULES)
+
+
+def score_fields(periods):
+    """
+    الدرجات التي تُقارن بين الفترات (مكونات الدرجة ثم المجموع) بترتيب أول ظهور
+
+    Returns:
+        tuple: (قائمة الحقول، عمود المجموع)
+    """
+    fields, total_column = {}, None
+    for spec in periods:
+        rules = validation_rules(spec)
+        for column in rules["component_columns"]:
+            fields.setdefault(column, None)
+        total_column = total_column or rules["total_column"]
+    total_column = total_column or DEFAULT_TOTAL_COLUMN
+    fields.pop(total_column, None)
+    return list(fields) + [total_column], total_column
+
+
+def long_frame(periods_data, fields):
+    """
+    جميع الفترات في جدول واحد: صف لكل (طالب، فترة)
+
+    تكرار رقم الهوية داخل الفترة الواحدة يُحذف (أول ظهور) والصفوف بدون رقم هوية
+    تُستبعد لأنها لا يمكن ربطها بين الفترات
+
+    Returns:
+        DataFrame: period, الهوية, الصف, مجموع الغياب, الدرجات
+    """
+    frames = []
+    for period_id, table in periods_data.items():
+        frame = table.frame([ID_COLUMN, CLASS_COLUMN, ABSENCE_COLUMN] + fields)
+        frame.insert(0, "period", period_id)
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=["period", ID_COLUMN, CLASS_COLUMN, ABSENCE_COLUMN] + fields)
+
+    df = pd.concat(frames, ignore_index=True)
+    for column in [ABSENCE_COLUMN] + fields:
+        df[column] = pd.to_numeric(df[column].astype(object), errors='coerce').astype(float)
+    df[CLASS_COLUMN] = pd.to_numeric(df[CLASS_COLUMN].astype(object), errors='coerce').fillna(0).astype(int)
+    df[ID_COLUMN] = df[ID_COLUMN].astype(object)
+    df = df[df[ID_COLUMN].notna() & (df[ID_COLUMN] != 0)]
+    return df.drop_duplicates(["period", ID_COLUMN])
+
+
+def class_standing(df, total_column):
+    """
+    الترتيب في الصف (1 للأعلى مجموعاً، والمتساوون لهم نفس الترتيب) والنسبة
+    المئوية لكل طالب في كل فترة - عملية تجميع واحدة لجميع الصفوف والفترات
+    """
+    groups = df.groupby(["period", CLASS_COLUMN])[total_column]
+    rank = groups.rank(method="min", ascending=False)
+    percentile = groups.rank(method="max", pct=True) * 100
+    return rank.astype("Int64"), percentile
+
+
+def column_values(series):
+    """
+    قائمة قيم للملف: أرقام مقربة (أعداد صحيحة إذا كانت كل قيم العمود صحيحة)،
+    و null للقيم الفارغة
+    """
+    values = np.round(series.to_numpy(dtype=float), DECIMALS)
+    missing = np.isnan(values)
+    if np.all(values[~missing] % 1 == 0):
+        result = np.where(missing, 0, values).astype(np.int64).tolist()
+    else:
+        result = values.tolist()
+    for position in np.flatnonzero(missing):
+        result[position] = None
+    return result
+
+
+def build_analytics(periods_data, periods):
+    """
+    حساب جميع التحليلات من بيانات الفترات
+
+    Args:
+        periods_data (dict): رقم الفترة ← جدول سجلات الطلاب (load_periods_data)
+        periods (list): مواصفات الفترات من periods_manifest.json
+
+    Returns:
+        dict: ملف التحليلات
+    """
+    fields, total_column = score_fields(periods)
+    df = long_frame(periods_data, fields)
+    df["rank"], df["percentile"] = class_standing(df, total_column)
+
+    period_ids = [spec["id"] for spec in periods if spec["id"] in periods_data]
+    wide = df.pivot(index=ID_COLUMN, columns="period")
+
+    # الطلاب بترتيب أول ظهور، والصف من آخر فترة ظهر فيها الطالب
+    students = pd.Index(df[ID_COLUMN].drop_duplicates())
+    wide = wide.reindex(students)
+    classes = wide[CLASS_COLUMN].reindex(columns=period_ids).ffill(axis=1).iloc[:, -1] \
+        if period_ids else pd.Series(dtype=float)
+
+    def per_period(column):
+        return {str(pid): column_values(wide[column][pid]) if pid in wide[column] else [None] * len(students)
+                for pid in period_ids}
+
+    deltas = {}
+    for previous, current in zip(period_ids, period_ids[1:]):
+        changes = wide[fields + [ABSENCE_COLUMN]].xs(current, axis=1, level="period") \
+            - wide[fields + [ABSENCE_COLUMN]].xs(previous, axis=1, level="period")
+        deltas[str(current)] = {column: column_values(changes[column]) for column in fields + [ABSENCE_COLUMN]}
+
+    # العلامات في آخر فترة (والتغير مقارنة بالفترة التي قبلها)
+    flags = np.zeros(len(students), dtype=np.int64)
+    if period_ids:
+        latest = period_ids[-1]
+        conditions = {
+            "low_rank": wide["percentile"][latest] <= AT_RISK_RULES["low_rank"],
+            "high_absence": wide[ABSENCE_COLUMN][latest] >= AT_RISK_RULES["high_absence"],
+        }
+        if len(period_ids) > 1:
+            previous = period_ids[-2]
+            conditions["percentile_drop"] = (
+                wide["percentile"][previous] - wide["percentile"][latest] >= AT_RISK_RULES["percentile_drop"])
+            conditions["absence_rise"] = (
+                wide[ABSENCE_COLUMN][latest] - wide[ABSENCE_COLUMN][previous] >= AT_RISK_RULES["absence_rise"])
+        for bit, name in enumerate(AT_RISK_FLAGS):
+            if name in conditions:
+                flags |= np.where(conditions[name].fillna(False).to_numpy(dtype=bool), 1 << bit, 0)
+
+    return {
+        "version": ANALYTICS_VERSION,
+        "periods": period_ids,
+        "fields": fields,
+        "total_field": total_column,
+        "flags": AT_RISK_FLAGS,
+        "rules": AT_RISK_RULES,
+        "students": [int(sid) if isinstance(sid, (int, np.integer)) else sid for sid in students],
+        "class": column_values(classes),
+        "rank": per_period("rank"),
+        "percentile": per_period("percentile"),
+        "absence": per_period(ABSENCE_COLUMN),
+        "delta": deltas,
+        "at_risk": flags.tolist(),
+    }
+
+
+def write_analytics(base_dir=None, force=False):
+    """
+    حساب التحليلات وكتابتها إلى analytics.json (إذا تغيرت ملفات الفترات)
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        force (bool): إعادة الحساب حتى لو لم تتغير الملفات
+
+    Returns:
+        dict: التحليلات المكتوبة، أو None إذا تم التخطي
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    periods = load_manifest()
+    inputs = [base_dir / spec["output"] for spec in periods]
+    analytics_file = base_dir / ANALYTICS_FILE
+    params = {"analytics_version": ANALYTICS_VERSION, "rules": AT_RISK_RULES,
+              "fields": score_fields(periods)[0]}
+    build_manifest = base_dir / BUILD_MANIFEST_FILE.name
+
+    digests = input_digests(inputs)
+    if not force and is_up_to_date(ANALYTICS_FILE, inputs, params, [analytics_file], build_manifest, digests):
+        return None
+
+    analytics = build_analytics(load_periods_data(base_dir), periods)
+    with open(analytics_file, 'w', encoding='utf-8') as f:
+        json.dump(analytics, f, ensure_ascii=False, separators=(',', ':'))
+
+    record_build(ANALYTICS_FILE, inputs, [analytics_file], params, build_manifest, digests)
+    return analytics
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تحليلات الدرجات والغياب عبر الفترات")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة الحساب حتى لو لم تتغير ملفات الفترات")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("📈 تحليلات الدرجات والغياب عبر الفترات")
+    print("=" * 60)
+    print()
+
+    try:
+        analytics = write_analytics(force=args.force)
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء الحساب: {str(e)}")
+        return False
+
+    if analytics is None:
+        print(f"⏭️ لم تتغير ملفات الفترات، الملف {ANALYTICS_FILE} محدث")
+    else:
+        flags = np.array(analytics["at_risk"], dtype=np.int64)
+        print(f"👥 عدد الطلاب: {len(analytics['students'])}")
+        print(f"📅 الفترات: {', '.join(str(pid) for pid in analytics['periods'])}")
+        print(f"⚠️ طلاب يحتاجون متابعة: {int((flags > 0).sum())}")
+        for bit, name in enumerate(analytics["flags"]):
+            print(f"   - {name}: {int((flags & (1 << bit) > 0).sum())}")
+        print(f"\n💾 تم حفظ الملف: {ANALYTICS_FILE}")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
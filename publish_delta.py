@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+سجل التغييرات قبل النشر (Delta Publishing)
+يقارن ملفات البيانات الناتجة بآخر نسخة منشورة (آخر commit في git) ويكتب سجل
+التغييرات في "changeset.json":
+
+- الملفات المضافة والمعدلة والمحذوفة (بمقارنة بصمة git لكل ملف، بدون قراءة
+  النسخة القديمة إلا للملفات التي تغيرت)
+- الطلاب المضافون والمحذوفون والمعدلة درجاتهم في كل فترة (حسب رقم الهوية)
+  مع أسماء الحقول التي تغيرت
+- الملاحظات المضافة والمحذوفة (حسب معرف الملاحظة)
+
+وتستخدم سكريبتات التحديث قائمة الملفات المتغيرة (--paths) لإضافة هذه الملفات
+فقط إلى git، فيكون حجم النشر بقدر تعديلات اليوم وليس بقدر جميع البيانات
+
+الاستخدام:
+    python publish_delta.py            # كتابة سجل التغييرات وطباعة ملخصه
+    python publish_delta.py --paths    # طباعة مسارات الملفات المتغيرة فقط (سطر لكل ملف)
+"""
+
+import argparse
+import hashlib
+import json
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from asset_manifest import ASSET_MANIFEST_FILE, ASSETS_DIR_NAME
+from converter_engine import load_manifest
+from join_records import NOTES_FILE, assign_note_ids, load_json
+from notes_date_index import NOTES_DATE_INDEX_FILE
+from notes_summary import SUMMARY_FILE
+from period_analytics import ANALYTICS_FILE
+from search_index import SEARCH_INDEX_FILE
+from student_shards import SHARDS_DIR_NAME
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف سجل التغييرات الناتج
+CHANGESET_FILE = "changeset.json"
+
+# إصدار صيغة سجل التغييرات
+CHANGESET_VERSION = 1
+
+# ملف تاريخ آخر تحديث
+LAST_UPDATE_FILE = "last_update.json"
+
+# الحقل الذي يُميَّز به الطالب في ملفات الفترات
+STUDENT_KEY = "الهوية"
+
+
+def published_paths():
+    """
+    الملفات والمجلدات التي تُنشر (بالترتيب)
+
+    Returns:
+        list: المسارات نسبةً لمجلد المشروع
+    """
+    return ([spec["output"] for spec in load_manifest()]
+            + [NOTES_FILE, SUMMARY_FILE, SEARCH_INDEX_FILE, ANALYTICS_FILE, NOTES_DATE_INDEX_FILE,
+               LAST_UPDATE_FILE, SHARDS_DIR_NAME, ASSET_MANIFEST_FILE, ASSETS_DIR_NAME])
+
+
+def blob_hash(data):
+    """بصمة المحتوى بنفس طريقة git (عند عدم توفر git)"""
+    header = f"blob {len(data)}\0".encode('utf-8')
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def git(args, base_dir, stdin=None):
+    """
+    تنفيذ أمر git وإرجاع مخرجاته
+
+    Returns:
+        bytes: المخرجات، أو None خارج git أو عند الفشل (مثل عدم وجود commit)
+    """
+    try:
+        return subprocess.run(["git", *args], cwd=base_dir, input=stdin,
+                              capture_output=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def published_hashes(paths, base_dir):
+    """
+    بصمات الملفات في آخر نسخة منشورة (أمر git واحد لجميع الملفات)
+
+    Returns:
+        dict: المسار ← البصمة
+    """
+    output = git(["ls-tree", "-r", "-z", "HEAD", "--", *paths], base_dir) or b""
+    hashes = {}
+    for line in output.decode('utf-8').split("\0"):
+        if not line:
+            continue
+        info, path = line.split("\t", 1)
+        _, kind, object_hash = info.split()
+        if kind == "blob":
+            hashes[path] = object_hash
+    return hashes
+
+
+def current_hashes(paths, base_dir):
+    """
+    بصمات الملفات الحالية في مجلد المشروع
+
+    تُحسب عبر git hash-object (أمر واحد لجميع الملفات) حتى تُطبق نفس إعدادات
+    git على الملفات (مثل تحويل نهايات الأسطر في ويندوز)، وبدونه تُحسب مباشرة
+
+    Returns:
+        dict: المسار ← البصمة
+    """
+    files = []
+    for path in paths:
+        target = base_dir / path
+        candidates = sorted(target.rglob("*")) if target.is_dir() else [target]
+        files.extend(file.relative_to(base_dir).as_posix() for file in candidates if file.is_file())
+
+    output = None
+    if files:
+        output = git(["hash-object", "--stdin-paths"], base_dir,
+                     "\n".join(files).encode('utf-8'))
+    if output is not None:
+        return dict(zip(files, output.decode('utf-8').split()))
+    return {path: blob_hash((base_dir / path).read_bytes()) for path in files}
+
+
+def published_json(path, base_dir, default=None):
+    """محتوى ملف JSON في آخر نسخة منشورة (أو القيمة الافتراضية إذا لم يُنشر)"""
+    output = git(["show", f"HEAD:{path}"], base_dir)
+    if output is None:
+        return default
+    return json.loads(output.decode('utf-8'))
+
+
+def student_records(students):
+    """
+    سجلات الطلاب حسب رقم الهوية
+
+    الصفوف التي بدون رقم هوية (0) تُميَّز بالاسم حتى لا تُدمج معاً
+
+    Returns:
+        dict: المفتاح (نص) ← سجل الطالب
+    """
+    records = {}
+    for student in students or []:
+        key = student.get(STUDENT_KEY) or f"name:{student.get('الطالب')}"
+        records[str(key)] = student
+    return records
+
+
+def diff_students(old, new):
+    """
+    الفروق بين نسختين من ملف فترة على مستوى الطالب
+
+    Returns:
+        dict: added, removed (مفاتيح الطلاب)، changed ([{id, fields}])
+    """
+    before, after = student_records(old), student_records(new)
+    changed = []
+    for key in after.keys() & before.keys():
+        if after[key] != before[key]:
+            fields = sorted(field for field in after[key].keys() | before[key].keys()
+                            if after[key].get(field) != before[key].get(field))
+            changed.append({"id": key, "fields": fields})
+    return {
+        "added": sorted(after.keys() - before.keys()),
+        "removed": sorted(before.keys() - after.keys()),
+        "changed": sorted(changed, key=lambda item: item["id"]),
+    }
+
+
+def diff_notes(old, new):
+    """
+    الفروق بين نسختين من ملف الملاحظات (معرف الملاحظة مشتق من محتواها،
+    فتعديل ملاحظة يظهر كحذف وإضافة)
+
+    Returns:
+        dict: added, removed (معرفات الملاحظات)
+    """
+    before, after = assign_note_ids(old or []), assign_note_ids(new or [])
+    return {
+        "added": [nid for nid in after if nid not in before],
+        "removed": [nid for nid in before if nid not in after],
+    }
+
+
+def build_changeset(base_dir=None):
+    """
+    مقارنة ملفات البيانات الحالية بآخر نسخة منشورة
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+
+    Returns:
+        dict: سجل التغييرات (version, base, created_at, files, records, bytes)
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    paths = published_paths()
+    before = published_hashes(paths, base_dir)
+    after = current_hashes(paths, base_dir)
+
+    files = {
+        "added": sorted(after.keys() - before.keys()),
+        "changed": sorted(path for path in after.keys() & before.keys()
+                          if after[path] != before[path]),
+        "removed": sorted(before.keys() - after.keys()),
+    }
+    touched = set(files["added"]) | set(files["changed"])
+
+    # الفروق على مستوى السجلات للملفات التي تغيرت فقط
+    records = {}
+    for spec in load_manifest():
+        output = spec["output"]
+        if output in touched:
+            records[output] = diff_students(published_json(output, base_dir, []),
+                                            load_json(base_dir / output, []))
+    if NOTES_FILE in touched:
+        records[NOTES_FILE] = diff_notes(published_json(NOTES_FILE, base_dir, []),
+                                         load_json(base_dir / NOTES_FILE, []))
+
+    base = git(["rev-parse", "--short", "HEAD"], base_dir)
+    return {
+        "version": CHANGESET_VERSION,
+        "base": base.decode('utf-8').strip() if base else None,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+        "records": records,
+        "bytes": sum((base_dir / path).stat().st_size for path in touched),
+    }
+
+
+def changed_paths(changeset):
+    """مسارات الملفات التي يجب نشرها (المضافة والمعدلة والمحذوفة)"""
+    files = changeset["files"]
+    return sorted(files["added"] + files["changed"] + files["removed"])
+
+
+def write_changeset(base_dir=None):
+    """
+    بناء سجل التغييرات وكتابته إلى changeset.json
+
+    Returns:
+        dict: سجل التغييرات
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    changeset = build_changeset(base_dir)
+    with open(base_dir / CHANGESET_FILE, 'w', encoding='utf-8') as f:
+        json.dump(changeset, f, ensure_ascii=False, indent=2)
+    return changeset
+
+
+def print_changeset(changeset):
+    """طباعة ملخص سجل التغييرات"""
+    files = changeset["files"]
+    print(f"📌 مقارنة بآخر نسخة منشورة: {changeset['base'] or 'لا يوجد'}")
+    print(f"📄 الملفات: ➕ {len(files['added'])} مضاف، ✏️ {len(files['changed'])} معدل، "
+          f"🗑️ {len(files['removed'])} محذوف ({changeset['bytes'] / 1024:.1f} KB)")
+
+    for path, diff in changeset["records"].items():
+        line = f"   - {path}: ➕ {len(diff['added'])}، 🗑️ {len(diff['removed'])}"
+        if "changed" in diff:
+            line += f"، ✏️ {len(diff['changed'])}"
+        print(line)
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="سجل التغييرات مقارنة بآخر نسخة منشورة")
+    parser.add_argument("--paths", action="store_true",
+                        help="طباعة مسارات الملفات المتغيرة فقط (لإضافتها إلى git)")
+    args = parser.parse_args(argv)
+
+    if args.paths:
+        try:
+            changeset = write_changeset()
+        except Exception as e:
+            print(f"❌ حدث خطأ أثناء المقارنة: {str(e)}", file=sys.stderr)
+            return 1
+        for path in changed_paths(changeset):
+            print(path)
+        return 0
+
+    print("=" * 60)
+    print("🧾 سجل التغييرات قبل النشر")
+    print("=" * 60)
+    print()
+
+    try:
+        changeset = write_changeset()
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء المقارنة: {str(e)}")
+        return 1
+
+    if changed_paths(changeset):
+        print_changeset(changeset)
+    else:
+        print("ℹ️ لا توجد تغييرات منذ آخر نشر")
+    print(f"\n💾 تم حفظ الملف: {CHANGESET_FILE}")
+    print("=" * 60)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+نموذج السجلات المضغوط في الذاكرة (Compact Record Model)
+تُقرأ ملفات الفترات والملاحظات كقوائم من القواميس، وكل قاموس يحمل نسخته من
+مفاتيح الأعمدة العربية ومن القيم المتكررة (الصف والمشكلة والإجراء) ومن كل رقم
+ككائن Python مستقل. هذه الوحدة تحفظ نفس السجلات كجدول أعمدة مضغوطة:
+
+- الأعمدة الرقمية الصحيحة (الهوية، الصف، الغياب) في مصفوفة array بأصغر نوع
+  يتسع لقيمها (1 أو 2 أو 4 أو 8 بايت للقيمة)
+- الدرجات العشرية في مصفوفة float32 إذا كانت كل قيمها تُحفظ بدون أي تغيير
+  (مثل 4.5 و 7.25)، وإلا float64
+- الأعمدة النصية والمتكررة كترميز فئوي (categorical): كل قيمة مختلفة تُحفظ
+  مرة واحدة وكل صف يحمل رقمها فقط
+- ترتيب المفاتيح في كل صف يُحفظ بنفس الطريقة، فيعود كل صف كما قُرئ تماماً
+  (نفس المفاتيح بنفس الترتيب ونفس الأنواع) ويُكتب JSON مطابقاً للأصل
+
+تُستخدم في مرحلة الربط (join_records.py) وكل ما يعتمد عليها: يُبنى قاموس الصف
+عند الحاجة إليه فقط (مثل كتابة ملف طالب واحد) ثم يُهمل
+
+الاستخدام:
+    from record_model import RecordTable
+
+    table = RecordTable.from_records(load_json("period1.json"))
+    student = table[0]          # قاموس الصف كما في الملف
+    df = table.frame()          # DataFrame بأعمدة فئوية وأنواع رقمية مصغرة
+"""
+
+from array import array
+from collections.abc import Mapping
+
+# أنواع مصفوفات الأعداد الصحيحة من الأصغر إلى الأكبر مع مداها
+INT_TYPECODES = [
+    ("b", -2 ** 7, 2 ** 7 - 1),
+    ("h", -2 ** 15, 2 ** 15 - 1),
+    ("i", -2 ** 31, 2 ** 31 - 1),
+    ("q", -2 ** 63, 2 ** 63 - 1),
+]
+
+
+def int_typecode(low, high):
+    """أصغر نوع مصفوفة (signed) يتسع للمدى [low, high]، أو None إذا لم يتسع أي نوع"""
+    for typecode, minimum, maximum in INT_TYPECODES:
+        if minimum <= low and high <= maximum:
+            return typecode
+    return None
+
+
+class Column:
+    """
+    عمود واحد مضغوط
+
+    kind:
+        "int"          values مصفوفة أعداد صحيحة
+        "float"        values مصفوفة float32 أو float64
+        "categorical"  values مصفوفة أرقام الفئات و categories القيم المختلفة
+                       (الرقم -1 يعني None)
+        "object"       values قائمة Python (عمود يخلط أنواعاً مختلفة)
+    """
+
+    __slots__ = ("kind", "values", "categories")
+
+    def __init__(self, kind, values, categories=None):
+        self.kind = kind
+        self.values = values
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values):
+        """اختيار أصغر تمثيل يحفظ القيم بدون تغيير"""
+        kinds = {type(value) for value in values}
+
+        if kinds == {int} or not kinds:
+            typecode = int_typecode(min(values, default=0), max(values, default=0))
+            if typecode is not None:
+                return cls("int", array(typecode, values))
+
+        if kinds == {float}:
+            single = array("f", values)
+            # المقارنة تفشل مع NaN فيبقى العمود float64، وهذا مقصود
+            if single.tolist() == values:
+                return cls("float", single)
+            return cls("float", array("d", values))
+
+        if len(kinds - {type(None)}) <= 1:
+            codes_by_value, categories, codes = {}, [], []
+            for value in values:
+                if value is None:
+                    codes.append(-1)
+                    continue
+                code = codes_by_value.get(value)
+                if code is None:
+                    code = codes_by_value[value] = len(categories)
+                    categories.append(value)
+                codes.append(code)
+            return cls("categorical", array(int_typecode(-1, len(categories)), codes), categories)
+
+        return cls("object", list(values))
+
+    def __getitem__(self, row):
+        value = self.values[row]
+        if self.kind == "categorical":
+            return None if value < 0 else self.categories[value]
+        return value
+
+    def tolist(self):
+        """قيم العمود كقائمة Python"""
+        if self.kind == "categorical":
+            categories = self.categories
+            return [None if code < 0 else categories[code] for code in self.values]
+        return list(self.values)
+
+    def nbytes(self):
+        """الحجم التقريبي لبيانات العمود بالبايت (بدون القيم النصية نفسها)"""
+        if isinstance(self.values, array):
+            return self.values.itemsize * len(self.values)
+        return 8 * len(self.values)
+
+    def series(self, index=None):
+        """العمود كـ Series: فئوي للنصوص والقيم المتكررة، وبنوعه المصغر للأرقام"""
+        import numpy as np
+        import pandas as pd
+
+        if self.kind == "categorical":
+            return pd.Series(pd.Categorical.from_codes(np.asarray(self.values, dtype=np.int64),
+                                                       self.categories), index=index)
+        if self.kind == "object":
+            return pd.Series(self.values, index=index, dtype=object)
+        return pd.Series(np.frombuffer(self.values, dtype=self.values.typecode).copy(), index=index)
+
+
+class RecordTable:
+    """
+    جدول سجلات بأعمدة مضغوطة (بديل قائمة القواميس)
+
+    table[i] يعيد قاموس الصف i كما كان في القائمة الأصلية، والمرور على الجدول
+    يعيد القواميس واحداً تلو الآخر (يُبنى كل قاموس عند الحاجة)
+    """
+
+    __slots__ = ("columns", "layouts", "size")
+
+    def __init__(self, columns, layouts, size):
+        self.columns = columns      # اسم العمود ← Column
+        self.layouts = layouts      # ترتيب مفاتيح كل صف (عمود فئوي من tuples)
+        self.size = size
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        بناء الجدول من قائمة قواميس (مثل محتوى period1.json أو notes.json)
+
+        المفاتيح الغائبة عن بعض الصفوف تُحفظ كـ None ولا تظهر في قاموس الصف
+        """
+        records = list(records)
+        names = {}
+        layouts = []
+        for record in records:
+            layout = tuple(record)
+            layouts.append(layout)
+            for name in layout:
+                names.setdefault(name, None)
+
+        columns = {
+            name: Column.from_values([record.get(name) for record in records])
+            for name in names
+        }
+        return cls(columns, Column.from_values(layouts), len(records))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, row):
+        if not -self.size <= row < self.size:
+            raise IndexError("رقم الصف خارج الجدول")
+        columns = self.columns
+        return {name: columns[name][row] for name in self.layouts[row]}
+
+    def __iter__(self):
+        for row in range(self.size):
+            yield self[row]
+
+    def column(self, name):
+        """قيم عمود كقائمة (أو قائمة None إذا لم يكن العمود موجوداً)"""
+        if name not in self.columns:
+            return [None] * self.size
+        return self.columns[name].tolist()
+
+    def nbytes(self):
+        """الحجم التقريبي لبيانات الأعمدة بالبايت"""
+        return sum(column.nbytes() for column in self.columns.values()) + self.layouts.nbytes()
+
+    def frame(self, columns=None):
+        """
+        الجدول كـ DataFrame بأعمدة فئوية وأنواع رقمية مصغرة
+
+        Args:
+            columns (list): الأعمدة المطلوبة بالترتيب (افتراضي: جميع الأعمدة).
+                            العمود غير الموجود يكون فارغاً (None)
+        """
+        import pandas as pd
+
+        names = list(self.columns) if columns is None else columns
+        data = {}
+        for name in names:
+            if name in self.columns:
+                data[name] = self.columns[name].series()
+            else:
+                data[name] = pd.Series([None] * self.size, dtype=object)
+        return pd.DataFrame(data, columns=names, index=pd.RangeIndex(self.size))
+
+
+class RecordMapping(Mapping):
+    """
+    قاموس للقراءة فقط: المعرف ← قاموس الصف من RecordTable
+
+    بديل {معرف: ملاحظة} في السجلات الموحدة، فتُحفظ الملاحظات مضغوطة ويبقى
+    الوصول إليها بالمعرف كما كان
+    """
+
+    __slots__ = ("ids", "table", "rows")
+
+    def __init__(self, ids, table):
+        self.ids = list(ids)
+        self.table = table
+        self.rows = {nid: row for row, nid in enumerate(self.ids)}
+
+    def __getitem__(self, key):
+        return self.table[self.rows[key]]
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+قياس زمن وذاكرة كل مرحلة من مراحل التحديث (Run Report)
+تسجل المحولات و save_update_date.py زمن كل مرحلة (الزمن الفعلي وزمن المعالج)
+وذروة الذاكرة وعدد الصفوف، ويُحفظ السجل في "run_report.json" بجانب
+last_update.json مع آخر التشغيلات السابقة لاكتشاف أي تباطؤ
+
+التحليل المفصل (اختياري) عبر متغير البيئة GRADES_PROFILE:
+    GRADES_PROFILE=cprofile     # حفظ ملف .prof لكل تشغيل وأبطأ الدوال في التقرير
+    GRADES_PROFILE=tracemalloc  # ذروة ذاكرة Python لكل مرحلة وأكثر الأسطر استهلاكاً
+
+الاستخدام:
+    from run_report import record_run, stage
+
+    with record_run("convert_notes_to_json"):
+        with stage("read_excel") as info:
+            df = read_workbook(...)
+            info["rows"] = len(df)
+
+    python run_report.py        # عرض آخر التشغيلات
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف سجل التشغيلات (بجانب last_update.json)
+RUN_REPORT_FILE = SCRIPT_DIR / "run_report.json"
+
+# عدد التشغيلات المحفوظة في السجل
+MAX_RUNS = 50
+
+# متغير البيئة لتفعيل التحليل المفصل
+PROFILE_ENV = "GRADES_PROFILE"
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+# مجلد ملفات cProfile
+PROFILES_DIR = SCRIPT_DIR / ".cache" / "profiles"
+
+# عدد الدوال أو الأسطر المعروضة في التقرير عند التحليل المفصل
+PROFILE_TOP = 15
+
+# المراحل المسجلة في التشغيل الحالي (لكل خيط: مراحل التحديث المتوازية في
+# update_pipeline.py تُسجل كل منها في قائمتها ثم تُجمع في الخيط الرئيسي)
+_local = threading.local()
+
+
+def current_stages():
+    """قائمة المراحل المسجلة في الخيط الحالي"""
+    if not hasattr(_local, "stages"):
+        _local.stages = []
+    return _local.stages
+
+
+def profiling_mode():
+    """نمط التحليل المفصل المطلوب من متغير البيئة، أو None"""
+    mode = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return mode if mode in PROFILE_MODES else None
+
+
+def peak_rss_mb():
+    """
+    ذروة الذاكرة المستخدمة في العملية منذ بدايتها بالميجابايت
+
+    Returns:
+        float: الذروة، أو None إذا لم يمكن قياسها في هذا النظام
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows: لا توجد مكتبة resource، نستخدم psutil إن كانت مثبتة
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # وحدة ru_maxrss: كيلوبايت في Linux وبايت في macOS
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+@contextmanager
+def stage(name, rows=None):
+    """
+    قياس مرحلة واحدة
+
+    إذا تكررت المرحلة بنفس الاسم (مثل الدفعات في القراءة التدفقية) تُجمع
+    أزمنتها وصفوفها في سجل واحد
+
+    Args:
+        name (str): اسم المرحلة
+        rows (int): عدد الصفوف (يمكن تحديده لاحقاً عبر info["rows"])
+
+    Yields:
+        dict: سجل المرحلة
+    """
+    info = {"rows": rows}
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield info
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        stages = current_stages()
+        record = next((s for s in stages if s["stage"] == name), None)
+        if record is None:
+            record = {"stage": name, "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                      "rows": None}
+            stages.append(record)
+
+        record["calls"] += 1
+        record["wall_seconds"] = round(record["wall_seconds"] + wall, 6)
+        record["cpu_seconds"] = round(record["cpu_seconds"] + cpu, 6)
+        if info["rows"] is not None:
+            record["rows"] = (record["rows"] or 0) + info["rows"]
+        record["peak_rss_mb"] = peak_rss_mb()
+        if tracing:
+            peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            record["traced_peak_mb"] = round(max(record.get("traced_peak_mb", 0), peak), 2)
+
+
+def take_stages():
+    """
+    إرجاع المراحل المسجلة في هذا الخيط وتفريغها (لإرسالها من العمليات الفرعية
+    أو من خيوط المراحل المتوازية)
+    """
+    stages = list(current_stages())
+    current_stages().clear()
+    return stages
+
+
+def add_stages(stages):
+    """إضافة مراحل سُجلت في عملية أو خيط آخر إلى التشغيل الحالي"""
+    current_stages().extend(stages)
+
+
+def profile_summary(profiler):
+    """أبطأ الدوال (حسب الزمن التراكمي) كنص"""
+    import pstats
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats("cumulative").print_stats(PROFILE_TOP)
+    return [line for line in output.getvalue().splitlines() if line.strip()]
+
+
+def tracemalloc_summary(snapshot):
+    """أكثر الأسطر استهلاكاً للذاكرة"""
+    return [str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_TOP]]
+
+
+def load_runs(report_file=None):
+    """قراءة التشغيلات السابقة من السجل"""
+    report_file = Path(report_file) if report_file else RUN_REPORT_FILE
+    try:
+        with open(report_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get("runs", [])
+    except (OSError, ValueError):
+        return []
+
+
+def save_run(run, report_file=None):
+    """إضافة تشغيل إلى السجل مع الاحتفاظ بآخر MAX_RUNS تشغيل فقط"""
+    report_file = Path(report_file) if report_file else RUN_REPORT_FILE
+    runs = load_runs(report_file) + [run]
+    with open(report_file, 'w', encoding='utf-8') as f:
+        json.dump({"runs": runs[-MAX_RUNS:]}, f, ensure_ascii=False, indent=2)
+
+
+@contextmanager
+def record_run(script, report_file=None):
+    """
+    تسجيل تشغيل كامل لسكريبت وحفظه في السجل عند انتهائه (حتى عند الفشل)
+
+    Args:
+        script (str): اسم السكريبت
+        report_file (Path): مسار السجل (افتراضي: run_report.json)
+
+    Yields:
+        dict: سجل التشغيل (يمكن إضافة معلومات إليه مثل النجاح)
+    """
+    mode = profiling_mode()
+    profiler = None
+    if mode == "cprofile":
+        import cProfile  # استيراد عند الطلب فقط (تشغيل أسرع للسكريبتات الخفيفة)
+        profiler = cProfile.Profile()
+        profiler.enable()
+    elif mode == "tracemalloc":
+        tracemalloc.start()
+
+    take_stages()
+    started = datetime.now()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    run = {"script": script, "started": started.isoformat(timespec="seconds")}
+    try:
+        yield run
+    finally:
+        run["wall_seconds"] = round(time.perf_counter() - wall_start, 6)
+        run["cpu_seconds"] = round(time.process_time() - cpu_start, 6)
+        run["peak_rss_mb"] = peak_rss_mb()
+        run["stages"] = take_stages()
+
+        if profiler is not None:
+            profiler.disable()
+            PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+            profile_file = PROFILES_DIR / f"{script}-{started:%Y%m%d-%H%M%S}.prof"
+            profiler.dump_stats(profile_file)
+            run["profile"] = {"mode": mode, "file": str(profile_file),
+                              "top": profile_summary(profiler)}
+        elif mode == "tracemalloc":
+            run["profile"] = {"mode": mode, "top": tracemalloc_summary(tracemalloc.take_snapshot())}
+            tracemalloc.stop()
+
+        try:
+            save_run(run, report_file)
+        except OSError as e:
+            print(f"⚠️ تعذّر حفظ سجل القياس: {e}")
+
+
+def print_runs(runs):
+    """طباعة ملخص التشغيلات مع مراحل كل تشغيل"""
+    for run in runs:
+        print(f"\n🕒 {run['started']}  {run['script']}  "
+              f"({run['wall_seconds']:.3f} ث، ذروة الذاكرة {run.get('peak_rss_mb') or '-'} MB)")
+        for record in run["stages"]:
+            rows = f"{record['rows']:>9,} صف" if record.get("rows") is not None else ""
+            print(f"   {record['stage']:<28} {record['wall_seconds']:>8.3f} ث "
+                  f"(معالج {record['cpu_seconds']:>7.3f})   {rows}")
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="عرض سجل قياس مراحل التحديث")
+    parser.add_argument("--last", type=int, default=5, help="عدد التشغيلات المعروضة")
+    args = parser.parse_args(argv)
+
+    runs = load_runs()
+    if not runs:
+        print(f"ℹ️ لا يوجد سجل بعد ({RUN_REPORT_FILE.name})")
+        return 0
+
+    print("=" * 60)
+    print("⏱️ سجل قياس مراحل التحديث")
+    print("=" * 60)
+    print_runs(runs[-args.last:])
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
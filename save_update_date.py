@@ -8,6 +8,25 @@
 import json
 from datetime import datetime
 from umm_alqura_calendar import gregorian_to_hijri, format_hijri_date
+from build_cache import file_hash
+from asset_manifest import ASSET_MANIFEST_FILE, write_asset_manifest
+from converter_engine import load_manifest
+from run_report import record_run, stage
+
+# ملف الملاحظات (يُضاف إلى ملفات الفترات المذكورة في periods_manifest.json)
+NOTES_ARTIFACT = "notes.json"
+
+def tracked_artifacts():
+    """أسماء ملفات البيانات المنشورة التي يتم تتبع تغيّرها"""
+    return [spec["output"] for spec in load_manifest()] + [NOTES_ARTIFACT]
+
+def load_previous_artifacts():
+    """قراءة بصمات الملفات المسجلة في آخر تحديث"""
+    try:
+        with open('last_update.json', 'r', encoding='utf-8') as f:
+            return json.load(f).get("artifacts", {})
+    except (OSError, ValueError):
+        return {}
 
 def save_update_date():
     """حفظ تاريخ التحديث الحالي (ميلادي وهجري)"""
@@ -24,6 +43,16 @@ def save_update_date():
     hijri = gregorian_to_hijri(now.year, now.month, now.day)
     hijri_date = format_hijri_date(hijri)
     
+    # بصمات ملفات البيانات ومقارنتها بآخر تحديث لمعرفة ما تغيّر فعلاً
+    with stage("hash_artifacts") as info:
+        previous_artifacts = load_previous_artifacts()
+        artifacts = {name: file_hash(name) for name in tracked_artifacts()}
+        changed_artifacts = [
+            name for name, digest in artifacts.items()
+            if digest is not None and previous_artifacts.get(name) != digest
+        ]
+        info["rows"] = len(artifacts)
+    
     # إنشاء البيانات
     update_info = {
         "last_update": {
@@ -38,20 +67,34 @@ def save_update_date():
                 "display": hijri_date
             },
             "timestamp": int(now.timestamp())
-        }
+        },
+        "artifacts": artifacts,
+        "changed_artifacts": changed_artifacts
     }
     
     # حفظ في ملف JSON
-    with open('last_update.json', 'w', encoding='utf-8') as f:
-        json.dump(update_info, f, ensure_ascii=False, indent=2)
+    with stage("write_last_update"):
+        with open('last_update.json', 'w', encoding='utf-8') as f:
+            json.dump(update_info, f, ensure_ascii=False, indent=2)
+    
+    # نسخ ملفات البيانات بأسماء مشتقة من البصمة (بعد كتابة last_update.json لأنه منها)
+    with stage("asset_manifest") as info:
+        assets = write_asset_manifest(".", digests=artifacts)
+        info["rows"] = len(assets["files"])
     
     print(f"✅ تم حفظ تاريخ التحديث:")
     print(f"   📅 ميلادي: {gregorian_full}")
     print(f"   🌙 هجري: {hijri_date}")
+    if changed_artifacts:
+        print(f"   📝 الملفات المتغيرة: {', '.join(changed_artifacts)}")
+    else:
+        print(f"   ℹ️ لم يتغير أي ملف بيانات منذ آخر تحديث")
+    print(f"   🔖 {ASSET_MANIFEST_FILE}: {len(assets['files'])} ملف بأسماء مشتقة من البصمة")
 
 if __name__ == "__main__":
     try:
-        save_update_date()
+        with record_run("save_update_date"):
+            save_update_date()
     except Exception as e:
         print(f"❌ خطأ: {str(e)}")
         exit(1)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+فهرس البحث لصفحة الوكيل والمرشد (Search Index)
+يبني مرة واحدة عند التحديث فهرساً مقلوباً لأسماء الطلاب وأرقام هوياتهم وصفوفهم
+ويكتبه في "search_index.json"، فتجيب صفحة admin.html عن البحث أثناء الكتابة
+بالبحث في الفهرس بدلاً من تنظيف اسم كل طالب ومقارنته في كل ضغطة مفتاح
+
+محتوى الفهرس:
+- students: [رقم الهوية، الاسم، الصف] لكل طالب (يُشار إليه بترتيبه في القائمة)
+- grams: المقطع الثلاثي ← الطلاب (لأي جزء من الاسم أو الهوية طوله 3 أحرف فأكثر)
+- classes: الصف ← الطلاب
+
+البحث بحرف أو حرفين فقط يطابق معظم الطلاب، فتبحث فيه الصفحة مباشرة في قائمة
+الطلاب بدلاً من تخزين قوائم ضخمة في الفهرس
+
+قوائم الطلاب مرتبة ومخزنة كفروق متتالية (delta) لتصغير الملف
+
+الاستخدام:
+    python search_index.py
+    python search_index.py --force    # إعادة البناء حتى لو لم تتغير الملفات
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from build_cache import BUILD_MANIFEST_FILE, input_digests, is_up_to_date, record_build
+from converter_engine import load_manifest
+from join_records import load_periods_data
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الفهرس الناتج
+SEARCH_INDEX_FILE = "search_index.json"
+
+# إصدار صيغة الفهرس - يجب زيادته عند تغيير طريقة البناء
+SEARCH_INDEX_VERSION = 1
+
+# طول المقاطع في الفهرس
+GRAM_LENGTH = 3
+
+# التشكيل وتوحيد الحروف - مطابقة لدالة normalizeArabicText في admin.html
+DIACRITICS_PATTERN = re.compile(r'[ًٌٍَُِّْ]')
+LETTER_FOLDING = str.maketrans({"أ": "ا", "إ": "ا", "آ": "ا", "ة": "ه", "ى": "ي"})
+
+
+def normalize_search_text(text):
+    """تنظيف النص للبحث بنفس طريقة normalizeArabicText في admin.html"""
+    if text is None:
+        return ""
+    text = " ".join(str(text).split())
+    return DIACRITICS_PATTERN.sub("", text).translate(LETTER_FOLDING)
+
+
+def word_grams(word):
+    """جميع المقاطع بطول GRAM_LENGTH داخل الكلمة"""
+    return {word[i:i + GRAM_LENGTH] for i in range(len(word) - GRAM_LENGTH + 1)}
+
+
+def delta_encode(ordinals):
+    """ترميز قائمة أرقام مرتبة كفروق متتالية: [3, 7, 8] ← [3, 4, 1]"""
+    encoded, previous = [], 0
+    for ordinal in ordinals:
+        encoded.append(ordinal - previous)
+        previous = ordinal
+    return encoded
+
+
+def roster(periods_data):
+    """
+    قائمة الطلاب بدون تكرار (أول ظهور لكل هوية، كما في بحث الصفحة سابقاً)
+
+    الصفوف التي بدون رقم هوية (0) لا تُدمج معاً، بل يُحذف تكرارها بالاسم
+
+    Returns:
+        list: [رقم الهوية، الاسم، الصف]
+    """
+    students = {}
+    for period_students in periods_data.values():
+        for student in period_students:
+            student_id = student.get("الهوية")
+            key = student_id or ("name", student.get("الطالب"))
+            if key not in students:
+                students[key] = [student_id, student.get("الطالب"), student.get("الصف")]
+    return list(students.values())
+
+
+def build_search_index(periods_data):
+    """
+    بناء الفهرس المقلوب من بيانات الفترات
+
+    Args:
+        periods_data (dict): رقم الفترة ← قائمة سجلات الطلاب
+
+    Returns:
+        dict: الفهرس (version, gram_length, students, grams, classes)
+    """
+    students = roster(periods_data)
+    grams, classes = {}, {}
+
+    for ordinal, (student_id, name, student_class) in enumerate(students):
+        words = normalize_search_text(name).split() + [str(student_id)]
+        keys = set()
+        for word in words:
+            keys.update(word_grams(word))
+        for key in keys:
+            grams.setdefault(key, []).append(ordinal)
+
+        if student_class is not None:
+            classes.setdefault(str(student_class), []).append(ordinal)
+
+    # الترتيب تصاعدي أصلاً لأن الطلاب يُضافون بالترتيب
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "gram_length": GRAM_LENGTH,
+        "students": students,
+        "grams": {key: delta_encode(ordinals) for key, ordinals in grams.items()},
+        "classes": {key: delta_encode(ordinals) for key, ordinals in classes.items()},
+    }
+
+
+def write_search_index(base_dir=None, force=False):
+    """
+    بناء الفهرس وكتابته إلى search_index.json (إذا تغيرت ملفات الفترات)
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        force (bool): إعادة البناء حتى لو لم تتغير الملفات
+
+    Returns:
+        dict: الفهرس المكتوب، أو None إذا تم التخطي
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    inputs = [base_dir / spec["output"] for spec in load_manifest()]
+    index_file = base_dir / SEARCH_INDEX_FILE
+    params = {"search_index_version": SEARCH_INDEX_VERSION}
+    build_manifest = base_dir / BUILD_MANIFEST_FILE.name
+
+    digests = input_digests(inputs)
+    if not force and is_up_to_date(SEARCH_INDEX_FILE, inputs, params, [index_file], build_manifest, digests):
+        return None
+
+    index = build_search_index(load_periods_data(base_dir))
+    with open(index_file, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+
+    record_build(SEARCH_INDEX_FILE, inputs, [index_file], params, build_manifest, digests)
+    return index
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="بناء فهرس البحث لصفحة الوكيل والمرشد")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة البناء حتى لو لم تتغير ملفات الفترات")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🔎 بناء فهرس البحث لصفحة الوكيل والمرشد")
+    print("=" * 60)
+    print()
+
+    try:
+        index = write_search_index(force=args.force)
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء بناء الفهرس: {str(e)}")
+        return False
+
+    if index is None:
+        print(f"⏭️ لم تتغير ملفات الفترات، الملف {SEARCH_INDEX_FILE} محدث")
+    else:
+        size_kb = (SCRIPT_DIR / SEARCH_INDEX_FILE).stat().st_size / 1024
+        print(f"👥 عدد الطلاب: {len(index['students'])}")
+        print(f"🔤 عدد المقاطع: {len(index['grams'])}")
+        print(f"\n💾 تم حفظ الملف: {SEARCH_INDEX_FILE} ({size_kb:.1f} KB)")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+خادم محلي للموقع مع واجهة استعلام لكل طالب (Local Viewer Server)
+خادم asyncio بدون مكتبات إضافية، مناسب للشبكة الداخلية للمدرسة:
+
+- يقدّم الملفات المنشورة فقط (صفحات HTML وملفات البيانات ومجلدي data و students)
+- يحمّل ملفات الفترات والملاحظات في الذاكرة مع فهارس:
+  رقم الهوية ← سجل الطالب، والاسم المنظف ← الملاحظات
+- واجهة استعلام:
+    GET /api/student/<رقم الهوية>   درجات الطالب في جميع الفترات مع ملاحظاته
+    GET /api/notes?name=<الاسم>     ملاحظات طالب بالاسم
+- ETag قوي لكل استجابة (304 عند عدم التغيير) وضغط gzip أو brotli حسب المتصفح
+- ملفات مجلد data (أسماؤها مشتقة من بصمة المحتوى) تُحفظ في المتصفح دون إعادة تحقق
+- إعادة تحميل البيانات تلقائياً عند تغيّر ملفات JSON
+
+الاستخدام:
+    python serve_viewer.py                   # http://localhost:5500
+    python serve_viewer.py --port 8000 --host 0.0.0.0
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import mimetypes
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from asset_manifest import ASSET_MANIFEST_FILE, ASSETS_DIR_NAME, asset_names
+from converter_engine import load_manifest
+from convert_notes_to_json import normalize_name
+from join_records import NOTES_FILE, build_joined_records
+from student_shards import SHARDS_DIR_NAME, build_shard_documents, normalize_student_id
+from watch_workbooks import file_signature
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5500
+
+# الفترة بين كل فحص لتغيّر ملفات البيانات (بالثواني)
+RELOAD_INTERVAL = 1.0
+
+# ملفات البيانات بأسماء مشتقة من البصمة لا يتغير محتواها أبداً (asset_manifest.py)
+IMMUTABLE_PREFIX = f"/{ASSETS_DIR_NAME}/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# مدة إبقاء الاتصال مفتوحاً بدون طلبات (بالثواني)
+KEEP_ALIVE_TIMEOUT = 15
+
+# أقل حجم للاستجابة حتى يتم ضغطها (بالبايت)
+MIN_COMPRESS_SIZE = 512
+
+# أنواع المحتوى التي يتم ضغطها
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "image/svg+xml")
+
+# الملفات المنشورة فقط هي التي تُقدّم: صفحات HTML في مجلد الموقع، والمجلدات
+# التالية، وملفات البيانات التي تحمّلها الصفحات (asset_manifest.py).
+# أي ملف آخر (ملفات Excel وسجلات الطلاب المجمعة والتقارير والسكريبتات) لا يُقدّم
+PUBLISHED_SUFFIXES = {".html"}
+PUBLISHED_DIRS = {ASSETS_DIR_NAME, SHARDS_DIR_NAME}
+
+# أكبر عدد من الترويسات في الطلب الواحد (سطر الترويسة الواحد محدود بحد StreamReader)
+MAX_HEADERS = 100
+
+# أكبر محتوى طلب (body) يُقرأ ويُهمل للإبقاء على الاتصال، وما يزيد عنه يُغلق الاتصال بعده
+MAX_DRAIN_BYTES = 64 * 1024
+
+STATUS_TEXT = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 403: "Forbidden",
+    404: "Not Found", 405: "Method Not Allowed", 414: "URI Too Long",
+    431: "Request Header Fields Too Large",
+}
+
+
+def has_brotli():
+    """التحقق من توفر مكتبة brotli"""
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def strong_etag(body):
+    """ETag قوي من بصمة المحتوى"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def json_bytes(data):
+    """تحويل البيانات إلى JSON مصغّر"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class Representation:
+    """
+    محتوى استجابة واحدة مع نسخه المضغوطة (تُنشأ عند أول طلب ثم تُحفظ)
+
+    لكل نسخة ETag مختلف لأن ETag القوي يخص تمثيلاً محدداً بالبايت
+    """
+
+    def __init__(self, body, content_type):
+        self.body = body
+        self.content_type = content_type
+        self.etag = strong_etag(body)
+        self.variants = {}
+
+    def compressible(self):
+        """هل يستحق المحتوى الضغط؟ (نص أو JSON بحجم كافٍ)"""
+        return len(self.body) >= MIN_COMPRESS_SIZE and self.content_type.startswith(COMPRESSIBLE_TYPES)
+
+    def variant(self, encoding):
+        """المحتوى بالترميز المطلوب: (المحتوى، ETag)"""
+        if encoding is None:
+            return self.body, self.etag
+        if encoding not in self.variants:
+            if encoding == "br":
+                import brotli
+                compressed = brotli.compress(self.body, quality=5)
+            else:
+                compressed = gzip.compress(self.body, compresslevel=6, mtime=0)
+            self.variants[encoding] = compressed
+        return self.variants[encoding], f'{self.etag[:-1]}-{encoding}"'
+
+
+def choose_encoding(accept_encoding):
+    """اختيار الضغط حسب ترويسة Accept-Encoding (brotli أولاً ثم gzip)"""
+    accepted = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip().lower())
+    if "br" in accepted and has_brotli():
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def etag_matches(if_none_match, etag):
+    """التحقق من ترويسة If-None-Match"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+class DataIndex:
+    """
+    بيانات الفترات والملاحظات في الذاكرة مع فهارس الاستعلام
+
+    يُعاد بناء الفهارس كاملة عند تغيّر أي ملف بيانات
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir)
+        self.signatures = {}
+        self.students = {}
+        self.notes_by_name = {}
+        self.responses = {}
+
+    def sources(self):
+        """ملفات البيانات التي تُبنى منها الفهارس"""
+        return [self.base_dir / spec["output"] for spec in load_manifest()] + [self.base_dir / NOTES_FILE]
+
+    def current_signatures(self):
+        return {path: file_signature(path) for path in self.sources()}
+
+    def is_stale(self):
+        """هل تغيّر أي ملف بيانات منذ آخر تحميل؟"""
+        return self.current_signatures() != self.signatures
+
+    def load(self):
+        """تحميل ملفات البيانات وبناء الفهارس"""
+        signatures = self.current_signatures()
+        records = build_joined_records(self.base_dir)
+
+        students = {str(student_id): document
+                    for student_id, document in build_shard_documents(records).items()}
+        notes_by_name = {}
+        for nid, note in records["notes"].items():
+            name = normalize_name(note.get("اسم_الطالب"))
+            notes_by_name.setdefault(name, []).append(dict(note, id=nid))
+
+        self.students = students
+        self.notes_by_name = notes_by_name
+        self.responses = {}
+        self.signatures = signatures
+
+    def cached(self, key, build):
+        """استجابة API محفوظة حتى إعادة التحميل التالية"""
+        if key not in self.responses:
+            self.responses[key] = Representation(json_bytes(build()), "application/json; charset=utf-8")
+        return self.responses[key]
+
+    def student(self, student_id):
+        """مستند الطالب (درجاته في الفترات وملاحظاته)، أو None"""
+        student_id = normalize_student_id(student_id)
+        if student_id not in self.students:
+            return None
+        return self.cached(("student", student_id), lambda: self.students[student_id])
+
+    def notes(self, name):
+        """ملاحظات الطالب بالاسم"""
+        name = normalize_name(name)
+        if name not in self.notes_by_name:
+            # لا تُحفظ استجابات الأسماء غير الموجودة حتى لا تكبر الذاكرة بطلبات عشوائية
+            return Representation(json_bytes({"name": name, "notes": []}),
+                                  "application/json; charset=utf-8")
+        return self.cached(("notes", name), lambda: {"name": name, "notes": self.notes_by_name[name]})
+
+
+class StaticFiles:
+    """تقديم ملفات الموقع مع حفظ المحتوى في الذاكرة حتى يتغيّر الملف"""
+
+    def __init__(self, base_dir):
+        self.base_dir = Path(base_dir).resolve()
+        self.published_files = set(asset_names()) | {ASSET_MANIFEST_FILE}
+        self.cache = {}
+
+    def is_published(self, parts):
+        """
+        هل المسار (مقسماً إلى أجزاء) من الملفات المنشورة؟
+
+        Example:
+            >>> static = StaticFiles(".")
+            >>> static.is_published(("index.html",)), static.is_published(("students", "ab", "x.json"))
+            (True, True)
+            >>> static.is_published(("student_records.json",)), static.is_published(("serve_viewer.py",))
+            (False, False)
+        """
+        if len(parts) > 1:
+            return parts[0] in PUBLISHED_DIRS
+        return Path(parts[0]).suffix.lower() in PUBLISHED_SUFFIXES or parts[0] in self.published_files
+
+    def resolve(self, url_path):
+        """مسار الملف المطلوب داخل مجلد الموقع، أو None إذا كان غير مسموح"""
+        relative = unquote(url_path).lstrip("/") or "index.html"
+        parts = Path(relative).parts
+        if any(part.startswith(".") or part == ".." for part in parts) or not self.is_published(parts):
+            return None
+        path = (self.base_dir / relative).resolve()
+        if self.base_dir not in path.parents:
+            return None
+        return path
+
+    def get(self, path):
+        """محتوى الملف كـ Representation، أو None إذا لم يكن موجوداً"""
+        signature = file_signature(path)
+        if signature is None or not path.is_file():
+            self.cache.pop(path, None)
+            return None
+
+        entry = self.cache.get(path)
+        if entry is None or entry[0] != signature:
+            content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+            if content_type.startswith("text/") or content_type in ("application/json", "application/javascript"):
+                content_type += "; charset=utf-8"
+            entry = (signature, Representation(path.read_bytes(), content_type))
+            self.cache[path] = entry
+        return entry[1]
+
+
+class ViewerServer:
+    """خادم HTTP/1.1 مبسط فوق asyncio"""
+
+    def __init__(self, base_dir=None):
+        base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+        self.data = DataIndex(base_dir)
+        self.static = StaticFiles(base_dir)
+
+    def route(self, method, target, headers):
+        """
+        معالجة طلب واحد
+
+        Returns:
+            tuple: (رمز الحالة، الترويسات، المحتوى)
+        """
+        if method not in ("GET", "HEAD"):
+            return self.error(405, {"Allow": "GET, HEAD"})
+
+        url = urlsplit(target)
+        path = unquote(url.path)
+
+        if path.startswith("/api/student/"):
+            representation = self.data.student(path[len("/api/student/"):])
+            if representation is None:
+                return self.error(404, message="الطالب غير موجود")
+        elif path == "/api/notes":
+            name = parse_qs(url.query).get("name", [""])[0]
+            if not name.strip():
+                return self.error(400, message="الرجاء تحديد الاسم: /api/notes?name=...")
+            representation = self.data.notes(name)
+        else:
+            file_path = self.static.resolve(url.path)
+            if file_path is None:
+                return self.error(403)
+            representation = self.static.get(file_path)
+            if representation is None:
+                return self.error(404)
+
+        cache_control = IMMUTABLE_CACHE_CONTROL if path.startswith(IMMUTABLE_PREFIX) else "no-cache"
+        return self.respond(representation, headers, cache_control)
+
+    def respond(self, representation, request_headers, cache_control="no-cache"):
+        """استجابة 200 أو 304 مع الضغط وETag"""
+        encoding = None
+        if representation.compressible():
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        body, etag = representation.variant(encoding)
+
+        headers = {
+            "Content-Type": representation.content_type,
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            return 304, headers, b""
+        return 200, headers, body
+
+    def error(self, status, headers=None, message=None):
+        """استجابة خطأ بصيغة JSON"""
+        body = json_bytes({"error": message or STATUS_TEXT[status]})
+        headers = dict(headers or {}, **{"Content-Type": "application/json; charset=utf-8"})
+        return status, headers, body
+
+    async def handle(self, reader, writer):
+        """
+        معالجة اتصال واحد (مع دعم keep-alive)
+
+        قراءة الملفات وضغطها (route) تعمل في خيط منفصل حتى لا يتوقف باقي
+        الاتصالات أثناءها، ومحتوى الطلب (body) يُقرأ ويُهمل قبل الطلب التالي
+        على نفس الاتصال، أو يُغلق الاتصال إذا كان كبيراً أو غير محدد الطول
+        """
+        try:
+            while True:
+                try:
+                    request_line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.send(writer, *self.error(414), keep_alive=False)
+                    break
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.send(writer, *self.error(400), head=False, keep_alive=False)
+                    break
+
+                try:
+                    headers = await self.read_headers(reader)
+                except (asyncio.LimitOverrunError, ValueError):
+                    await self.send(writer, *self.error(431), keep_alive=False)
+                    break
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close")
+                if not await self.drain_body(reader, headers):
+                    keep_alive = False
+                status, response_headers, body = await asyncio.to_thread(self.route, method, target, headers)
+                await self.send(writer, status, response_headers, body,
+                                head=(method == "HEAD"), keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_headers(self, reader):
+        """
+        قراءة ترويسات الطلب
+
+        Raises:
+            ValueError: إذا تجاوز سطر ترويسة حد الطول أو تجاوز عددها MAX_HEADERS
+        """
+        headers = {}
+        for _ in range(MAX_HEADERS + 1):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise ValueError("too many headers")
+
+    async def drain_body(self, reader, headers):
+        """
+        قراءة محتوى الطلب وإهماله حتى لا يُقرأ الطلب التالي من بقاياه
+
+        Returns:
+            bool: True إذا أمكن إبقاء الاتصال مفتوحاً
+        """
+        if "transfer-encoding" in headers:
+            return False
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            return False
+        if length < 0 or length > MAX_DRAIN_BYTES:
+            return False
+        if length:
+            await reader.readexactly(length)
+        return True
+
+    async def send(self, writer, status, headers, body, head=False, keep_alive=True):
+        """كتابة الاستجابة إلى الاتصال"""
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+        headers = dict(headers, Connection="keep-alive" if keep_alive else "close")
+        if status != 304:
+            headers["Content-Length"] = str(len(body))
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if not head:
+            writer.write(body)
+        await writer.drain()
+
+    async def reload_loop(self, interval=RELOAD_INTERVAL):
+        """إعادة تحميل البيانات عند تغيّر ملفات JSON"""
+        while True:
+            await asyncio.sleep(interval)
+            if not self.data.is_stale():
+                continue
+            try:
+                await asyncio.to_thread(self.data.load)
+                print(f"🔄 تم تحديث البيانات: {len(self.data.students)} طالب")
+            except Exception as e:
+                # ملف يُكتب حالياً أو غير صالح: المحاولة مرة أخرى في الفحص التالي
+                print(f"⚠️ تعذّر تحديث البيانات: {e}")
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """تشغيل الخادم حتى الإيقاف"""
+        self.data.load()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"👥 عدد الطلاب: {len(self.data.students)}")
+        print(f"🌐 الخادم يعمل على http://{'localhost' if host in ('127.0.0.1', '0.0.0.0') else host}:{port}")
+        print(f"🔍 مثال: http://localhost:{port}/api/student/1159456654")
+        print("⏳ (Ctrl+C للإيقاف)")
+
+        reload_task = asyncio.create_task(self.reload_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            reload_task.cancel()
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="خادم محلي للموقع مع واجهة استعلام لكل طالب")
+    parser.add_argument("--host", default=DEFAULT_HOST,
+                        help="عنوان الاستماع (0.0.0.0 للشبكة الداخلية)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="رقم المنفذ")
+    parser.add_argument("--dir", type=Path, default=None,
+                        help="مجلد الموقع وملفات البيانات (افتراضي: مجلد السكريبت)")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🌐 خادم عرض الدرجات المحلي")
+    print("=" * 60)
+
+    try:
+        asyncio.run(ViewerServer(args.dir).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\n👋 تم إيقاف الخادم")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
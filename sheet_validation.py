@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+التحقق من صحة ملفات درجات الفترات قبل نشرها (Sheet Validation)
+يفحص كل ملف Excel بعد قراءته وقبل كتابة أي ملف JSON، بعمليات على الأعمدة
+كاملة دفعة واحدة (بدون المرور على الصفوف)، ويكتب تقريراً مفصلاً بالمخالفات
+في "validation_report.json":
+
+- رقم هوية غير رقمي أو مكرر أو فارغ (0)
+- درجة غير رقمية أو فارغة أو خارج المدى المسموح (قيمة الغياب عن الاختبار
+  مثل -1 مسموحة إذا حُددت في "absent_value" وتظهر كتنبيه)
+- قيمة سالبة في أعمدة مثل مجموع الغياب
+- مجموع لا يساوي مجموع الدرجات الفرعية
+- طالب موجود في فترة وغير موجود في فترة أخرى
+
+قواعد كل فترة في "periods_manifest.json" تحت المفتاح "validation"، ولكل مخالفة
+درجة خطورة: "error" توقف تحويل الفترة فلا يُكتب ملفها، و"warning" تظهر في
+التقرير فقط
+
+الاستخدام:
+    python sheet_validation.py     # عرض آخر تقرير
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف تقرير المخالفات (محلي فقط)
+VALIDATION_REPORT_FILE = "validation_report.json"
+
+# درجات الخطورة
+ERROR = "error"
+WARNING = "warning"
+
+# المخالفات المعروفة: الاسم ← (الخطورة الافتراضية، الوصف)
+RULES = {
+    "missing_column": (ERROR, "عمود مطلوب غير موجود في الملف"),
+    "invalid_id": (ERROR, "رقم هوية غير رقمي"),
+    "missing_id": (WARNING, "رقم هوية فارغ (0)"),
+    "duplicate_id": (ERROR, "رقم هوية مكرر"),
+    "invalid_score": (ERROR, "درجة غير رقمية"),
+    "missing_score": (WARNING, "درجة فارغة (ستُعتبر 0)"),
+    "out_of_range": (ERROR, "درجة خارج المدى المسموح"),
+    "absent_score": (WARNING, "درجة غياب عن التقييم (مثل -1)"),
+    "negative_value": (ERROR, "قيمة سالبة"),
+    "total_mismatch": (ERROR, "المجموع لا يساوي مجموع الدرجات"),
+    "missing_from_period": (WARNING, "الطالب غير موجود في فترة أخرى"),
+}
+
+# القواعد الافتراضية إذا لم تُحدد في القائمة
+DEFAULT_VALIDATION = {
+    "id_column": "الهوية",
+    "name_column": "الطالب",
+    "total_column": None,
+    "component_columns": [],
+    "score_range": None,
+    "absent_value": None,
+    "non_negative_columns": [],
+    "total_tolerance": 0.01,
+    "severity": {},
+}
+
+# أقصى عدد من المخالفات المفصلة المحفوظة لكل قاعدة (العدد الكلي يُحفظ دائماً)
+MAX_DETAILS_PER_RULE = 100
+
+
+class ValidationError(Exception):
+    """فشل التحقق من ملف فترة بسبب مخالفات من درجة error"""
+
+    def __init__(self, violations):
+        self.violations = violations
+        counts = count_by_rule(v for v in violations if v["severity"] == ERROR)
+        summary = "، ".join(f"{RULES[rule][1]}: {count}" for rule, count in counts.items())
+        super().__init__(f"الملف يحتوي على أخطاء ({summary})")
+
+
+def validation_rules(spec):
+    """قواعد التحقق للفترة بعد دمجها مع القيم الافتراضية"""
+    rules = dict(DEFAULT_VALIDATION)
+    rules.update(spec.get("validation") or {})
+    return rules
+
+
+def count_by_rule(violations):
+    """عدد المخالفات لكل قاعدة"""
+    counts = {}
+    for violation in violations:
+        counts[violation["rule"]] = counts.get(violation["rule"], 0) + 1
+    return counts
+
+
+def student_name(value):
+    """
+    اسم الطالب للتقرير، أو None للخلايا الفارغة وصفوف القالب غير المعبأة
+    (صيغة Excel تعرض 0 بدلاً من الاسم)
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return value.strip()
+
+
+def json_value(value):
+    """تحويل قيمة من DataFrame إلى قيمة تقبلها json"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value if isinstance(value, (int, float, str, bool)) else str(value)
+
+
+class PeriodValidator:
+    """
+    التحقق من ملف فترة واحدة
+
+    يمكن استدعاء check عدة مرات على دفعات متتالية من الملف (القراءة التدفقية)،
+    ويُحفظ بين الدفعات ما يلزم لاكتشاف الهويات المكررة عبر الدفعات
+    """
+
+    def __init__(self, spec):
+        self.rules = validation_rules(spec)
+        self.header = spec.get("header", 0)
+        self.violations = []
+        self.ids = set()
+        self.names = {}
+        self.row_offset = 0
+        self.missing_columns = None
+
+    def severity(self, rule):
+        """درجة خطورة القاعدة (يمكن تغييرها من القائمة)"""
+        return self.rules["severity"].get(rule, RULES[rule][0])
+
+    @property
+    def errors(self):
+        """المخالفات من درجة error"""
+        return [v for v in self.violations if v["severity"] == ERROR]
+
+    def add(self, rule, df, mask, column=None, expected=None):
+        """
+        تسجيل مخالفة لكل صف محدد في mask
+
+        يُبنى السجل المفصل للصفوف المخالفة فقط، فتبقى التكلفة على الملف كاملاً
+        في حساب mask بعمليات الأعمدة
+
+        Args:
+            expected: القيمة المتوقعة (قيمة واحدة، أو مصفوفة بقيمة لكل صف)
+        """
+        positions = np.flatnonzero(np.asarray(mask, dtype=bool))
+        if len(positions) == 0:
+            return
+
+        rules = self.rules
+        ids = df[rules["id_column"]].to_numpy()
+        names = df[rules["name_column"]].to_numpy() if rules["name_column"] in df else None
+        values = df[column].to_numpy() if column else None
+        rows = df.index.to_numpy()
+        per_row = isinstance(expected, np.ndarray)
+
+        for position in positions:
+            self.violations.append({
+                "rule": rule,
+                "severity": self.severity(rule),
+                # رقم الصف كما يظهر في Excel (بعد صف العناوين)
+                "row": int(rows[position]) + self.row_offset + self.header + 2,
+                "id": json_value(ids[position]),
+                "name": student_name(names[position]) if names is not None else None,
+                "column": column,
+                "value": json_value(values[position]) if values is not None else None,
+                "expected": json_value(expected[position]) if per_row else expected,
+            })
+
+    def check_columns(self, df):
+        """
+        التأكد من وجود جميع الأعمدة المذكورة في القواعد (مرة واحدة لكل ملف)
+
+        Returns:
+            bool: True إذا وُجدت جميع الأعمدة
+        """
+        if self.missing_columns is None:
+            rules = self.rules
+            configured = ([rules["id_column"], rules["total_column"]]
+                          + rules["component_columns"] + rules["non_negative_columns"])
+            self.missing_columns = [c for c in configured if c and c not in df.columns]
+            for column in self.missing_columns:
+                self.violations.append({
+                    "rule": "missing_column", "severity": self.severity("missing_column"),
+                    "row": None, "id": None, "name": None, "column": column,
+                    "value": None, "expected": None,
+                })
+        return not self.missing_columns
+
+    def numeric(self, df, column):
+        """العمود كأرقام مع تسجيل القيم غير الرقمية والفارغة"""
+        raw = df[column]
+        values = pd.to_numeric(raw, errors="coerce")
+        self.add("invalid_score", df, values.isna() & raw.notna(), column)
+        self.add("missing_score", df, raw.isna(), column)
+        return values
+
+    def check(self, df):
+        """
+        فحص DataFrame (أو دفعة منه) وإضافة المخالفات
+
+        Args:
+            df (DataFrame): البيانات كما قُرئت من Excel (قبل التنظيف)
+        """
+        rules = self.rules
+        rows = len(df)
+        if not self.check_columns(df):
+            self.row_offset += rows
+            return
+
+        # الصفوف الفارغة (بدون هوية أو اسم) يحذفها التنظيف أصلاً
+        required = [c for c in (rules["id_column"], rules["name_column"]) if c in df.columns]
+        df = df.dropna(subset=required)
+
+        # الهوية
+        ids = pd.to_numeric(df[rules["id_column"]], errors="coerce")
+        self.add("invalid_id", df, ids.isna(), rules["id_column"])
+        self.add("missing_id", df, ids == 0, rules["id_column"])
+
+        valid = ids.notna() & (ids != 0)
+        duplicated = valid & (ids.duplicated(keep=False) | ids.isin(self.ids))
+        self.add("duplicate_id", df, duplicated, rules["id_column"])
+        valid_ids = ids[valid].astype("int64").tolist()
+        self.ids.update(valid_ids)
+        if rules["name_column"] in df.columns:
+            self.names.update(zip(valid_ids, map(student_name, df.loc[valid, rules["name_column"]])))
+
+        # الدرجات الفرعية والمجموع
+        components = [self.numeric(df, column) for column in rules["component_columns"]]
+        absent = rules["absent_value"]
+        for column, values in zip(rules["component_columns"], components):
+            if absent is not None:
+                self.add("absent_score", df, values == absent, column)
+            if rules["score_range"] is not None:
+                low, high = rules["score_range"]
+                outside = (values < low) | (values > high)
+                if absent is not None:
+                    outside &= values != absent
+                self.add("out_of_range", df, outside, column, expected=f"{low} - {high}")
+
+        for column in rules["non_negative_columns"]:
+            values = pd.to_numeric(df[column], errors="coerce")
+            self.add("negative_value", df, values < 0, column, expected=">= 0")
+
+        if rules["total_column"] and components:
+            total = self.numeric(df, rules["total_column"]).fillna(0).to_numpy(dtype=float)
+            expected = np.column_stack([v.fillna(0).to_numpy(dtype=float) for v in components])
+            expected = expected.sum(axis=1)
+            mismatch = np.abs(total - expected) > rules["total_tolerance"]
+            self.add("total_mismatch", df, mismatch, rules["total_column"], expected=expected)
+
+        self.row_offset += rows
+
+    def report(self):
+        """
+        تقرير الفترة: عدد المخالفات لكل قاعدة مع التفاصيل (بحد أقصى لكل قاعدة)
+
+        Returns:
+            dict: errors, warnings, counts, violations
+        """
+        details, kept = [], {}
+        for violation in self.violations:
+            kept[violation["rule"]] = kept.get(violation["rule"], 0) + 1
+            if kept[violation["rule"]] <= MAX_DETAILS_PER_RULE:
+                details.append(violation)
+        return {
+            "errors": len(self.errors),
+            "warnings": len(self.violations) - len(self.errors),
+            "counts": count_by_rule(self.violations),
+            "violations": details,
+        }
+
+
+def validate_dataframe(df, spec):
+    """
+    فحص ملف فترة كامل
+
+    Returns:
+        PeriodValidator: نتيجة الفحص (violations, errors, ids, report())
+
+    Example:
+        >>> spec = {"validation": {"component_columns": ["الاختبار التحريري"],
+        ...                        "score_range": [0, 10], "absent_value": -1}}
+        >>> df = pd.DataFrame({"الهوية": [1153928294, 0],
+        ...                    "الطالب": ["هيثم بن عبدالرحمن بن عبدالعزيز العرفج", 0],
+        ...                    "الاختبار التحريري": [-1, 0]})
+        >>> [(v["rule"], v["severity"], v["name"]) for v in validate_dataframe(df, spec).violations]
+        [('missing_id', 'warning', None), ('absent_score', 'warning', 'هيثم بن عبدالرحمن بن عبدالعزيز العرفج')]
+    """
+    validator = PeriodValidator(spec)
+    validator.check(df)
+    return validator
+
+
+def cross_period_violations(ids_by_period, names=None):
+    """
+    الطلاب الموجودون في فترة وغير موجودين في فترة أخرى
+
+    Args:
+        ids_by_period (dict): اسم الفترة ← مجموعة أرقام الهويات
+        names (dict): رقم الهوية ← الاسم (اختياري للتقرير)
+
+    Returns:
+        list: المخالفات (missing_from_period)
+    """
+    names = names or {}
+    violations = []
+    all_ids = set().union(*ids_by_period.values()) if ids_by_period else set()
+    for period_name, ids in ids_by_period.items():
+        for student_id in sorted(all_ids - ids):
+            violations.append({
+                "rule": "missing_from_period",
+                "severity": RULES["missing_from_period"][0],
+                "row": None,
+                "id": student_id,
+                "name": names.get(student_id),
+                "column": None,
+                "value": None,
+                "expected": period_name,
+            })
+    return violations
+
+
+def load_report(base_dir=None):
+    """قراءة آخر تقرير تحقق"""
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    try:
+        with open(base_dir / VALIDATION_REPORT_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"periods": {}, "cross_period": []}
+
+
+def write_report(period_reports, cross_period, base_dir=None):
+    """
+    حفظ التقرير مع الإبقاء على تقارير الفترات التي لم تُفحص هذه المرة
+
+    Args:
+        period_reports (dict): اسم ملف الفترة الناتج ← تقرير الفترة
+        cross_period (list): مخالفات المقارنة بين الفترات
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    report = load_report(base_dir)
+    report["generated"] = datetime.now().isoformat(timespec="seconds")
+    report["periods"].update(period_reports)
+    report["cross_period"] = cross_period
+    with open(base_dir / VALIDATION_REPORT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def describe(violation):
+    """وصف مخالفة واحدة في سطر"""
+    parts = [RULES[violation["rule"]][1]]
+    if violation["row"] is not None:
+        parts.append(f"السطر {violation['row']}")
+    if violation["name"] is not None:
+        parts.append(f"{violation['name']} ({violation['id']})")
+    elif violation["id"] is not None:
+        parts.append(str(violation["id"]))
+    if violation["column"]:
+        parts.append(f"العمود '{violation['column']}'")
+    if violation["value"] is not None:
+        parts.append(f"القيمة {violation['value']}")
+    if violation["expected"] is not None:
+        parts.append(f"المتوقع {violation['expected']}")
+    return " - ".join(parts)
+
+
+def print_violations(violations, limit=10):
+    """طباعة أول المخالفات (الأخطاء أولاً) مع عدد الباقي"""
+    violations = sorted(violations, key=lambda violation: violation["severity"] != ERROR)
+    for violation in violations[:limit]:
+        icon = "❌" if violation["severity"] == ERROR else "⚠️"
+        print(f"   {icon} {describe(violation)}")
+    if len(violations) > limit:
+        print(f"   ... و{len(violations) - limit} مخالفة أخرى (انظر {VALIDATION_REPORT_FILE})")
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="عرض آخر تقرير للتحقق من ملفات الفترات")
+    parser.add_argument("--limit", type=int, default=20, help="عدد المخالفات المعروضة لكل فترة")
+    args = parser.parse_args(argv)
+
+    report = load_report()
+    if not report["periods"]:
+        print(f"ℹ️ لا يوجد تقرير بعد ({VALIDATION_REPORT_FILE})")
+        return 0
+
+    print("=" * 60)
+    print(f"🧪 تقرير التحقق من ملفات الفترات ({report.get('generated', '-')})")
+    print("=" * 60)
+    for output, period in report["periods"].items():
+        print(f"\n📄 {output}: {period['errors']} خطأ، {period['warnings']} تحذير")
+        print_violations(period["violations"], args.limit)
+    if report["cross_period"]:
+        print(f"\n🔀 المقارنة بين الفترات: {len(report['cross_period'])} تحذير")
+        print_violations(report["cross_period"], args.limit)
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
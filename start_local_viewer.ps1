@@ -13,7 +13,8 @@ if (-not $python) {
 
 Write-Host "تشغيل خادم محلي على http://localhost:$Port ..." -ForegroundColor Cyan
 
-$serverCommand = "Set-Location `"$scriptDir`"; python -m http.server $Port"
+# خادم الموقع مع واجهة الاستعلام والضغط وإعادة التحميل التلقائي (انظر serve_viewer.py)
+$serverCommand = "Set-Location `"$scriptDir`"; python serve_viewer.py --port $Port"
 Start-Process pwsh -ArgumentList "-NoExit", "-Command", $serverCommand
 
 Start-Sleep -Seconds 2
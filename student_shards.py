@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+إنشاء ملفات الطلاب المجزأة (Per-Student Shards)
+يكتب ملفاً صغيراً لكل طالب داخل مجلد "students" يحتوي على درجاته في جميع
+الفترات وملاحظاته السلوكية، واسم الملف بصمة مشتقة من رقم الهوية
+
+بهذا يحتاج ولي الأمر إلى طلب واحد صغير بدلاً من تحميل جميع ملفات البيانات
+
+الاستخدام:
+    python student_shards.py
+"""
+
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+
+from join_records import build_joined_records, student_periods
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# مجلد ملفات الطلاب المجزأة
+SHARDS_DIR_NAME = "students"
+
+# ملف المعلومات الوصفية للمجلد (يستخدمه الموقع لمعرفة توفر الملفات المجزأة)
+SHARDS_META_FILE = "meta.json"
+
+# عدد خانات البصمة المستخدمة في اسم الملف
+SHARD_KEY_LENGTH = 16
+
+# إصدار صيغة الملفات المجزأة
+SHARD_FORMAT_VERSION = 1
+
+
+def normalize_student_id(student_id):
+    """
+    توحيد رقم الهوية كما يكتبه ولي الأمر (يطابق normalizeStudentId في index.html)
+
+    الرقم المكتوب بالأرقام العربية (٠-٩) أو مع مسافات وشرطات أو أصفار في
+    البداية يُحوّل إلى نفس نص الرقم المحفوظ في ملفات الفترات
+
+    Example:
+        >>> normalize_student_id(" 0115-945 6654 ")
+        '1159456654'
+        >>> normalize_student_id("١١٥٩٤٥٦٦٥٤")
+        '1159456654'
+    """
+    text = str(student_id).strip()
+    digits = re.sub(r"[\s\-]", "", text)
+    if digits.isdecimal():
+        return str(int(digits))
+    return text
+
+
+def shard_key(student_id):
+    """
+    حساب مفتاح الملف المجزأ للطالب من رقم الهوية
+
+    يجب أن يطابق ما يحسبه الموقع: أول 16 خانة من SHA-256 لرقم الهوية بعد
+    توحيده (normalize_student_id)
+
+    Args:
+        student_id: رقم الهوية (رقم أو نص)
+
+    Returns:
+        str: المفتاح بصيغة hex
+
+    Example:
+        >>> shard_key(1159456654) == shard_key("1159456654")
+        True
+        >>> shard_key("01159456654") == shard_key(" ١١٥٩٤٥٦٦٥٤ ") == shard_key(1159456654)
+        True
+    """
+    digest = hashlib.sha256(normalize_student_id(student_id).encode('utf-8')).hexdigest()
+    return digest[:SHARD_KEY_LENGTH]
+
+
+def build_shard_documents(records):
+    """
+    تحويل السجلات الموحدة (من مرحلة الربط) إلى مستندات الملفات المجزأة
+
+    Args:
+        records (dict): ناتج build_joined_records
+
+    Returns:
+        dict: رقم الهوية ← مستند الطالب (id, periods, notes)
+    """
+    notes = records["notes"]
+    documents = {}
+    for student in records["students"]:
+        documents[student["id"]] = {
+            "id": student["id"],
+            "periods": student_periods(records, student),
+            "notes": [dict(notes[nid], id=nid) for nid in student["note_ids"]],
+        }
+    return documents
+
+
+def write_if_changed(path, data):
+    """
+    كتابة الملف فقط إذا اختلف محتواه عن الموجود (حتى لا يتغير إلا ما تغير فعلاً)
+
+    Returns:
+        bool: True إذا كُتب الملف
+    """
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    path.write_bytes(data)
+    return True
+
+
+def write_shards(documents, shards_dir):
+    """
+    كتابة ملف لكل طالب تغيرت بياناته وحذف الملفات القديمة لطلاب لم يعودوا موجودين
+
+    الملفات التي لم يتغير محتواها لا يُعاد كتابتها، فيبقى عدد الملفات المعدلة
+    (وحجم النشر) بقدر تعديلات اليوم وليس بقدر عدد الطلاب
+
+    Args:
+        documents (dict): رقم الهوية ← مستند الطالب
+        shards_dir (Path): مجلد الملفات المجزأة
+
+    Returns:
+        dict: عدد الملفات المكتوبة والتي لم تتغير والمحذوفة
+    """
+    shards_dir.mkdir(parents=True, exist_ok=True)
+
+    current = set()
+    written = 0
+    for student_id, document in documents.items():
+        shard_file = shards_dir / f"{shard_key(student_id)}.json"
+        data = json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        written += write_if_changed(shard_file, data)
+        current.add(shard_file.name)
+
+    removed = 0
+    for shard_file in shards_dir.glob("*.json"):
+        if shard_file.name != SHARDS_META_FILE and shard_file.name not in current:
+            shard_file.unlink()
+            removed += 1
+
+    meta = {
+        "version": SHARD_FORMAT_VERSION,
+        "key_length": SHARD_KEY_LENGTH,
+        "students": len(current),
+    }
+    write_if_changed(shards_dir / SHARDS_META_FILE,
+                     json.dumps(meta, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    return {"written": written, "unchanged": len(current) - written, "removed": removed}
+
+
+def build_shards(base_dir=None, records=None):
+    """
+    إنشاء الملفات المجزأة من السجلات الموحدة للطلاب والملاحظات
+
+    Args:
+        base_dir (Path): مجلد المشروع (افتراضي: مجلد السكريبت)
+        records (dict): ناتج build_joined_records (افتراضي: يُبنى من ملفات JSON)
+
+    Returns:
+        dict: إحصائيات الإنشاء (students, written, unchanged, removed)
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+
+    if records is None:
+        records = build_joined_records(base_dir)
+
+    documents = build_shard_documents(records)
+    stats = write_shards(documents, base_dir / SHARDS_DIR_NAME)
+    stats["students"] = len(documents)
+    return stats
+
+
+def main():
+    """الدالة الرئيسية"""
+    print("=" * 60)
+    print("🗂️ إنشاء ملفات الطلاب المجزأة")
+    print("=" * 60)
+    print()
+
+    try:
+        stats = build_shards()
+    except Exception as e:
+        print(f"❌ حدث خطأ أثناء إنشاء الملفات: {str(e)}")
+        return False
+
+    print(f"👥 عدد الطلاب: {stats['students']}")
+    print(f"💾 تم كتابة {stats['written']} ملف في مجلد {SHARDS_DIR_NAME}/")
+    if stats["unchanged"]:
+        print(f"⏭️ {stats['unchanged']} ملف لم يتغير")
+    if stats["removed"]:
+        print(f"🗑️ تم حذف {stats['removed']} ملف قديم")
+    print("✨ تم الإنشاء بنجاح! 🎉")
+    print("=" * 60)
+
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
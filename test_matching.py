@@ -1,55 +1,110 @@
-import json
-import re
-
-# دالة التنظيف من JavaScript
-def normalizeArabicName(name):
-    if not name:
-        return ''
-    
-    name = str(name).strip()
-    # توحيد المسافات المتعددة
-    name = re.sub(r'\s+', ' ', name)
-    # إزالة التشكيل العربي
-    name = re.sub(r'[ًٌٍَُِّْ]', '', name)
-    
-    return name
-
-# قراءة البيانات
-with open('period1.json', 'r', encoding='utf-8') as f:
-    students = json.load(f)
-
-with open('notes.json', 'r', encoding='utf-8') as f:
-    notes = json.load(f)
-
-# البحث عن الطالب
-student_id = 1152684930
-student = next((s for s in students if s['الهوية'] == student_id), None)
-
-if student:
-    print(f"الطالب في ملف الدرجات:")
-    print(f"  الاسم: '{student['الطالب']}'")
-    print(f"  الاسم المنظف: '{normalizeArabicName(student['الطالب'])}'")
-    print()
-    
-    # البحث عن الملاحظات
-    student_name = normalizeArabicName(student['الطالب'])
-    student_notes = [n for n in notes if normalizeArabicName(n['اسم_الطالب']) == student_name]
-    
-    print(f"عدد الملاحظات المطابقة: {len(student_notes)}")
-    print()
-    
-    # فحص أول 3 ملاحظات
-    if student_notes:
-        print("أول 3 ملاحظات:")
-        for i, note in enumerate(student_notes[:3], 1):
-            print(f"  {i}. {note['المشكلة']} - {note['التاريخ']}")
-    
-    # فحص المطابقة
-    print("\n=== فحص المطابقة ===")
-    for note in notes[:5]:
-        note_name = normalizeArabicName(note['اسم_الطالب'])
-        match = note_name == student_name
-        if 'ناصر' in note_name:
-            print(f"ملاحظة: '{note['اسم_الطالب']}'")
-            print(f"  منظف: '{note_name}'")
-            print(f"  مطابق: {match}")
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+تقرير مطابقة الملاحظات بالطلاب (لمراجعة الأسماء قبل النشر)
+يربط جميع الملاحظات دفعة واحدة عبر name_matcher.py ثم يعرض:
+
+- الملاحظات التي لم تطابق أي طالب مع أقرب المرشحين لكل اسم
+- الملاحظات الملتبسة (تطابق أكثر من طالب) مع أسماء الطلاب المطابقين
+- الملاحظات المطابقة تقريبياً مع الاسم الذي رُبطت به ودرجة التشابه
+
+الاستخدام:
+    python test_matching.py
+    python test_matching.py --candidates 5
+"""
+
+import argparse
+import sys
+import time
+
+from join_records import build_joined_records, build_student_documents, load_periods_data
+
+# عدد المرشحين المعروضين لكل اسم غير مطابق
+DEFAULT_CANDIDATES = 3
+
+
+def group_by_name(notes, note_ids):
+    """
+    تجميع الملاحظات حسب (الاسم، الصف) مرتبة حسب عدد الملاحظات
+
+    Returns:
+        list: [((الاسم، الصف)، عدد الملاحظات)]
+    """
+    groups = {}
+    for nid in note_ids:
+        note = notes[nid]
+        key = (note.get("اسم_الطالب"), note.get("الصف"))
+        groups[key] = groups.get(key, 0) + 1
+    return sorted(groups.items(), key=lambda item: -item[1])
+
+
+def print_unmatched(records, matcher, students, limit):
+    """الأسماء غير المطابقة مع أقرب المرشحين"""
+    unmatched = records["report"]["unmatched"]
+    print(f"\n❌ ملاحظات بدون طالب مطابق: {len(unmatched)}")
+    for (name, note_class), count in group_by_name(records["notes"], unmatched):
+        result = matcher.match(name, note_class)
+        status = " (مرشحون متقاربون)" if result["method"] == "ambiguous" else ""
+        print(f"   - {name} (الصف {note_class}): {count} ملاحظة{status}")
+        for student_id, score in matcher.candidates(name, note_class, limit):
+            student = students[student_id]
+            print(f"        ؟ {student['name']} (الصف {student['class']}، "
+                  f"الهوية {student_id}) - {score:.2f}")
+
+
+def print_ambiguous(records, matcher, students):
+    """الأسماء التي تطابق أكثر من طالب"""
+    ambiguous = records["report"]["ambiguous"]
+    print(f"\n⚠️ ملاحظات تطابق أكثر من طالب: {len(ambiguous)}")
+    for (name, note_class), count in group_by_name(records["notes"], ambiguous):
+        print(f"   - {name} (الصف {note_class}): {count} ملاحظة")
+        for student_id in matcher.match(name, note_class)["ids"]:
+            student = students[student_id]
+            print(f"        = {student['name']} (الصف {student['class']}، الهوية {student_id})")
+
+
+def print_fuzzy(records, matcher, students):
+    """الأسماء المطابقة تقريبياً (للتأكد منها)"""
+    fuzzy = records["report"]["fuzzy"]
+    print(f"\n🔎 ملاحظات مطابقة تقريبياً: {len(fuzzy)}")
+    for (name, note_class), count in group_by_name(records["notes"], fuzzy):
+        result = matcher.match(name, note_class)
+        student = students[result["ids"][0]]
+        print(f"   - {name} ← {student['name']} (الصف {student['class']}): "
+              f"{count} ملاحظة - {result['score']:.2f}")
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تقرير مطابقة الملاحظات بالطلاب")
+    parser.add_argument("--candidates", type=int, default=DEFAULT_CANDIDATES,
+                        help="عدد المرشحين المعروضين لكل اسم غير مطابق")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🔗 تقرير مطابقة الملاحظات بالطلاب")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    records = build_joined_records()
+    elapsed = time.perf_counter() - start
+
+    students = {student["id"]: student for student in records["students"]}
+    _, matcher = build_student_documents(load_periods_data())
+    report = records["report"]
+
+    print(f"\n👥 عدد الطلاب: {len(students)}")
+    print(f"📝 عدد الملاحظات: {len(records['notes'])}")
+    print(f"✅ ملاحظات مطابقة: {report['matched']}")
+    print(f"⏱️ زمن الربط: {elapsed * 1000:.1f} ms")
+
+    print_unmatched(records, matcher, students, args.candidates)
+    print_ambiguous(records, matcher, students)
+    print_fuzzy(records, matcher, students)
+    print("=" * 60)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,6 +10,11 @@
 - تنسيق التواريخ بصيغ عربية جميلة
 - دعم أسماء الأيام والشهور بالعربية
 - استخدام خوارزمية تقويم أم القرى الرسمية
+- تحويل أعمدة كاملة من التواريخ دفعة واحدة (hijri_date_parts و format_hijri_dates)
+
+التحويل يعتمد على جدول بدايات الأشهر الهجرية (من بيانات أم القرى في مكتبة
+hijridate) محسوباً مرة واحدة كأرقام أيام ترتيبية، فيكفي بحث ثنائي (bisect)
+لتحويل تاريخ واحد، و numpy.searchsorted لتحويل عمود كامل
 
 الاستخدام:
     from umm_alqura_calendar import format_hijri_date, gregorian_to_hijri
@@ -19,12 +24,16 @@
     
     # تنسيق التاريخ بصيغة عربية جميلة
     formatted = format_hijri_date(hijri_date)
-    # النتيجة: "الأربعاء, 5 جمادى الأولى, 1447"
+    # النتيجة: "الخميس, 15 جمادى الأولى, 1447"
+    
+    # تحويل عمود تواريخ كامل (Series أو مصفوفة datetime64) دفعة واحدة
+    formatted_column = format_hijri_dates(df["التاريخ"])
 """
 
-from hijridate import Hijri, Gregorian
-from datetime import datetime
-import pandas as pd
+from bisect import bisect_right
+from datetime import date, datetime
+
+from hijridate import Hijri, Gregorian, ummalqura
 
 # أسماء الأشهر الهجرية بالعربية
 HIJRI_MONTHS = [
@@ -53,6 +62,82 @@ HIJRI_DAYS = [
     "الأحد"       # 6 - Sunday
 ]
 
+# أنماط التنسيق: النمط ← (إضافة اسم اليوم، إضافة السنة)
+FORMAT_STYLES = {
+    "full": (True, True),
+    "short": (False, True),
+    "no_year": (True, False),
+}
+
+
+# ============================================================================
+# جدول بدايات الأشهر (محرك التحويل)
+# ============================================================================
+
+# الفرق بين رقم اليوم الترتيبي في Python (date.toordinal) ورقم اليوم
+# الجولياني المختصر (RJD) المستخدم في جداول hijridate
+ORDINAL_OFFSET = 2400000 - 1721425
+
+# اليوم الترتيبي لأول يوم في كل شهر هجري مدعوم (مرتبة تصاعدياً)، وآخر عنصر
+# هو اليوم التالي لآخر يوم مدعوم
+MONTH_STARTS = tuple(rjd + ORDINAL_OFFSET for rjd in ummalqura.MONTH_STARTS)
+
+# ترتيب أول شهر في الجدول منذ بداية التقويم الهجري (محرم 1 هـ = 0)
+FIRST_MONTH = ummalqura.HIJRI_OFFSET
+
+# أول وآخر يوم مدعوم (أيام ترتيبية)
+FIRST_ORDINAL = MONTH_STARTS[0]
+LAST_ORDINAL = MONTH_STARTS[-1] - 1
+
+# اليوم الترتيبي لتاريخ 1970-01-01 (بداية عدّ الأيام في datetime64)
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def ordinal_to_hijri(ordinal):
+    """
+    تحويل يوم ترتيبي (date.toordinal) إلى تاريخ هجري بالبحث في جدول بدايات الأشهر
+    
+    Args:
+        ordinal (int): رقم اليوم الترتيبي
+    
+    Returns:
+        tuple: (السنة، الشهر، اليوم)
+    
+    Raises:
+        OverflowError: إذا كان التاريخ خارج نطاق تقويم أم القرى
+    
+    Example:
+        >>> ordinal_to_hijri(date(2025, 11, 6).toordinal())
+        (1447, 5, 15)
+    """
+    if not FIRST_ORDINAL <= ordinal <= LAST_ORDINAL:
+        raise OverflowError("التاريخ خارج نطاق تقويم أم القرى")
+    index = bisect_right(MONTH_STARTS, ordinal) - 1
+    year, month = divmod(index + FIRST_MONTH, 12)
+    return year + 1, month + 1, ordinal - MONTH_STARTS[index] + 1
+
+
+def hijri_to_ordinal(year, month, day):
+    """
+    تحويل تاريخ هجري إلى يوم ترتيبي (date.toordinal)
+    
+    Raises:
+        OverflowError: إذا كان الشهر خارج نطاق تقويم أم القرى
+        ValueError: إذا كان اليوم غير موجود في الشهر
+    """
+    index = (year - 1) * 12 + month - 1 - FIRST_MONTH
+    if not 1 <= month <= 12 or not 0 <= index < len(MONTH_STARTS) - 1:
+        raise OverflowError("التاريخ خارج نطاق تقويم أم القرى")
+    if not 1 <= day <= MONTH_STARTS[index + 1] - MONTH_STARTS[index]:
+        raise ValueError(f"اليوم {day} غير موجود في الشهر {month} من سنة {year}")
+    return MONTH_STARTS[index] + day - 1
+
+
+def weekday_index(ordinal):
+    """رقم اليوم في الأسبوع من اليوم الترتيبي (0=الاثنين، 6=الأحد)"""
+    # اليوم الترتيبي 1 (1/1/1 م) يوم اثنين
+    return (ordinal - 1) % 7
+
 
 def gregorian_to_hijri(year, month, day):
     """
@@ -69,10 +154,9 @@ def gregorian_to_hijri(year, month, day):
     Example:
         >>> hijri = gregorian_to_hijri(2025, 11, 6)
         >>> print(f"{hijri.day}/{hijri.month}/{hijri.year}")
-        5/5/1447
+        15/5/1447
     """
-    gregorian = Gregorian(year, month, day)
-    return gregorian.to_hijri()
+    return Hijri(*ordinal_to_hijri(date(year, month, day).toordinal()), validate=False)
 
 
 def hijri_to_gregorian(year, month, day):
@@ -88,12 +172,11 @@ def hijri_to_gregorian(year, month, day):
         Gregorian: كائن التاريخ الميلادي
     
     Example:
-        >>> gregorian = hijri_to_gregorian(1447, 5, 5)
+        >>> gregorian = hijri_to_gregorian(1447, 5, 15)
         >>> print(f"{gregorian.day}/{gregorian.month}/{gregorian.year}")
         6/11/2025
     """
-    hijri = Hijri(year, month, day)
-    return hijri.to_gregorian()
+    return Gregorian.fromordinal(hijri_to_ordinal(year, month, day))
 
 
 def get_day_name(date_obj):
@@ -108,21 +191,15 @@ def get_day_name(date_obj):
     
     Example:
         >>> from datetime import datetime
-        >>> date = datetime(2025, 11, 6)
-        >>> print(get_day_name(date))
-        الأربعاء
+        >>> print(get_day_name(datetime(2025, 11, 6)))
+        الخميس
     """
-    if isinstance(date_obj, (Hijri, Gregorian)):
-        # تحويل إلى datetime للحصول على اسم اليوم
-        if isinstance(date_obj, Hijri):
-            greg = date_obj.to_gregorian()
-            date_obj = datetime(greg.year, greg.month, greg.day)
-        else:
-            date_obj = datetime(date_obj.year, date_obj.month, date_obj.day)
+    # التاريخ الهجري: اليوم الترتيبي من جدول بدايات الأشهر (بدون تحويله إلى ميلادي)
+    if isinstance(date_obj, Hijri):
+        return HIJRI_DAYS[weekday_index(hijri_to_ordinal(date_obj.year, date_obj.month, date_obj.day))]
     
     # الحصول على رقم اليوم (0=Monday, 6=Sunday)
-    day_index = date_obj.weekday()
-    return HIJRI_DAYS[day_index]
+    return HIJRI_DAYS[date_obj.weekday()]
 
 
 def get_month_name(month_number):
@@ -159,13 +236,13 @@ def format_hijri_date(hijri_date, include_day_name=True, include_year=True):
     Examples:
         >>> hijri = gregorian_to_hijri(2025, 11, 6)
         >>> print(format_hijri_date(hijri))
-        الأربعاء, 5 جمادى الأولى, 1447
+        الخميس, 15 جمادى الأولى, 1447
         
         >>> print(format_hijri_date(hijri, include_day_name=False))
-        5 جمادى الأولى, 1447
+        15 جمادى الأولى, 1447
         
         >>> print(format_hijri_date(hijri, include_year=False))
-        الأربعاء, 5 جمادى الأولى
+        الخميس, 15 جمادى الأولى
     """
     parts = []
     
@@ -206,18 +283,20 @@ def convert_excel_date_to_hijri(excel_date, format_style="full"):
         >>> from datetime import datetime
         >>> date = datetime(2025, 11, 6)
         >>> print(convert_excel_date_to_hijri(date))
-        الأربعاء, 5 جمادى الأولى, 1447
+        الخميس, 15 جمادى الأولى, 1447
         
         >>> print(convert_excel_date_to_hijri(date, format_style="short"))
-        5 جمادى الأولى, 1447
+        15 جمادى الأولى, 1447
     """
     try:
-        # التعامل مع القيم الفارغة
-        if pd.isna(excel_date):
+        # التعامل مع القيم الفارغة (None و NaN و NaT، والأخيرتان لا تساويان نفسيهما)
+        if excel_date is None or excel_date != excel_date:
             return ""
         
         # تحويل إلى datetime إذا لم يكن كذلك
+        # (استيراد pandas هنا فقط حتى لا يتأخر تشغيل السكريبتات الخفيفة مثل save_update_date)
         if not isinstance(excel_date, datetime):
+            import pandas as pd
             excel_date = pd.to_datetime(excel_date, errors='coerce')
             if pd.isna(excel_date):
                 return ""
@@ -226,12 +305,8 @@ def convert_excel_date_to_hijri(excel_date, format_style="full"):
         hijri = gregorian_to_hijri(excel_date.year, excel_date.month, excel_date.day)
         
         # تنسيق حسب النمط المطلوب
-        if format_style == "short":
-            return format_hijri_date(hijri, include_day_name=False, include_year=True)
-        elif format_style == "no_year":
-            return format_hijri_date(hijri, include_day_name=True, include_year=False)
-        else:  # full
-            return format_hijri_date(hijri, include_day_name=True, include_year=True)
+        include_day_name, include_year = FORMAT_STYLES.get(format_style, FORMAT_STYLES["full"])
+        return format_hijri_date(hijri, include_day_name=include_day_name, include_year=include_year)
     
     except Exception as e:
         # في حالة أي خطأ، إرجاع سترينغ فارغ
@@ -239,6 +314,107 @@ def convert_excel_date_to_hijri(excel_date, format_style="full"):
         return ""
 
 
+# ============================================================================
+# التحويل دفعة واحدة (أعمدة كاملة)
+# ============================================================================
+
+def hijri_date_parts(dates):
+    """
+    تحويل عمود كامل من التواريخ الميلادية إلى أجزاء التاريخ الهجري دفعة واحدة
+    
+    بحث واحد (numpy.searchsorted) في جدول بدايات الأشهر لجميع التواريخ بدلاً
+    من تحويل كل تاريخ على حدة
+    
+    Args:
+        dates: Series أو مصفوفة أو قائمة تواريخ (datetime64 أو نصوص أو datetime)
+    
+    Returns:
+        DataFrame: الأعمدة year و month و day و weekday (0=الاثنين) من النوع Int64،
+                   وقيمة فارغة (NA) للتاريخ غير الصالح أو خارج نطاق التقويم.
+                   الفهرس هو فهرس الـ Series المدخلة إن وجد
+    
+    Example:
+        >>> import pandas as pd
+        >>> hijri_date_parts(pd.Series(["2025-11-06", None]))
+           year  month   day  weekday
+        0  1447      5    15        3
+        1  <NA>   <NA>  <NA>     <NA>
+    """
+    import numpy as np
+    import pandas as pd
+    
+    index = dates.index if isinstance(dates, pd.Series) else None
+    values = pd.to_datetime(pd.Series(dates, index=index), errors='coerce')
+    
+    # عدد الأيام منذ 1970-01-01 ثم اليوم الترتيبي (القيم الفارغة تُستبعد بالقناع)
+    days = values.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    valid = ~np.isnat(days)
+    ordinals = np.where(valid, days.astype(np.int64), 0) + EPOCH_ORDINAL
+    valid &= (ordinals >= FIRST_ORDINAL) & (ordinals <= LAST_ORDINAL)
+    
+    starts = np.asarray(MONTH_STARTS, dtype=np.int64)
+    month_index = np.clip(np.searchsorted(starts, ordinals, side="right") - 1, 0, len(starts) - 2)
+    years, months = np.divmod(month_index + FIRST_MONTH, 12)
+    
+    parts = {
+        "year": years + 1,
+        "month": months + 1,
+        "day": ordinals - starts[month_index] + 1,
+        "weekday": (ordinals - 1) % 7,
+    }
+    return pd.DataFrame(
+        {name: pd.arrays.IntegerArray(np.where(valid, column, 0), mask=~valid)
+         for name, column in parts.items()},
+        index=values.index,
+    )
+
+
+def format_hijri_dates(dates, format_style="full"):
+    """
+    تحويل عمود كامل من التواريخ الميلادية إلى تواريخ هجرية منسقة دفعة واحدة
+    
+    نفس نتيجة convert_excel_date_to_hijri لكل تاريخ، لكن بعملية واحدة على العمود
+    
+    Args:
+        dates: Series أو مصفوفة أو قائمة تواريخ (datetime64 أو نصوص أو datetime)
+        format_style (str): نمط التنسيق ("full" أو "short" أو "no_year")
+    
+    Returns:
+        Series: التواريخ المنسقة، وسترينغ فارغ للتاريخ غير الصالح
+    
+    Example:
+        >>> import pandas as pd
+        >>> format_hijri_dates(pd.Series(["2025-11-06"]), format_style="short").tolist()
+        ['15 جمادى الأولى, 1447']
+    """
+    import numpy as np
+    import pandas as pd
+    
+    # كل يوم مختلف يُنسق مرة واحدة (يتكرر نفس اليوم عادة في عشرات الصفوف)
+    index = dates.index if isinstance(dates, pd.Series) else None
+    days = pd.to_datetime(pd.Series(dates, index=index), errors='coerce').dt.normalize()
+    codes, unique_days = pd.factorize(days)
+    
+    parts = hijri_date_parts(unique_days)
+    valid = parts["year"].notna().to_numpy()
+    include_day_name, include_year = FORMAT_STYLES.get(format_style, FORMAT_STYLES["full"])
+    
+    def column(name):
+        return parts[name].fillna(1).to_numpy(dtype=np.int64)
+    
+    # دمج الأجزاء كمصفوفات نصية (كل عملية على العمود كاملاً)
+    text = column("day").astype(str).astype(object) + " " + \
+        np.asarray(HIJRI_MONTHS, dtype=object)[column("month") - 1]
+    if include_day_name:
+        text = np.asarray(HIJRI_DAYS, dtype=object)[column("weekday")] + ", " + text
+    if include_year:
+        text = text + ", " + column("year").astype(str).astype(object)
+    
+    # التواريخ الفارغة رقمها -1 في factorize فتأخذ آخر عنصر (سترينغ فارغ)
+    formatted = np.append(np.where(valid, text, ""), "").astype(object)
+    return pd.Series(formatted[codes], index=days.index, dtype=object)
+
+
 def format_hijri_date_simple(hijri_date):
     """
     تنسيق التاريخ الهجري بصيغة رقمية بسيطة (DD/MM/YYYY)
@@ -252,11 +428,58 @@ def format_hijri_date_simple(hijri_date):
     Example:
         >>> hijri = gregorian_to_hijri(2025, 11, 6)
         >>> print(format_hijri_date_simple(hijri))
-        5/5/1447
+        15/5/1447
     """
     return f"{hijri_date.day}/{hijri_date.month}/{hijri_date.year}"
 
 
+def parse_hijri_date(text):
+    """
+    قراءة تاريخ هجري منسق بـ format_hijri_date (عكس التنسيق)
+    
+    Args:
+        text (str): التاريخ المنسق (مع اسم اليوم أو بدونه، ويجب أن يحتوي على السنة)
+    
+    Returns:
+        tuple: (السنة، الشهر، اليوم)، أو None إذا لم يمكن قراءة التاريخ
+    
+    Example:
+        >>> parse_hijri_date("الأربعاء, 5 جمادى الأولى, 1447")
+        (1447, 5, 5)
+    """
+    if not text:
+        return None
+    
+    parts = [part.strip() for part in str(text).split(",")]
+    if len(parts) < 2 or not parts[-1].isdigit():
+        return None
+    
+    day, _, month_name = parts[-2].partition(" ")
+    if not day.isdigit() or month_name not in HIJRI_MONTHS:
+        return None
+    
+    return int(parts[-1]), HIJRI_MONTHS.index(month_name) + 1, int(day)
+
+
+def calendar_settings():
+    """
+    إعدادات التقويم التي تؤثر على التواريخ الهجرية الناتجة
+    
+    تُستخدم ضمن بصمة البناء التزايدي حتى يُعاد تحويل الملفات
+    عند تحديث مكتبة hijridate (وبالتالي جداول أم القرى)
+    
+    Returns:
+        dict: اسم التقويم وإصدار مكتبة hijridate
+    """
+    try:
+        from importlib.metadata import version
+        library_version = version("hijridate")
+    except Exception:
+        library_version = None
+    
+    return {"calendar": "umm_al_qura", "hijridate": library_version}
+
+
 # ============================================================================
 # دوال مساعدة للاختبار
 # ============================================================================
@@ -285,9 +508,9 @@ def test_library():
         datetime(2025, 12, 31),
     ]
     
-    for date in excel_dates:
-        formatted = convert_excel_date_to_hijri(date)
-        print(f"   {date.strftime('%Y-%m-%d')} → {formatted}")
+    for excel_date in excel_dates:
+        formatted = convert_excel_date_to_hijri(excel_date)
+        print(f"   {excel_date.strftime('%Y-%m-%d')} → {formatted}")
     print()
     
     # اختبار أنماط التنسيق المختلفة
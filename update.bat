@@ -29,7 +29,8 @@ REM تشغيل السكريبت
 echo [*] تشغيل سكريبت التحويل...
 echo.
 
-python convert_excel_to_json.py
+REM تحويل الفترة الأولى ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس البحث (في عملية واحدة)
+python update_pipeline.py --steps periods,join,shards,summary,search_index,analytics,timestamp --period 1
 
 echo.
 if %errorlevel% equ 0 (
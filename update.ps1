@@ -35,7 +35,8 @@ Write-Host ""
 Write-Host "🚀 تشغيل سكريبت التحويل..." -ForegroundColor Cyan
 Write-Host ""
 
-python convert_excel_to_json.py
+# تحويل الفترة الأولى ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس البحث (في عملية واحدة)
+python update_pipeline.py --steps periods,join,shards,summary,search_index,analytics,timestamp --period 1
 
 Write-Host ""
 
@@ -31,97 +31,28 @@ echo.
 echo =====================================================================
 echo.
 
-set successCount=0
-set failCount=0
-
-REM =====================================================
-REM الخطوة 1: تحويل الفترة الأولى
-REM =====================================================
-echo 📊 [1/3] تحويل بيانات الفترة الأولى...
-echo.
-
-python convert_excel_to_json.py
-
-if errorlevel 1 (
-    echo ❌ فشل تحويل الفترة الأولى
-    set /a failCount+=1
-) else (
-    echo ✅ نجح تحويل الفترة الأولى
-    set /a successCount+=1
-)
-
-echo.
-echo =====================================================================
-echo.
-
-REM =====================================================
-REM الخطوة 2: تحويل الفترة الثانية
-REM =====================================================
-echo 📊 [2/3] تحويل بيانات الفترة الثانية...
-echo.
-
-python convert_excel_to_json_period2.py
-
-if errorlevel 1 (
-    echo ❌ فشل تحويل الفترة الثانية
-    set /a failCount+=1
-) else (
-    echo ✅ نجح تحويل الفترة الثانية
-    set /a successCount+=1
-)
-
-echo.
-echo =====================================================================
-echo.
-
 REM =====================================================
-REM الخطوة 3: تحويل الملاحظات
+REM الخطوة 1-3: جميع مراحل التحديث في عملية Python واحدة
+REM (الفترات والملاحظات بالتوازي، ثم الربط وملفات الطلاب والإحصائيات وفهرس البحث
+REM  وتاريخ التحديث - انظر update_pipeline.py)
 REM =====================================================
-echo 📋 [3/3] تحويل الملاحظات السلوكية...
+echo 📊 [1-3/4] تحويل جميع البيانات وتحديث الملفات المعتمدة عليها...
 echo.
 
-python convert_notes_to_json.py
+python update_pipeline.py
 
 if errorlevel 1 (
-    echo ❌ فشل تحويل الملاحظات
-    set /a failCount+=1
-) else (
-    echo ✅ نجح تحويل الملاحظات
-    set /a successCount+=1
-)
-
-echo.
-echo =====================================================================
-echo.
-
-REM =====================================================
-REM عرض النتائج
-REM =====================================================
-echo 📈 النتائج:
-echo    ✅ نجح: %successCount%
-echo    ❌ فشل: %failCount%
-echo.
-
-if %failCount% gtr 0 (
-    echo ⚠️  فشل تحويل %failCount% من الملفات!
+    echo.
+    echo ⚠️  فشلت مرحلة واحدة أو أكثر من مراحل التحديث!
     echo 💡 تحقق من:
     echo    - وجود ملفات Excel في المجلد
+    echo    - أخطاء التحقق في ملفات الدرجات: python sheet_validation.py
     echo    - تثبيت المكتبات: pip install -r requirements.txt
     echo.
     pause
     exit /b 1
 )
 
-REM =====================================================
-REM الخطوة 3.5: حفظ تاريخ التحديث
-REM =====================================================
-echo 📅 حفظ تاريخ التحديث...
-python save_update_date.py
-if errorlevel 1 (
-    echo ⚠️  تحذير: فشل حفظ تاريخ التحديث
-) else (
-    echo ✅ تم حفظ تاريخ التحديث
-)
 echo.
 echo =====================================================================
 echo.
@@ -132,8 +63,8 @@ REM =====================================================
 echo 📤 [4/4] رفع التحديثات إلى GitHub...
 echo.
 
-REM إضافة جميع الملفات المحدثة
-git add period1.json period2.json notes.json last_update.json
+REM إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
+for /f "usebackq delims=" %%P in (`python publish_delta.py --paths`) do git add -- "%%P"
 
 REM التحقق من وجود تغييرات
 git diff-index --quiet HEAD --
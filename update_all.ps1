@@ -36,102 +36,28 @@ Write-Host "=" -NoNewline -ForegroundColor Cyan
 Write-Host ("=" * 68) -ForegroundColor Cyan
 Write-Host ""
 
-$hasChanges = $false
-$successCount = 0
-$failCount = 0
-
-# =====================================================
-# الخطوة 1: تحويل الفترة الأولى
-# =====================================================
-Write-Host "📊 [1/3] تحويل بيانات الفترة الأولى..." -ForegroundColor Cyan
-Write-Host ""
-
-python convert_excel_to_json.py
-
-if ($LASTEXITCODE -eq 0) {
-    Write-Host "✅ نجح تحويل الفترة الأولى" -ForegroundColor Green
-    $successCount++
-    $hasChanges = $true
-} else {
-    Write-Host "❌ فشل تحويل الفترة الأولى" -ForegroundColor Red
-    $failCount++
-}
-
-Write-Host ""
-Write-Host "=" -NoNewline -ForegroundColor Cyan
-Write-Host ("=" * 68) -ForegroundColor Cyan
-Write-Host ""
-
-# =====================================================
-# الخطوة 2: تحويل الفترة الثانية
-# =====================================================
-Write-Host "📊 [2/3] تحويل بيانات الفترة الثانية..." -ForegroundColor Cyan
-Write-Host ""
-
-python convert_excel_to_json_period2.py
-
-if ($LASTEXITCODE -eq 0) {
-    Write-Host "✅ نجح تحويل الفترة الثانية" -ForegroundColor Green
-    $successCount++
-} else {
-    Write-Host "❌ فشل تحويل الفترة الثانية" -ForegroundColor Red
-    $failCount++
-}
-
-Write-Host ""
-Write-Host "=" -NoNewline -ForegroundColor Cyan
-Write-Host ("=" * 68) -ForegroundColor Cyan
-Write-Host ""
-
 # =====================================================
-# الخطوة 3: تحويل الملاحظات
+# الخطوة 1-3: جميع مراحل التحديث في عملية Python واحدة
+# (الفترات والملاحظات بالتوازي، ثم الربط وملفات الطلاب والإحصائيات وفهرس البحث
+#  وتاريخ التحديث - انظر update_pipeline.py)
 # =====================================================
-Write-Host "📋 [3/3] تحويل الملاحظات السلوكية..." -ForegroundColor Cyan
+Write-Host "📊 [1-3/4] تحويل جميع البيانات وتحديث الملفات المعتمدة عليها..." -ForegroundColor Cyan
 Write-Host ""
 
-python convert_notes_to_json.py
-
-if ($LASTEXITCODE -eq 0) {
-    Write-Host "✅ نجح تحويل الملاحظات" -ForegroundColor Green
-    $successCount++
-} else {
-    Write-Host "❌ فشل تحويل الملاحظات" -ForegroundColor Red
-    $failCount++
-}
-
-Write-Host ""
-Write-Host "=" -NoNewline -ForegroundColor Cyan
-Write-Host ("=" * 68) -ForegroundColor Cyan
-Write-Host ""
+python update_pipeline.py
 
-# =====================================================
-# عرض النتائج
-# =====================================================
-Write-Host "📈 النتائج:" -ForegroundColor Cyan
-Write-Host "   ✅ نجح: $successCount" -ForegroundColor Green
-Write-Host "   ❌ فشل: $failCount" -ForegroundColor Red
-Write-Host ""
-
-if ($failCount -gt 0) {
-    Write-Host "⚠️  فشل تحويل $failCount من الملفات!" -ForegroundColor Yellow
+if ($LASTEXITCODE -ne 0) {
+    Write-Host ""
+    Write-Host "⚠️  فشلت مرحلة واحدة أو أكثر من مراحل التحديث!" -ForegroundColor Yellow
     Write-Host "💡 تحقق من:" -ForegroundColor Yellow
     Write-Host "   - وجود ملفات Excel في المجلد" -ForegroundColor Yellow
+    Write-Host "   - أخطاء التحقق في ملفات الدرجات: python sheet_validation.py" -ForegroundColor Yellow
     Write-Host "   - تثبيت المكتبات: pip install -r requirements.txt" -ForegroundColor Yellow
     Write-Host ""
     Read-Host "اضغط Enter للخروج"
     exit 1
 }
 
-# =====================================================
-# الخطوة 3.5: حفظ تاريخ التحديث
-# =====================================================
-Write-Host "📅 حفظ تاريخ التحديث..." -ForegroundColor Cyan
-python save_update_date.py
-if ($LASTEXITCODE -eq 0) {
-    Write-Host "✅ تم حفظ تاريخ التحديث" -ForegroundColor Green
-} else {
-    Write-Host "⚠️  تحذير: فشل حفظ تاريخ التحديث" -ForegroundColor Yellow
-}
 Write-Host ""
 Write-Host "=" -NoNewline -ForegroundColor Cyan
 Write-Host ("=" * 68) -ForegroundColor Cyan
@@ -143,8 +69,11 @@ Write-Host ""
 Write-Host "📤 [4/4] رفع التحديثات إلى GitHub..." -ForegroundColor Cyan
 Write-Host ""
 
-# إضافة جميع الملفات المحدثة
-git add period1.json period2.json notes.json last_update.json
+# إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
+$changedPaths = python publish_delta.py --paths
+if ($changedPaths) {
+    git add -- $changedPaths
+}
 
 # التحقق من وجود تغييرات
 $status = git status --porcelain
@@ -14,7 +14,8 @@ REM الخطوة 1: تحويل Excel إلى JSON
 echo 🔄 الخطوة 1: تحويل ملف الملاحظات...
 echo.
 
-python convert_notes_to_json.py
+REM تحويل الملاحظات ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس التواريخ (في عملية واحدة)
+python update_pipeline.py --steps notes,join,shards,summary,notes_index,timestamp
 
 if errorlevel 1 (
     echo.
@@ -34,8 +35,8 @@ REM الخطوة 2: رفع التحديثات إلى GitHub
 echo 📤 الخطوة 2: رفع التحديثات إلى GitHub...
 echo.
 
-REM إضافة الملف الجديد
-git add notes.json
+REM إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
+for /f "usebackq delims=" %%P in (`python publish_delta.py --paths`) do git add -- "%%P"
 
 REM التحقق من وجود تغييرات
 git diff-index --quiet HEAD --
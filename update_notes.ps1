@@ -14,7 +14,8 @@ Write-Host ""
 Write-Host "🔄 الخطوة 1: تحويل ملف الملاحظات..." -ForegroundColor Cyan
 Write-Host ""
 
-python convert_notes_to_json.py
+# تحويل الملاحظات ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس التواريخ (في عملية واحدة)
+python update_pipeline.py --steps notes,join,shards,summary,notes_index,timestamp
 
 if ($LASTEXITCODE -ne 0) {
     Write-Host ""
@@ -35,8 +36,11 @@ Write-Host ("=" * 68) -ForegroundColor Green
 Write-Host "📤 الخطوة 2: رفع التحديثات إلى GitHub..." -ForegroundColor Cyan
 Write-Host ""
 
-# إضافة الملف الجديد
-git add notes.json
+# إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
+$changedPaths = python publish_delta.py --paths
+if ($changedPaths) {
+    git add -- $changedPaths
+}
 
 # التحقق من وجود تغييرات
 $status = git status --porcelain
@@ -4,14 +4,15 @@ echo 🔄 تحديث بيانات الفترة الثانية...
 echo ==================================================
 
 echo 📊 تحويل ملف Excel إلى JSON...
-python convert_excel_to_json_period2.py
+REM تحويل الفترة الثانية ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس البحث (في عملية واحدة)
+python update_pipeline.py --steps periods,join,shards,summary,search_index,analytics,timestamp --period 2
 
 if %errorlevel% equ 0 (
     echo ✅ تم التحويل بنجاح!
     
     echo 📤 رفع التحديثات إلى GitHub...
-    git add period2.json
-    git add "‏‏الفترة 2.xlsx"
+    REM إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
+    for /f "usebackq delims=" %%P in (`python publish_delta.py --paths`) do git add -- "%%P"
     
     for /f "tokens=1-3 delims=/" %%a in ("%date%") do set mydate=%%c-%%a-%%b
     for /f "tokens=1-2 delims=:" %%a in ("%time%") do set mytime=%%a:%%b
@@ -6,15 +6,18 @@ Write-Host "=" * 50
 
 # تحويل Excel إلى JSON
 Write-Host "📊 تحويل ملف Excel إلى JSON..."
-python convert_excel_to_json_period2.py
+# تحويل الفترة الثانية ثم تحديث ملفات الطلاب المجزأة وإحصائيات الملاحظات وفهرس البحث (في عملية واحدة)
+python update_pipeline.py --steps periods,join,shards,summary,search_index,analytics,timestamp --period 2
 
 if ($LASTEXITCODE -eq 0) {
     Write-Host "✅ تم التحويل بنجاح!" -ForegroundColor Green
     
-    # إضافة الملفات المحدثة إلى Git
+    # إضافة الملفات التي تغيرت فقط منذ آخر نشر (حسب سجل التغييرات)
     Write-Host "📤 رفع التحديثات إلى GitHub..."
-    git add period2.json
-    git add "‏‏الفترة 2.xlsx"
+    $changedPaths = python publish_delta.py --paths
+    if ($changedPaths) {
+        git add -- $changedPaths
+    }
     
     # إنشاء commit
     $timestamp = Get-Date -Format "yyyy-MM-dd HH:mm"
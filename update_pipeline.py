@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+التحديث الشامل في عملية واحدة (Update Pipeline)
+يشغّل جميع مراحل التحديث داخل مفسر Python واحد بدلاً من تشغيل عملية منفصلة لكل
+سكريبت (كل عملية تدفع زمن استيراد pandas من جديد)، والمراحل المستقلة تعمل بالتوازي:
+
+    periods ──┬──────────────> search_index ──┐
+              ├──────────────> analytics ─────┤
+              └─> join ──┬──> shards ─────────┤
+    notes ───┬───┘       └──> summary ────────┼──> timestamp
+             └───────────────> notes_index ───┘
+
+كل مرحلة تستورد مكتباتها عند تشغيلها فقط، فالأوامر الخفيفة مثل تحديث تاريخ
+التحديث (--steps timestamp) تبدأ دون تحميل pandas. مخرجات كل مرحلة تُعرض
+مجمّعة عند انتهائها حتى لا تتداخل مخرجات المراحل المتوازية
+
+الاستخدام:
+    python update_pipeline.py
+    python update_pipeline.py --steps join,shards,summary,search_index
+    python update_pipeline.py --steps timestamp
+    python update_pipeline.py --steps periods,join,shards,summary,search_index,analytics,timestamp --period 2
+    python update_pipeline.py --force --allow-invalid
+"""
+
+import argparse
+import io
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from excel_readers import BACKENDS
+from run_report import add_stages, record_run, stage, take_stages
+
+
+def step_periods(context):
+    """
+    تحويل الفترات (جميعها، أو المحددة في options.periods)
+
+    الفترات تُحوّل بالتوازي في مجموعة عمليات تُنشأ بـ spawn (converter_engine)،
+    فلا تتأثر بالخيوط التي تشغّل المراحل الأخرى في هذه العملية
+    """
+    from converter_engine import run
+
+    options = context["options"]
+    return run(getattr(options, "periods", None), force=options.force,
+               reader=options.reader, allow_invalid=options.allow_invalid)
+
+
+def step_notes(context):
+    """تحويل ملف الملاحظات"""
+    from convert_notes_to_json import convert_excel_to_json
+
+    options = context["options"]
+    return convert_excel_to_json(force=options.force, reader=options.reader)
+
+
+def step_join(context):
+    """ربط الملاحظات بالطلاب مرة واحدة للمراحل التالية"""
+    from join_records import RECORDS_FILE, build_joined_records, print_report, write_joined_records
+
+    records = build_joined_records()
+    write_joined_records(records)
+    context["records"] = records
+    print_report(records)
+    print(f"💾 تم حفظ الملف: {RECORDS_FILE}")
+    return True
+
+
+def step_shards(context):
+    """ملفات الطلاب المجزأة"""
+    from student_shards import SHARDS_DIR_NAME, build_shards
+
+    stats = build_shards(records=context.get("records"))
+    print(f"💾 تم كتابة {stats['written']} ملف في مجلد {SHARDS_DIR_NAME}/ "
+          f"(لم يتغير {stats['unchanged']}، حُذف {stats['removed']})")
+    return True
+
+
+def step_summary(context):
+    """إحصائيات الملاحظات لصفحة الوكيل"""
+    from notes_summary import SUMMARY_FILE, write_summary
+
+    summary = write_summary(records=context.get("records"), force=context["options"].force)
+    if summary is None:
+        print(f"⏭️ لم تتغير ملفات البيانات، الملف {SUMMARY_FILE} محدث")
+    else:
+        print(f"💾 تم حفظ الملف: {SUMMARY_FILE} ({summary['totals']['notes']} ملاحظة)")
+    return True
+
+
+def step_search_index(context):
+    """فهرس البحث لصفحة الوكيل"""
+    from search_index import SEARCH_INDEX_FILE, write_search_index
+
+    index = write_search_index(force=context["options"].force)
+    if index is None:
+        print(f"⏭️ لم تتغير ملفات الفترات، الملف {SEARCH_INDEX_FILE} محدث")
+    else:
+        print(f"💾 تم حفظ الملف: {SEARCH_INDEX_FILE} ({len(index['students'])} طالب)")
+    return True
+
+
+def step_analytics(context):
+    """تحليلات الدرجات والغياب عبر الفترات"""
+    from period_analytics import ANALYTICS_FILE, write_analytics
+
+    analytics = write_analytics(force=context["options"].force)
+    if analytics is None:
+        print(f"⏭️ لم تتغير ملفات الفترات، الملف {ANALYTICS_FILE} محدث")
+    else:
+        flagged = sum(1 for flags in analytics["at_risk"] if flags)
+        print(f"💾 تم حفظ الملف: {ANALYTICS_FILE} ({len(analytics['students'])} طالب، "
+              f"{flagged} يحتاج متابعة)")
+    return True
+
+
+def step_notes_index(context):
+    """فهرس الملاحظات حسب التاريخ"""
+    from notes_date_index import NOTES_DATE_INDEX_FILE, write_date_index
+
+    index = write_date_index(force=context["options"].force)
+    if index is None:
+        print(f"⏭️ لم يتغير ملف الملاحظات، الملف {NOTES_DATE_INDEX_FILE} محدث")
+    else:
+        print(f"💾 تم حفظ الملف: {NOTES_DATE_INDEX_FILE} ({len(index['days'])} يوم)")
+    return True
+
+
+def step_timestamp(context):
+    """حفظ تاريخ التحديث في last_update.json"""
+    from save_update_date import save_update_date
+
+    save_update_date()
+    return True
+
+
+# المراحل بترتيب التشغيل: الاسم ← (المراحل التي تعتمد عليها، الدالة، الوصف)
+STEPS = {
+    "periods": ((), step_periods, "📊 تحويل الفترات"),
+    "notes": ((), step_notes, "📋 تحويل الملاحظات"),
+    "join": (("periods", "notes"), step_join, "🔗 ربط الملاحظات بالطلاب"),
+    "shards": (("join",), step_shards, "🗂️ ملفات الطلاب المجزأة"),
+    "summary": (("join",), step_summary, "📊 إحصائيات الملاحظات"),
+    "search_index": (("periods",), step_search_index, "🔎 فهرس البحث"),
+    "analytics": (("periods",), step_analytics, "📈 تحليلات الفترات"),
+    "notes_index": (("notes",), step_notes_index, "🗓️ فهرس الملاحظات حسب التاريخ"),
+    "timestamp": (("shards", "summary", "search_index", "analytics", "notes_index"),
+                  step_timestamp, "📅 تاريخ التحديث"),
+}
+
+
+def with_dependents(names):
+    """
+    المراحل المطلوبة مع جميع المراحل التي تعتمد عليها (مباشرة أو بشكل غير مباشر)
+
+    Example:
+        >>> with_dependents(["notes"])
+        ['notes', 'join', 'shards', 'summary', 'notes_index', 'timestamp']
+    """
+    selected = set(names)
+    # STEPS مرتبة بحيث تأتي كل مرحلة بعد المراحل التي تعتمد عليها
+    for name, (dependencies, _, _) in STEPS.items():
+        if selected.intersection(dependencies):
+            selected.add(name)
+    return [name for name in STEPS if name in selected]
+
+
+class StepOutput(io.TextIOBase):
+    """
+    بديل لـ sys.stdout يجمع مخرجات كل مرحلة (حسب الخيط الذي يشغّلها) لعرضها
+    دفعة واحدة، ويمرر المخرجات الأخرى مباشرة
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffers = {}
+
+    @property
+    def encoding(self):
+        return getattr(self.stream, "encoding", "utf-8")
+
+    def capture(self):
+        """بدء تجميع مخرجات الخيط الحالي"""
+        self.buffers[threading.get_ident()] = io.StringIO()
+
+    def release(self):
+        """إنهاء التجميع وإرجاع مخرجات الخيط الحالي"""
+        return self.buffers.pop(threading.get_ident()).getvalue()
+
+    def write(self, text):
+        buffer = self.buffers.get(threading.get_ident())
+        (buffer or self.stream).write(text)
+        return len(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_step(name, context, output):
+    """
+    تشغيل مرحلة واحدة مع تجميع مخرجاتها
+
+    مراحل القياس (run_report) تُسجل في قائمة هذا الخيط وتُعاد ليضيفها الخيط
+    الرئيسي إلى التشغيل
+
+    Returns:
+        tuple: (النجاح، المخرجات، الزمن بالثواني، مراحل القياس)
+    """
+    output.capture()
+    take_stages()
+    start = time.perf_counter()
+    try:
+        with stage(f"step.{name}"):
+            success = bool(STEPS[name][1](context))
+    except Exception as e:
+        print(f"❌ حدث خطأ: {str(e)}")
+        success = False
+    return success, output.release(), time.perf_counter() - start, take_stages()
+
+
+def run_steps(names, options, workers=None):
+    """
+    تشغيل المراحل المطلوبة، كل مرحلة فور انتهاء المراحل التي تعتمد عليها
+
+    الاعتماد بين المراحل يُطبق على المراحل المطلوبة فقط، وإذا فشلت مرحلة
+    تُتخطى المراحل المعتمدة عليها
+
+    Args:
+        names (list): أسماء المراحل المطلوبة
+        options (Namespace): خيارات التشغيل (force, reader, allow_invalid،
+                             و periods اختيارياً: أرقام الفترات المطلوبة)
+        workers (int): الحد الأقصى للمراحل المتزامنة (افتراضي: عدد المراحل)
+
+    Returns:
+        dict: اسم المرحلة ← (الحالة "ok" أو "failed" أو "skipped"، الزمن)
+    """
+    context = {"options": options}
+    statuses = {}
+    pending = [name for name in STEPS if name in names]
+    running = {}
+    output = StepOutput(sys.stdout)
+
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers or len(pending) or 1) as executor:
+            while pending or running:
+                for name in list(pending):
+                    dependencies = [d for d in STEPS[name][0] if d in names]
+                    if any(statuses.get(d, ("ok",))[0] != "ok" for d in dependencies):
+                        statuses[name] = ("skipped", 0.0)
+                        pending.remove(name)
+                        output.stream.write(f"⏭️ {STEPS[name][2]}: تم التخطي لفشل مرحلة سابقة\n")
+                    elif all(d in statuses for d in dependencies):
+                        running[executor.submit(run_step, name, context, output)] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    success, text, seconds, stages = future.result()
+                    add_stages(stages)
+                    statuses[name] = ("ok" if success else "failed", seconds)
+                    mark = "✅" if success else "❌"
+                    output.stream.write(f"\n{mark} {STEPS[name][2]} ({seconds:.2f} ث)\n")
+                    output.stream.write("-" * 60 + "\n")
+                    output.stream.write(text)
+                    output.stream.flush()
+    finally:
+        sys.stdout = output.stream
+
+    return statuses
+
+
+def parse_steps(text):
+    """قراءة قائمة المراحل من سطر الأوامر (مفصولة بفواصل)"""
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STEPS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"مراحل غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(STEPS)})")
+    return names
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="التحديث الشامل لجميع البيانات في عملية واحدة")
+    parser.add_argument("--steps", type=parse_steps, default=list(STEPS),
+                        help=f"المراحل المطلوبة مفصولة بفواصل (افتراضي: {','.join(STEPS)})")
+    parser.add_argument("--period", type=int, action="append", dest="periods",
+                        help="رقم الفترة التي تحوّلها مرحلة periods (يمكن تكراره، افتراضي: الكل)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="الحد الأقصى للمراحل المتزامنة")
+    parser.add_argument("--force", action="store_true",
+                        help="إعادة البناء حتى لو لم تتغير الملفات")
+    parser.add_argument("--reader", choices=BACKENDS, default="auto",
+                        help="محرك قراءة Excel (افتراضي: auto)")
+    parser.add_argument("--allow-invalid", action="store_true",
+                        help="كتابة ملفات الفترات رغم وجود أخطاء في التحقق")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("🔄 التحديث الشامل - جميع المراحل في عملية واحدة")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    with record_run("update_pipeline") as report:
+        statuses = run_steps(args.steps, args, args.workers)
+        success = all(status == "ok" for status, _ in statuses.values())
+        report["success"] = success
+
+    print()
+    print("=" * 60)
+    print("📈 النتائج:")
+    marks = {"ok": "✅", "failed": "❌", "skipped": "⏭️"}
+    for name in (name for name in STEPS if name in statuses):
+        status, seconds = statuses[name]
+        print(f"   {marks[status]} {STEPS[name][2]:<28} {seconds:>7.2f} ث")
+    print(f"⏱️ المجموع: {time.perf_counter() - start:.2f} ثانية")
+    print("=" * 60)
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+@echo off
+chcp 65001 > nul
+REM =====================================================
+REM 👁️ وضع المراقبة - Batch
+REM =====================================================
+REM يحوّل ملفات Excel تلقائياً إلى JSON عند حفظها (بدون رفع إلى GitHub)
+REM للرفع بعد الانتهاء من التعديلات: شغّل update_all.bat
+
+cd /d "%~dp0"
+
+python watch_workbooks.py
+
+if errorlevel 1 (
+    echo.
+    echo ❌ خطأ: توقفت المراقبة!
+    echo 💡 تأكد من تثبيت المكتبات المطلوبة: pip install -r requirements.txt
+    echo.
+    pause
+    exit /b 1
+)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+وضع المراقبة: تحويل ملف Excel تلقائياً عند حفظه (Watch Mode)
+يبقى البرنامج يعمل مع تحميل pandas ومكتبة التقويم الهجري مسبقاً، ويراقب ملفات
+الفترات وملف الملاحظات، وعند حفظ أحدها ينتظر انتهاء الحفظ (Excel يكتب الملف
+على عدة دفعات) ثم يشغّل مراحل التحديث الشامل (update_pipeline.py) الخاصة به:
+يُحوّل هذا الملف فقط، ويعيد بناء ما يعتمد عليه ويحدّث last_update.json
+و assets.json
+
+المراقبة بفحص تاريخ التعديل وحجم الملف دورياً، فلا تحتاج إلى مكتبات إضافية
+
+الاستخدام:
+    python watch_workbooks.py
+    python watch_workbooks.py --interval 0.5 --debounce 1
+    (للإيقاف: Ctrl+C)
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from converter_engine import load_manifest
+from run_report import record_run
+from update_pipeline import run_steps, with_dependents
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# ملف الملاحظات السلوكية
+NOTES_WORKBOOK = "الملاحظات.xlsx"
+
+# الفترة بين كل فحص والذي يليه (بالثواني)
+POLL_INTERVAL = 0.2
+
+# مدة ثبات الملف بعد آخر تغيير قبل تحويله (بالثواني)
+DEBOUNCE_SECONDS = 0.4
+
+# عدد محاولات التحويل عند فشل قراءة الملف (مثلاً إذا كان Excel ما زال يكتبه)
+MAX_RETRIES = 3
+
+
+def file_signature(path):
+    """بصمة سريعة لحالة الملف: (تاريخ التعديل، الحجم)، أو None إذا لم يكن موجوداً"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch_targets(base_dir=None):
+    """
+    الملفات المراقبة وما يجب تحويله عند تغيّر كل منها
+
+    Returns:
+        dict: مسار ملف Excel ← مواصفات الفترة، أو None لملف الملاحظات
+    """
+    base_dir = Path(base_dir) if base_dir else SCRIPT_DIR
+    targets = {base_dir / spec["workbook"]: spec for spec in load_manifest()}
+    targets[base_dir / NOTES_WORKBOOK] = None
+    return targets
+
+
+class WorkbookWatcher:
+    """
+    مراقبة مجموعة ملفات مع تأجيل التحويل حتى يثبت الملف
+
+    يُعتبر الملف جاهزاً عندما تتغير بصمته ثم تبقى ثابتة مدة debounce،
+    فتُجمع دفعات الحفظ المتتالية من Excel في تحويل واحد
+    """
+
+    def __init__(self, paths, debounce=DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self.signatures = {path: file_signature(path) for path in paths}
+        self.pending = {}
+
+    def poll(self, now=None):
+        """
+        فحص الملفات مرة واحدة
+
+        Returns:
+            list: الملفات التي تغيرت واستقرت وأصبحت جاهزة للتحويل
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        for path, previous in self.signatures.items():
+            current = file_signature(path)
+            if current != previous:
+                self.signatures[path] = current
+                self.pending[path] = now
+            elif path in self.pending and now - self.pending[path] >= self.debounce:
+                del self.pending[path]
+                if current is not None:
+                    ready.append(path)
+        return ready
+
+    def retry(self, path, now=None):
+        """إعادة الملف إلى قائمة الانتظار لمحاولة تحويله مرة أخرى"""
+        self.pending[path] = time.monotonic() if now is None else now
+
+
+def rebuild(excel_file, spec):
+    """
+    تحويل الملف الذي تغيّر ثم تحديث الملفات المعتمدة عليه
+
+    تُشغّل مرحلة هذا الملف فقط من مراحل التحديث الشامل (update_pipeline.py)
+    مع المراحل التي تعتمد عليها: ملف الملاحظات ← notes وما بعدها، وملف فترة
+    ← periods لهذه الفترة وحدها وما بعدها. فلا يمنع خطأ قائم في ملف فترة
+    نشر تعديل على الملاحظات، ولا يُعاد تحويل ملف لم يتغير
+
+    Args:
+        excel_file (Path): الملف الذي تغيّر
+        spec (dict): مواصفات الفترة، أو None لملف الملاحظات
+
+    Returns:
+        bool: True إذا نجحت جميع المراحل
+    """
+    start = time.perf_counter()
+    print(f"\n📝 تغيّر الملف: {excel_file.name}")
+
+    if spec is None:
+        names, period_ids = with_dependents(["notes"]), None
+    else:
+        names, period_ids = with_dependents(["periods"]), [spec["id"]]
+    options = argparse.Namespace(force=False, reader="auto", allow_invalid=False,
+                                 periods=period_ids)
+    with record_run("watch_workbooks") as report:
+        statuses = run_steps(names, options)
+        success = all(status == "ok" for status, _ in statuses.values())
+        report["success"] = success
+        report["workbook"] = excel_file.name
+
+    print(f"⏱️ {'✅' if success else '❌'} خلال {time.perf_counter() - start:.2f} ثانية")
+    return success
+
+
+def watch(interval=POLL_INTERVAL, debounce=DEBOUNCE_SECONDS, base_dir=None):
+    """حلقة المراقبة (تعمل حتى الإيقاف بـ Ctrl+C)"""
+    targets = watch_targets(base_dir)
+    watcher = WorkbookWatcher(targets, debounce)
+    retries = {}
+
+    for path in targets:
+        print(f"   👁️ {path.name}{'' if path.exists() else ' (غير موجود حالياً)'}")
+    print("\n⏳ في انتظار التعديلات... (Ctrl+C للإيقاف)")
+
+    while True:
+        for path in watcher.poll():
+            if rebuild(path, targets[path]):
+                retries.pop(path, None)
+            elif retries.get(path, 0) < MAX_RETRIES:
+                retries[path] = retries.get(path, 0) + 1
+                print(f"🔁 إعادة المحاولة ({retries[path]}/{MAX_RETRIES})...")
+                watcher.retry(path)
+            else:
+                retries.pop(path, None)
+        time.sleep(interval)
+
+
+def warm_up():
+    """تحميل المكتبات الثقيلة مسبقاً حتى يكون أول تحويل سريعاً"""
+    import openpyxl  # noqa: F401
+    import pandas  # noqa: F401
+    from umm_alqura_calendar import gregorian_to_hijri
+    gregorian_to_hijri(2025, 1, 1)
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="تحويل ملفات Excel تلقائياً عند حفظها")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="الفترة بين كل فحص بالثواني")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="مدة ثبات الملف قبل تحويله بالثواني")
+    args = parser.parse_args(argv)
+
+    # save_update_date يكتب last_update.json في المجلد الحالي
+    os.chdir(SCRIPT_DIR)
+
+    print("=" * 60)
+    print("👁️ وضع المراقبة: تحويل ملفات Excel تلقائياً عند حفظها")
+    print("=" * 60)
+    warm_up()
+
+    try:
+        watch(args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\n👋 تم إيقاف المراقبة")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ذاكرة محلية لملفات Excel بعد قراءتها (Parsed-Workbook Cache)
+يحفظ كل ورقة بعد قراءتها كجدول عمودي على القرص، بمفتاح من بصمة محتوى الملف
+واسم الورقة وصف أسماء الأعمدة، فتقرأ المراحل اللاحقة (التحويل إلى JSON،
+التحقق، التحليلات) الجدول في أجزاء من الثانية بدل إعادة قراءة ملف Excel
+
+صيغة الحفظ:
+- Feather (Arrow) مع قراءة بالربط المباشر للذاكرة (memory-map) إذا توفرت pyarrow
+- pickle إذا لم تتوفر pyarrow أو تعذّر تحويل الجدول إلى Arrow
+
+الاستخدام:
+    python workbook_cache.py            # عرض الملفات المحفوظة
+    python workbook_cache.py --clear    # حذف جميع الملفات المحفوظة
+
+    from workbook_cache import load_cached, store_cached
+"""
+
+import argparse
+import hashlib
+import pickle
+import sys
+from pathlib import Path
+
+from build_cache import file_hash
+
+# المجلد الافتراضي للمشروع
+SCRIPT_DIR = Path(__file__).parent
+
+# مجلد النسخ المحفوظة من ملفات Excel بعد قراءتها (محلي فقط)
+CACHE_DIR = SCRIPT_DIR / ".cache" / "workbooks"
+
+# عدد خانات بصمة الملف في اسم النسخة المحفوظة
+CACHE_KEY_LENGTH = 16
+
+# عدد خانات بصمة مسار الملف في البادئة
+PATH_KEY_LENGTH = 8
+
+# امتدادات صيغ الحفظ حسب الأفضلية
+FEATHER_SUFFIX = ".feather"
+PICKLE_SUFFIX = ".pkl"
+
+
+def has_arrow():
+    """التحقق من توفر مكتبة pyarrow"""
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def cache_prefix(excel_file, header=0, sheet_name=0):
+    """
+    بادئة أسماء النسخ المحفوظة لورقة معينة من ملف Excel بخيارات قراءة معينة
+
+    تحتوي على بصمة المسار الكامل، حتى لا تحذف ملفات بنفس الاسم في مجلدات
+    مختلفة النسخ المحفوظة لبعضها
+    """
+    path_digest = hashlib.sha256(str(Path(excel_file).resolve()).encode("utf-8")).hexdigest()
+    return f"{Path(excel_file).stem}-{path_digest[:PATH_KEY_LENGTH]}-s{sheet_name}-h{header}-"
+
+
+def cache_key(excel_file, header=0, sheet_name=0):
+    """
+    اسم النسخة المحفوظة بدون امتداد (البادئة + بصمة محتوى الملف)
+
+    يُحسب مرة واحدة قبل قراءة الملف ويُمرر إلى load_cached و store_cached، حتى
+    لا يُحفظ جدول مقروء من المحتوى القديم باسم محتوى حُفظ أثناء القراءة
+    """
+    return f"{cache_prefix(excel_file, header, sheet_name)}{file_hash(excel_file)[:CACHE_KEY_LENGTH]}"
+
+
+def find_cached(excel_file, header=0, sheet_name=0, cache_dir=None, key=None):
+    """مسار النسخة المحفوظة الحالية للملف بأي صيغة، أو None"""
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+    key = key or cache_key(excel_file, header, sheet_name)
+    for suffix in (FEATHER_SUFFIX, PICKLE_SUFFIX):
+        path = cache_dir / f"{key}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def read_cache_file(path):
+    """قراءة ملف محفوظ حسب صيغته"""
+    if path.suffix == FEATHER_SUFFIX:
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).to_pandas()
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_cached(excel_file, header=0, sheet_name=0, cache_dir=None, key=None):
+    """
+    قراءة النسخة المحفوظة لورقة من ملف Excel (key من cache_key، افتراضي: يُحسب الآن)
+
+    Returns:
+        DataFrame: الجدول المحفوظ، أو None إذا لم توجد نسخة صالحة
+        (لم يُحفظ بعد، أو تغيّر الملف، أو تعذّرت قراءة النسخة)
+    """
+    path = find_cached(excel_file, header, sheet_name, cache_dir, key)
+    if path is None:
+        return None
+    if path.suffix == FEATHER_SUFFIX and not has_arrow():
+        return None
+    try:
+        return read_cache_file(path)
+    except Exception:
+        # نسخة تالفة أو من إصدار مختلف من المكتبات: تُعامل كأنها غير موجودة
+        return None
+
+
+def write_feather(df, path):
+    """حفظ الجدول بصيغة Feather (يفشل إذا احتوى عموداً بأنواع مختلطة)"""
+    from pyarrow import feather
+    feather.write_feather(df.reset_index(drop=True), path)
+
+
+def write_pickle(df, path):
+    """حفظ الجدول بصيغة pickle"""
+    with open(path, 'wb') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def store_cached(df, excel_file, header=0, sheet_name=0, cache_dir=None, key=None):
+    """
+    حفظ الجدول كنسخة محفوظة لورقة من ملف Excel، مع حذف النسخ القديمة لنفس الورقة
+
+    key هو مفتاح الملف المحسوب قبل قراءته (cache_key)، وإذا لم يُمرر يُحسب الآن
+
+    Returns:
+        Path: مسار الملف المحفوظ
+    """
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    key = key or cache_key(excel_file, header, sheet_name)
+    prefix = cache_prefix(excel_file, header, sheet_name)
+    for old_path in cache_dir.iterdir():
+        if old_path.name.startswith(prefix):
+            old_path.unlink()
+
+    if has_arrow():
+        path = cache_dir / f"{key}{FEATHER_SUFFIX}"
+        try:
+            write_feather(df, path)
+            return path
+        except Exception:
+            path.unlink(missing_ok=True)
+
+    path = cache_dir / f"{key}{PICKLE_SUFFIX}"
+    write_pickle(df, path)
+    return path
+
+
+def cached_files(cache_dir=None):
+    """قائمة الملفات المحفوظة"""
+    cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR
+    if not cache_dir.exists():
+        return []
+    return sorted(path for path in cache_dir.iterdir()
+                  if path.suffix in (FEATHER_SUFFIX, PICKLE_SUFFIX))
+
+
+def main(argv=None):
+    """الدالة الرئيسية"""
+    parser = argparse.ArgumentParser(description="عرض أو حذف النسخ المحفوظة من ملفات Excel")
+    parser.add_argument("--clear", action="store_true", help="حذف جميع الملفات المحفوظة")
+    args = parser.parse_args(argv)
+
+    files = cached_files()
+
+    if args.clear:
+        for path in files:
+            path.unlink()
+        print(f"🗑️ تم حذف {len(files)} ملف محفوظ")
+        return 0
+
+    print(f"📂 مجلد الحفظ: {CACHE_DIR}")
+    print(f"🔧 صيغة الحفظ: {'Feather (Arrow)' if has_arrow() else 'pickle (ثبّت pyarrow لاستخدام Feather)'}")
+    if not files:
+        print("ℹ️ لا توجد ملفات محفوظة")
+        return 0
+
+    for path in files:
+        print(f"   - {path.name} ({path.stat().st_size / 1024:,.1f} KB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())